@@ -6,10 +6,15 @@ import os
 from PIL import Image, ImageEnhance, ImageOps
 import config
 from pause_handler import pause_handler
-from config import ENABLE_DEBUG_SCREENSHOTS, GOLD_MONITOR_TIMEOUT, GOLD_CHECK_INTERVAL, INFINITE_ATTEMPT_INTERVAL
+from config import ENABLE_DEBUG_SCREENSHOTS, GOLD_MONITOR_TIMEOUT, GOLD_CHECK_INTERVAL
+from logger import debug
+from config import ARROW_SEARCH_INTERVAL, PET_TRIGGER_CHECK_INTERVAL, LOBBY_STATUS_INTERVAL
 from statistics import stats
 from avatar_monitor import AvatarMonitor
 from infinite_mode import InfiniteMode
+from frame_capture import frame_capture
+from ocr_engine import ocr_engine
+from task_scheduler import TaskScheduler, TIMEOUT, FINISHED
 
 
 class AFKLobbyMonitor:
@@ -55,6 +60,7 @@ class AFKLobbyMonitor:
         """Нажимает кнопку ENTER для активации чата"""
         try:
             pyautogui.press('enter')
+            frame_capture.invalidate()
             time.sleep(0.2)
             return True
         except Exception as e:
@@ -65,6 +71,7 @@ class AFKLobbyMonitor:
         """Закрывает чат с помощью ESC"""
         try:
             pyautogui.press('esc')
+            frame_capture.invalidate()
             time.sleep(0.2)
             return True
         except Exception as e:
@@ -76,14 +83,14 @@ class AFKLobbyMonitor:
         УЛУЧШЕННЫЙ поиск текста 9999999 в чате (текст должен СОДЕРЖАТЬ 9999999)
         """
         try:
-            print("💰 ПОИСК 9999999 В ОБЛАСТИ ЧАТА")
+            debug("💰 ПОИСК 9999999 В ОБЛАСТИ ЧАТА")
             
             # Активация чата
             self.press_enter()
             time.sleep(0.3)
             
             # Область чата - ниже центра экрана
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = frame_capture.screen_size()
             chat_region = (
                 int(screen_width * 0.2),    # 20% от левого края  
                 int(screen_height * 0.35),  # 35% от верха (ЦЕНТР ЭКРАНА)
@@ -91,8 +98,8 @@ class AFKLobbyMonitor:
                 int(screen_height * 0.4)    # 40% высоты
             )
             
-            print(f"📐 Область чата: {chat_region}")
-            screenshot = pyautogui.screenshot(region=chat_region)
+            debug("📐 Область чата: %s", chat_region)
+            screenshot = frame_capture.grab(chat_region)
             
             # Закрытие чата
             self.close_chat()
@@ -112,9 +119,8 @@ class AFKLobbyMonitor:
             
             # 🔥 ТОЛЬКО ОДНА НАСТРОЙКА TESSERACT - как раньше
             custom_config = r'--oem 3 --psm 6'
-            data = pytesseract.image_to_data(
+            data = ocr_engine.image_to_data(
                 binary, 
-                output_type=pytesseract.Output.DICT,
                 config=custom_config,
                 lang='eng'
             )
@@ -137,7 +143,7 @@ class AFKLobbyMonitor:
                     
                     return True
             
-            print("❌ Текст содержащий 9999999 не найден в этой проверке")
+            debug("❌ Текст содержащий 9999999 не найден в этой проверке")
             return False
             
         except Exception as e:
@@ -157,7 +163,7 @@ class AFKLobbyMonitor:
         
         if not triggered_pets:
             # 🔥 ДОБАВЛЯЕМ ОТЛАДОЧНУЮ ИНФОРМАЦИЮ
-            print(f"ℹ️ Триггеры не сработали при {current_cycles} циклах")
+            debug("ℹ️ Триггеры не сработали при %s циклах", current_cycles)
             return
         
         print(f"🎯 НАЙДЕНО ТРИГГЕРОВ: {len(triggered_pets)}")
@@ -244,11 +250,10 @@ class AFKLobbyMonitor:
     def send_telegram_notification(self, pet_name, trigger_cycles, current_cycles):
         """Отправка уведомления в Telegram о срабатывании триггера"""
         try:
-            from telegram_bot import get_bot_manager
+            from telegram_outbox import telegram_outbox
             from config import TELEGRAM_ADMIN_IDS
             
-            bot_manager = get_bot_manager()
-            if bot_manager and hasattr(bot_manager, 'bot') and TELEGRAM_ADMIN_IDS:
+            if TELEGRAM_ADMIN_IDS:
                 chat_id = TELEGRAM_ADMIN_IDS[0]
                 
                 message = (
@@ -259,20 +264,18 @@ class AFKLobbyMonitor:
                     f"⏳ Переключение займет примерно 10 секунд"
                 )
                 
-                bot_manager.bot.send_message(
-                    chat_id,
-                    message,
-                    parse_mode='Markdown'
-                )
-                
-                print(f"✅ Уведомление отправлено в Telegram")
+                # 🔥 БЕЗ ОЖИДАНИЯ СЕТИ - ОТПРАВИТ ПОТОК ОЧЕРЕДИ
+                if telegram_outbox.send_message(chat_id, message, parse_mode='Markdown'):
+                    print(f"✅ Уведомление поставлено в очередь Telegram")
                 
         except Exception as e:
             print(f"⚠️ Не удалось отправить уведомление в Telegram: {e}")
 
-    def monitor_after_accept(self, restart_count=0):
+    def monitor_after_accept(self, restart_count=0, restore_frame=False):
         """
         Мониторинг AFK лобби с учетом времени на паузе
+        Все проверки - периодические задачи планировщика со своим интервалом
+        restore_frame - взять рамку аватарки из кэша позиций (старт сразу с AFK мониторинга)
         """
         print("🎯 МОНИТОРИНГ AFK ЛОББИ С ОТСЛЕЖИВАНИЕМ ЦВЕТА РАМКИ")
         print("⚙️ Бесконечка: " + ("ВКЛЮЧЕНА" if self.infinite_mode.enabled else "ВЫКЛЮЧЕНА"))
@@ -295,235 +298,225 @@ class AFKLobbyMonitor:
             self.infinite_mode.is_active = True
             print("🌀 АКТИВИРОВАНА БЕСКОНЕЧКА! (is_active = True)")
 
-        start_time = time.time()  # 🔥 ЗАПОМИНАЕМ ВРЕМЯ НАЧАЛА
-        check_counter = 0
-        arrow_clicked = False
-        frame_found = False
-        frame_search_attempted = False
-        last_color_check_time = 0
-        color_check_interval = 5
-        last_infinite_check_time = start_time
-        gold_found_count = 0
+        scheduler = TaskScheduler("Мониторинг AFK лобби", self.lobby_timeout)
+        state = {
+            'arrow_clicked': False,
+            'frame_found': False,
+            'frame_search_attempted': False,
+            'gold_found_count': 0,
+            'chat_checks': 0
+        }
         
-        # 🔥 ИЗМЕНЯЕМ УСЛОВИЕ ЦИКЛА - используем вечный цикл с ручной проверкой таймаута
-        while True:
-            # 1. Проверяем таймаут с учетом паузы
-            should_continue, elapsed = pause_handler.check_pause_with_real_timeout(
-                "Мониторинг AFK лобби",
-                self.lobby_timeout,
-                start_time
-            )
+        # 🔥 РАМКА ИЗ КЭША ПОЗИЦИЙ: после перезапуска скрипта не ищем стрелку заново
+        if restore_frame and self.avatar_monitor.restore_cached_frame():
+            state['arrow_clicked'] = True
+            state['frame_found'] = True
+            state['frame_search_attempted'] = True
+
+        def infinite_active():
+            return self.infinite_mode.enabled and self.infinite_mode.is_active
+
+        # 🔥 ПРОВЕРКА БЕСКОНЕЧКИ
+        def check_infinite(elapsed):
+            debug("\n🌀 ПРОВЕРКА БЕСКОНЕЧКИ...")
             
-            if not should_continue:
-                if elapsed >= self.lobby_timeout:
-                    print("⏰ Таймаут лобби истек")
-                    return "RESTART", "Лобби AFK больше таймаута"
-                else:
-                    return "RESTART", "Пауза/перезапуск"
+            # 🔥 ВЫПОЛНЯЕМ ПОПЫТКУ ВХОДА В БЕСКОНЕЧКУ
+            attempt_result = self.infinite_mode.check_and_attempt()
             
-            check_counter += 1
-            current_time = time.time()
+            if attempt_result == "ENTRY_SUCCESS":
+                print("🎉 БЕСКОНЕЧКА: Успешный вход!")
+            elif attempt_result == "EXIT_SUCCESS":
+                print("🚪 БЕСКОНЕЧКА: Успешный выход!")
+
+        # ЭТАП 1: ПОИСК СТРЕЛКИ В ТЕЧЕНИЕ 7 МИНУТ
+        def search_arrow(elapsed):
+            debug("\n🔍 ПОИСК СТРЕЛКИ '>'... (%s/%s сек)", int(elapsed), self.arrow_delay)
             
-            # 🔥 2. ПРОВЕРКА БЕСКОНЕЧКИ (возвращаем обратно)
-            if (self.infinite_mode.enabled and 
-                self.infinite_mode.is_active and
-                current_time - last_infinite_check_time >= 10):  # Каждые 10 секунд
-                
-                last_infinite_check_time = current_time
+            if not self.avatar_monitor.find_greater_than_symbol_fast():
+                debug("❌ Стрелка не найдена в этой проверке")
+                return
+            
+            print("🎯 Стрелка '>' найдена! Кликаем и убираем мышь...")
+            if not self.avatar_monitor.click_arrow():
+                print("❌ Не удалось кликнуть по стрелке")
+                return
+            
+            print("✅ Стрелка успешно нажата! Мышь убрана. Ищем рамку...")
+            state['arrow_clicked'] = True
+            scheduler.cancel('arrow_search')
+            scheduler.cancel('arrow_timeout')
+            
+            # 🔥 ПОСЛЕ НАЖАТИЯ СТРЕЛКИ ИЩЕМ РАМКУ РЯДОМ
+            print("\n🎯 ИЩЕМ РАМКУ АВАТАРКИ РЯДОМ СО СТРЕЛКОЙ...")
+            pause_handler.interruptible_sleep(1)
+            
+            state['frame_found'] = self.avatar_monitor.find_avatar_frame_near_arrow()
+            state['frame_search_attempted'] = True
+            
+            if state['frame_found']:
+                frame_x, frame_y = self.avatar_monitor.avatar_frame_position
+                arrow_x, arrow_y = self.avatar_monitor.arrow_position
+                distance_x = abs(frame_x - arrow_x)
+                distance_y = abs(frame_y - arrow_y)
+                print(f"✅ Рамка найдена! Расстояние от стрелки: X:{distance_x}px, Y:{distance_y}px")
                 
-                # 🔥 ВЫВОДИМ СТАТУС БЕСКОНЕЧКИ
-                print(f"\n🌀 ПРОВЕРКА БЕСКОНЕЧКИ...")
+                print("🎨 Первоначальная проверка цвета рамки...")
+                frame_result = self.avatar_monitor.check_frame_color_with_info()
+                print(f"🎯 Начальный цвет: {frame_result['color_info']}")
+            else:
+                print("❌ Рамка аватарки не найдена рядом со стрелкой.")
+
+        # 🔥 ЭТАП 2: ПОСЛЕ 7 МИНУТ (реальных, без паузы)
+        def arrow_timeout(elapsed):
+            print(f"\n⏰ {self.arrow_delay//60} МИНУТ ПРОШЛО - ОТКЛЮЧАЕМ ПОИСК СТРЕЛКИ")
+            state['arrow_clicked'] = True
+            
+            if not state['frame_search_attempted']:
+                state['frame_found'] = self.avatar_monitor.find_avatar_frame()
+                state['frame_search_attempted'] = True
+
+        # 🔥 ЭТАП 3: ПРОВЕРКА ЦВЕТА РАМКИ
+        def check_frame_color(elapsed):
+            debug("\n🎯 ПРОВЕРКА ЦВЕТА РАМКИ...")
+            frame_result = self.avatar_monitor.check_frame_color_with_info()
+            
+            if frame_result['death_detected']:
+                print(f"🎉 СМЕРТЬ ХОСТА ОБНАРУЖЕНА!")
+                return "RESTART", "Смерть хоста по цвету рамки"
+
+        # 🔥 ЭТАП 4: ПРОВЕРКА ЧАТА НА 9999999
+        def check_chat(elapsed):
+            state['chat_checks'] += 1
+            debug("\n💰 ПРОВЕРКА ЧАТА #%s НА 9999999...", state['chat_checks'])
+            
+            if not self.press_enter():
+                return
+            
+            if self.check_gold_text_fast():
+                print("🎯 9999999 ОБНАРУЖЕНЫ В ЧАТЕ!")
+                state['gold_found_count'] += 1
                 
-                # 🔥 ВЫПОЛНЯЕМ ПОПЫТКУ ВХОДА В БЕСКОНЕЧКУ
-                attempt_result = self.infinite_mode.check_and_attempt()
+                # 🔥 ЗАПИСЫВАЕМ СТАТИСТИКУ 9999999
+                from statistics import stats
+                stats.record_host_death('gold_text', 
+                    f"9999999 найдены в чате через {elapsed:.1f} сек, проверка #{state['chat_checks']}")
                 
-                if attempt_result is not None:
-                    if attempt_result == "ENTRY_SUCCESS":
-                        print("🎉 БЕСКОНЕЧКА: Успешный вход!")
-                    elif attempt_result == "EXIT_SUCCESS":
-                        print("🚪 БЕСКОНЕЧКА: Успешный выход!")
-            
-            # 🔥 ВСЯ ОСТАЛЬНАЯ ЛОГИКА ОСТАЕТСЯ БЕЗ ИЗМЕНЕНИЙ
-            check_counter += 1
-            current_time = time.time()
-            
-            # ЭТАП 1: ПОИСК СТРЕЛКИ В ТЕЧЕНИЕ 7 МИНУТ
-            if not arrow_clicked and elapsed < self.arrow_delay:
-                print(f"\n🔍 ПОИСК СТРЕЛКИ '>'... ({int(elapsed)}/{self.arrow_delay} сек)")
+                return "RESTART", "9999999 найдены в чате"
+            
+            debug("✅ 9999999 не найдены")
+            self.close_chat()
+
+        # 🔥 ПРОВЕРКА ТРИГГЕРОВ БЕСКОНЕЧКИ ДЛЯ ПИТОМЦЕВ
+        def check_pet_triggers(elapsed):
+            # 🔥 ПОЛУЧАЕМ АКТУАЛЬНОЕ КОЛИЧЕСТВО ЦИКЛОВ
+            infinite_stats = self.infinite_mode.get_stats_for_telegram()
+            infinite_cycles = infinite_stats.get('total_cycles', 0)
+            
+            if infinite_cycles <= 0 or not hasattr(self, 'pet_manager'):
+                return
+            
+            debug("🔍 Проверка триггеров при %s циклах...", infinite_cycles)
+            triggered_pets = self.pet_manager.check_infinite_triggers(infinite_cycles)
+            
+            for triggered in triggered_pets or []:
+                pet_id = triggered['pet_id']
+                pet_name = triggered['pet_name']
+                trigger_cycles = triggered['trigger_cycles']
                 
-                arrow_found = self.avatar_monitor.find_greater_than_symbol_fast()
+                print(f"🎯 Сработал триггер! {pet_name} при {trigger_cycles} циклах")
                 
-                if arrow_found:
-                    print("🎯 Стрелка '>' найдена! Кликаем и убираем мышь...")
-                    click_success = self.avatar_monitor.click_arrow()
-                    
-                    if click_success:
-                        print("✅ Стрелка успешно нажата! Мышь убрана. Ищем рамку...")
-                        arrow_clicked = True
-                        
-                        # 🔥 ПОСЛЕ НАЖАТИЯ СТРЕЛКИ ИЩЕМ РАМКУ РЯДОМ
-                        print("\n🎯 ИЩЕМ РАМКУ АВАТАРКИ РЯДОМ СО СТРЕЛКОЙ...")
-                        time.sleep(1)
-                        
-                        frame_found = self.avatar_monitor.find_avatar_frame_near_arrow()
-                        frame_search_attempted = True
-                        
-                        if frame_found:
-                            frame_x, frame_y = self.avatar_monitor.avatar_frame_position
-                            arrow_x, arrow_y = self.avatar_monitor.arrow_position
-                            distance_x = abs(frame_x - arrow_x)
-                            distance_y = abs(frame_y - arrow_y)
-                            print(f"✅ Рамка найдена! Расстояние от стрелки: X:{distance_x}px, Y:{distance_y}px")
-                            
-                            print("🎨 Первоначальная проверка цвета рамки...")
-                            frame_result = self.avatar_monitor.check_frame_color_with_info()
-                            print(f"🎯 Начальный цвет: {frame_result['color_info']}")
-                        else:
-                            print("❌ Рамка аватарки не найдена рядом со стрелкой.")
-                    else:
-                        print("❌ Не удалось кликнуть по стрелке")
-                else:
-                    print("❌ Стрелка не найдена в этой проверке")
-            
-            # 🔥 ЭТАП 2: ПОСЛЕ 7 МИНУТ
-            # 🔥 4. ЭТАП 2: ПОСЛЕ 7 МИНУТ (реальных, без паузы)
-            elif not arrow_clicked and elapsed >= self.arrow_delay:
-                print(f"\n⏰ {self.arrow_delay//60} МИНУТ ПРОШЛО - ОТКЛЮЧАЕМ ПОИСК СТРЕЛКИ")
-                arrow_clicked = True
+                # Выполняем переключение
+                success, message = self.pet_manager.execute_triggered_switch(
+                    pet_id, infinite_cycles, trigger_cycles
+                )
                 
-                if not frame_search_attempted:
-                    frame_found = self.avatar_monitor.find_avatar_frame()
-                    frame_search_attempted = True
+                if success:
+                    # Записываем в статистику с флагом деактивации
+                    from statistics import stats
+                    stats.record_pet_switch_by_trigger(
+                        pet_id, pet_name, trigger_cycles, infinite_cycles, trigger_deactivated=True
+                    )
             
-            # 🔥 5. ЭТАП 3: ПРОВЕРКА ЦВЕТА РАМКИ
-            if frame_found and current_time - last_color_check_time >= color_check_interval:
-                print("\n🎯 ПРОВЕРКА ЦВЕТА РАМКИ...")
-                frame_result = self.avatar_monitor.check_frame_color_with_info()
-                
-                if frame_result['death_detected']:
-                    print(f"🎉 СМЕРТЬ ХОСТА ОБНАРУЖЕНА!")
-                    return "RESTART", "Смерть хоста по цвету рамки"
-                
-                last_color_check_time = current_time
+            self.check_infinite_triggers(infinite_cycles)
 
-            # 🔥 ЭТАП 4: ПРОВЕРКА ЧАТА НА 9999999
-            if check_counter % 3 == 0:
-                print(f"\n💰 ПРОВЕРКА ЧАТА #{check_counter//3} НА 9999999...")
-                
-                if self.press_enter():
-                    gold_found = self.check_gold_text_fast()
-                    
-                    if gold_found:
-                        print("🎯 9999999 ОБНАРУЖЕНЫ В ЧАТЕ!")
-                        gold_found_count += 1
-                        
-                        # 🔥 ЗАПИСЫВАЕМ СТАТИСТИКУ 9999999
-                        from statistics import stats
-                        stats.record_host_death('gold_text', 
-                            f"9999999 найдены в чате через {time.time() - start_time:.1f} сек, проверка #{check_counter//3}")
-                        
-                        return "RESTART", "9999999 найдены в чате"
-                    else:
-                        print("✅ 9999999 не найдены")
-                    self.close_chat()
+        # 🔥 СТАТУС КАЖДЫЕ 30 СЕКУНД
+        def report_status(elapsed):
+            remaining = self.lobby_timeout - elapsed
+            
+            status_msg = f"\n⏱ В лобби: {int(elapsed)}сек | До перезапуска: {int(remaining)}сек"
             
-            # 🔥 3. ПРОВЕРКА ТРИГГЕРОВ БЕСКОНЕЧКИ ДЛЯ ПИТОМЦЕВ
-            if self.infinite_mode.enabled and self.infinite_mode.is_active:
-                # 🔥 ПОЛУЧАЕМ АКТУАЛЬНОЕ КОЛИЧЕСТВО ЦИКЛОВ
+            if not state['arrow_clicked'] and elapsed < self.arrow_delay:
+                remaining_arrow = self.arrow_delay - elapsed
+                status_msg += f" | 🔍 Поиск стрелки: {int(remaining_arrow)}сек"
+            elif state['arrow_clicked']:
+                status_msg += " | ✅ Стрелка нажата"
+            
+            if state['frame_found']:
+                status_msg += " | 🎯 Рамка: отслеживается"
+            
+            # 🔥 ДОБАВЛЯЕМ СТАТУС БЕСКОНЕЧКИ
+            if infinite_active():
                 infinite_stats = self.infinite_mode.get_stats_for_telegram()
-                infinite_cycles = infinite_stats.get('total_cycles', 0)
+                status_msg += f" | 🌀 Бесконечка:"
+                status_msg += f" ВХОДЫ={infinite_stats['total_entries']}"
+                status_msg += f" ВЫХОДЫ={infinite_stats['total_exits']}"
+                status_msg += f" ЦИКЛЫ={infinite_stats['total_cycles']}"
                 
-                # 🔥 ДОБАВЛЯЕМ ОТЛАДОЧНУЮ ИНФОРМАЦИЮ
-                if infinite_cycles > 0 and int(current_time) % 30 == 0:  # Каждые 30 секунд
-                    print(f"📊 ОТЛАДКА: Циклы бесконечки = {infinite_cycles}")
-                
-                # Проверяем триггеры каждые 10 секунд
-                if int(elapsed) % 10 == 0:
-                    
-                    # 🔥 ПРОВЕРЯЕМ И ВЫПОЛНЯЕМ ТРИГГЕРЫ
-                    if infinite_cycles > 0 and hasattr(self, 'pet_manager'):
-                        print(f"🔍 Проверка триггеров при {infinite_cycles} циклах...")
-                        triggered_pets = self.pet_manager.check_infinite_triggers(infinite_cycles)
-                        
-                        if triggered_pets:
-                            for triggered in triggered_pets:
-                                pet_id = triggered['pet_id']
-                                pet_name = triggered['pet_name']
-                                trigger_cycles = triggered['trigger_cycles']
-                                
-                                print(f"🎯 Сработал триггер! {pet_name} при {trigger_cycles} циклах")
-                                
-                                # Выполняем переключение
-                                success, message = self.pet_manager.execute_triggered_switch(
-                                    pet_id, infinite_cycles, trigger_cycles
-                                )
-                                
-                                if success:
-                                    # Записываем в статистику с флагом деактивации
-                                    from statistics import stats
-                                    stats.record_pet_switch_by_trigger(
-                                        pet_id, pet_name, trigger_cycles, infinite_cycles, trigger_deactivated=True
-                                    )
-                        
-                        self.check_infinite_triggers(infinite_cycles)
+                # 🔥 ДОБАВЛЯЕМ ИНФОРМАЦИЮ О СМЕРТЯХ ГЕРОЯ
+                if infinite_stats.get('hero_dead', False):
+                    status_msg += f" | 💀 ГЕРОЙ МЕРТВ (смертей: {infinite_stats.get('hero_death_count', 0)})"
+                if infinite_stats.get('hero_death_total', 0) > 0:
+                    status_msg += f" | 💀 Всего смертей героя: {infinite_stats.get('hero_death_total', 0)}"
+            
+            print(status_msg)
+            
+            # 🔥 ОБНОВЛЯЕМ ДЕТАЛИ ОПЕРАЦИИ ДЛЯ ТЕЛЕГРАМ
+            infinite_stats = self.infinite_mode.get_stats_for_telegram() if self.infinite_mode.enabled else {}
+            
+            pause_handler.update_operation_details({
+                'elapsed_seconds': int(elapsed),
+                'remaining_seconds': int(remaining),
+                'arrow_found': state['arrow_clicked'],
+                'frame_found': state['frame_found'],
+                'gold_found': state['gold_found_count'],
+                'infinite_enabled': self.infinite_mode.enabled,
+                'infinite_is_active': self.infinite_mode.is_active,
+                'infinite_entries': infinite_stats.get('total_entries', 0),
+                'infinite_exits': infinite_stats.get('total_exits', 0),
+                'infinite_cycles': infinite_stats.get('total_cycles', 0),
+                'infinite_total_cycles': infinite_stats.get('total_cycles', 0),
+                'hero_dead': infinite_stats.get('hero_dead', False),
+                'hero_death_count': infinite_stats.get('hero_death_total', 0),
+                'hero_death_streak': infinite_stats.get('hero_death_count', 0)
+            })
 
-            # 🔥 СТАТУС КАЖДЫЕ 30 СЕКУНД
-            if int(elapsed) % 30 == 0:
-                remaining = self.lobby_timeout - elapsed
-                
-                status_msg = f"\n⏱ В лобби: {int(elapsed)}сек | До перезапуска: {int(remaining)}сек"
-                
-                if not arrow_clicked and elapsed < self.arrow_delay:
-                    remaining_arrow = self.arrow_delay - elapsed
-                    status_msg += f" | 🔍 Поиск стрелки: {int(remaining_arrow)}сек"
-                elif arrow_clicked:
-                    status_msg += " | ✅ Стрелка нажата"
-                
-                if frame_found:
-                    status_msg += " | 🎯 Рамка: отслеживается"
-                
-                # 🔥 ДОБАВЛЯЕМ СТАТУС БЕСКОНЕЧКИ
-                if self.infinite_mode.enabled and self.infinite_mode.is_active:
-                    # Получаем текущее количество циклов из деталей операции
-                    #infinite_cycles = pause_handler.operation_details.get('infinite_cycles', 0)
-                    
-                    #self.check_infinite_triggers(infinite_cycles)
+        # 🔥 РАСПИСАНИЕ: смерть хоста проверяется первой, статус - последним
+        # Интервалы рамки и бесконечки читаются из объектов - правка config.py действует сразу
+        scheduler.add_task('frame_color', check_frame_color,
+                           period=lambda: self.avatar_monitor.frame_monitor_interval,
+                           priority=0, condition=lambda: state['frame_found'])
+        scheduler.add_task('chat', check_chat, period=GOLD_CHECK_INTERVAL, start=GOLD_CHECK_INTERVAL,
+                           priority=1)
+        if not state['arrow_clicked']:
+            scheduler.add_task('arrow_search', search_arrow, period=ARROW_SEARCH_INTERVAL,
+                               deadline=self.arrow_delay, priority=2)
+            scheduler.add_task('arrow_timeout', arrow_timeout, start=self.arrow_delay,
+                               priority=2, condition=lambda: not state['arrow_clicked'])
+        scheduler.add_task('infinite', check_infinite,
+                           period=lambda: self.infinite_mode.attempt_interval,
+                           start=self.infinite_mode.attempt_interval, priority=3, condition=infinite_active)
+        scheduler.add_task('pet_triggers', check_pet_triggers, period=PET_TRIGGER_CHECK_INTERVAL,
+                           priority=4, condition=infinite_active)
+        scheduler.add_task('status', report_status, period=LOBBY_STATUS_INTERVAL, priority=5)
 
-                    infinite_stats = self.infinite_mode.get_stats_for_telegram()
-                    status_msg += f" | 🌀 Бесконечка:"
-                    status_msg += f" ВХОДЫ={infinite_stats['total_entries']}"
-                    status_msg += f" ВЫХОДЫ={infinite_stats['total_exits']}"
-                    status_msg += f" ЦИКЛЫ={infinite_stats['total_cycles']}"
-                    
-                    # 🔥 ДОБАВЛЯЕМ ИНФОРМАЦИЮ О СМЕРТЯХ ГЕРОЯ
-                    if infinite_stats.get('hero_dead', False):
-                        status_msg += f" | 💀 ГЕРОЙ МЕРТВ (смертей: {infinite_stats.get('hero_death_count', 0)})"
-                    if infinite_stats.get('hero_death_total', 0) > 0:
-                        status_msg += f" | 💀 Всего смертей героя: {infinite_stats.get('hero_death_total', 0)}"
-                
-                print(status_msg)
-                
-                # 🔥 ОБНОВЛЯЕМ ДЕТАЛИ ОПЕРАЦИИ ДЛЯ ТЕЛЕГРАМ
-                infinite_stats = self.infinite_mode.get_stats_for_telegram() if self.infinite_mode.enabled else {}
-                
-                pause_handler.update_operation_details({
-                    'elapsed_seconds': int(elapsed),
-                    'remaining_seconds': int(remaining),
-                    'arrow_found': arrow_clicked,
-                    'frame_found': frame_found,
-                    'gold_found': gold_found_count,
-                    'infinite_enabled': self.infinite_mode.enabled,
-                    'infinite_is_active': self.infinite_mode.is_active,
-                    'infinite_entries': infinite_stats.get('total_entries', 0),
-                    'infinite_exits': infinite_stats.get('total_exits', 0),
-                    'infinite_cycles': infinite_stats.get('total_cycles', 0),
-                    'infinite_total_cycles': infinite_stats.get('total_cycles', 0),
-                    'hero_dead': infinite_stats.get('hero_dead', False),
-                    'hero_death_count': infinite_stats.get('hero_death_total', 0),
-                    'hero_death_streak': infinite_stats.get('hero_death_count', 0)
-                })
-            
-            time.sleep(1)
+        reason, result, elapsed = scheduler.run()
+
+        if reason == FINISHED:
+            return result
+        if reason == TIMEOUT:
+            print("⏰ Таймаут лобби истек")
+            return "RESTART", "Лобби AFK больше таймаута"
+        return "RESTART", "Пауза/перезапуск"
 
     # Методы для обратной совместимости
     def monitor_gold_text(self, timeout=GOLD_MONITOR_TIMEOUT):
@@ -3,21 +3,37 @@ import pyautogui
 import pytesseract
 import time
 import os
+import numpy as np
+from scipy import ndimage
 from PIL import Image, ImageOps, ImageDraw, ImageEnhance, ImageFilter
 from pause_handler import pause_handler
-from config import ENABLE_DEBUG_SCREENSHOTS, FRAME_MONITOR_INTERVAL, RED_COLOR_THRESHOLD
+from frame_capture import frame_capture
+from ocr_engine import ocr_engine
+from template_matcher import template_matcher, FOUND, ABSENT
+from position_cache import position_cache
+from config import ENABLE_DEBUG_SCREENSHOTS
+from config_service import config_service
+from logger import debug
 from PIL import ImageEnhance, ImageFilter
 # avatar_monitor.py (исправления)
 
 class AvatarMonitor:
+    # Настройки, меняющиеся на лету без перезапуска: ключ config.py -> атрибут
+    LIVE_CONFIG = {
+        'FRAME_MONITOR_INTERVAL': 'frame_monitor_interval'
+    }
+
     def __init__(self, logger):
         self.logger = logger
         self.arrow_position = None
         self.avatar_frame_position = None
         self.avatar_frame_size = None
+        self.border_index = None  # Индексы пикселей границы рамки (считаются при фиксации)
+        self.border_index_size = None
         self.setup_tesseract()
         self.debug_screenshot_count = 0
         self.last_frame_color = None
+        config_service.bind(self, self.LIVE_CONFIG, "Монитор аватара")
 
     def setup_tesseract(self):
         """
@@ -45,10 +61,10 @@ class AvatarMonitor:
         """
         УСИЛЕННЫЙ метод поиска стрелки '>' на черном фоне
         """
-        print("🎯 УСИЛЕННЫЙ ПОИСК СТРЕЛКИ '>' НА ЧЕРНОМ ФОНЕ")
+        debug("🎯 УСИЛЕННЫЙ ПОИСК СТРЕЛКИ '>' НА ЧЕРНОМ ФОНЕ")
         
         try:
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = frame_capture.screen_size()
             
             # 🔥 ОБЛАСТЬ ПОИСКА: левый верхний угол (10% ширины, 30% высоты)
             search_region = (
@@ -58,10 +74,20 @@ class AvatarMonitor:
                 int(screen_height * 0.30)   # 30% высоты
             )
             
-            print(f"📐 Разрешение экрана: {screen_width}x{screen_height}")
-            print(f"🔍 Область поиска стрелки: {search_region}")
+            debug("📐 Разрешение экрана: %sx%s", screen_width, screen_height)
+            debug("🔍 Область поиска стрелки: %s", search_region)
             
-            screenshot = pyautogui.screenshot(region=search_region)
+            screenshot = frame_capture.grab(search_region)
+            
+            # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+            status, match = template_matcher.match('ARROW', screenshot, offset=search_region[:2])
+            if status == FOUND:
+                self.arrow_position = match['bbox'][:2]
+                position_cache.remember('ARROW', self.arrow_position, match['confidence'], match['bbox'])
+                return True
+            if status == ABSENT:
+                debug("❌ Стрелка '>' не найдена (шаблон)")
+                return False
             
             # 🔥 УСИЛЕННЫЕ ФИЛЬТРЫ ДЛЯ БЕЛОГО ТЕКСТА НА ЧЕРНОМ ФОНЕ
             if screenshot.mode != 'L':
@@ -94,42 +120,43 @@ class AvatarMonitor:
             
             custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=>'
             
-            for method_name, processed_image in methods:
-                print(f"  🧪 Метод: {method_name}")
-                
-                try:
-                    data = pytesseract.image_to_data(
-                        processed_image, 
-                        output_type=pytesseract.Output.DICT,
-                        config=custom_config,
-                        lang='eng'
-                    )
+            def find_arrow(method_name, data):
+                """Стрелка '>' в результате OCR одного метода: (x, y, w, h, уверенность)"""
+                for i in range(len(data['text'])):
+                    text = data['text'][i].strip()
+                    confidence = int(data['conf'][i])
                     
-                    for i in range(len(data['text'])):
-                        text = data['text'][i].strip()
-                        confidence = int(data['conf'][i])
-                        
-                        if text == '>' and confidence > 5:  # 🔥 Понижаем порог уверенности
+                    if text == '>' and confidence > 5:  # 🔥 Понижаем порог уверенности
+                        # Для масштабированных изображений корректируем координаты
+                        if method_name == "scaled":
+                            x = (data['left'][i] // 2) + search_region[0]
+                            y = (data['top'][i] // 2) + search_region[1]
+                        else:
                             x = data['left'][i] + search_region[0]
                             y = data['top'][i] + search_region[1]
-                            w = data['width'][i]
-                            h = data['height'][i]
-                            
-                            print(f"    ✅ Стрелка '>' найдена методом {method_name}! Уверенность: {confidence}%")
-                            print(f"    📍 Позиция: ({x}, {y})")
-                            
-                            # 🔥 СОХРАНЯЕМ СКРИНШОТЫ ДЛЯ ОТЛАДКИ
-                            #self.save_debug_screenshot(screenshot, "arrow_original")
-                            #self.save_debug_screenshot(processed_image, f"arrow_{method_name}")
-                            
-                            self.arrow_position = (x, y)
-                            return True
-                            
-                except Exception as e:
-                    print(f"    ⚠️ Ошибка в методе {method_name}: {e}")
+                        
+                        return x, y, data['width'][i], data['height'][i], confidence
+                return None
+            
+            # 🔥 ВСЕ МЕТОДЫ ПАРАЛЛЕЛЬНО - ПОБЕЖДАЕТ ПЕРВЫЙ УВЕРЕННЫЙ
+            method_name, found = ocr_engine.run_methods('arrow', methods, find_arrow, config=custom_config)
+            
+            if found:
+                x, y, w, h, confidence = found
+                print(f"    ✅ Стрелка '>' найдена методом {method_name}! Уверенность: {confidence}%")
+                print(f"    📍 Позиция: ({x}, {y})")
+                template_matcher.learn('ARROW', screenshot, (x, y, w, h),
+                                       offset=search_region[:2], confidence=confidence)
+                
+                # 🔥 СОХРАНЯЕМ СКРИНШОТЫ ДЛЯ ОТЛАДКИ
+                #self.save_debug_screenshot(screenshot, "arrow_original")
+                
+                self.arrow_position = (x, y)
+                position_cache.remember('ARROW', (x, y), confidence, (x, y, w, h))
+                return True
             
             # 🔥 ЕСЛИ НЕ НАШЛИ, ПРОБУЕМ ДОПОЛНИТЕЛЬНЫЕ МЕТОДЫ
-            print("🔍 Пробуем дополнительные методы...")
+            debug("🔍 Пробуем дополнительные методы...")
             
             # 🔥 МЕТОД 5: Масштабирование изображения
             scaled = gray.resize((gray.width * 2, gray.height * 2), Image.Resampling.LANCZOS)
@@ -145,45 +172,22 @@ class AvatarMonitor:
                 ("combined", binary_combined)
             ]
             
-            for method_name, processed_image in additional_methods:
-                print(f"  🧪 Дополнительный метод: {method_name}")
+            method_name, found = ocr_engine.run_methods('arrow_additional', additional_methods, find_arrow,
+                                                        config=custom_config)
+            
+            if found:
+                x, y, w, h, confidence = found
+                print(f"    ✅ Стрелка '>' найдена методом {method_name}! Уверенность: {confidence}%")
+                print(f"    📍 Позиция: ({x}, {y})")
                 
-                try:
-                    data = pytesseract.image_to_data(
-                        processed_image, 
-                        output_type=pytesseract.Output.DICT,
-                        config=custom_config,
-                        lang='eng'
-                    )
-                    
-                    for i in range(len(data['text'])):
-                        text = data['text'][i].strip()
-                        confidence = int(data['conf'][i])
-                        
-                        if text == '>' and confidence > 5:
-                            # Для масштабированных изображений корректируем координаты
-                            if method_name == "scaled":
-                                x = (data['left'][i] // 2) + search_region[0]
-                                y = (data['top'][i] // 2) + search_region[1]
-                            else:
-                                x = data['left'][i] + search_region[0]
-                                y = data['top'][i] + search_region[1]
-                                
-                            w = data['width'][i]
-                            h = data['height'][i]
-                            
-                            print(f"    ✅ Стрелка '>' найдена методом {method_name}! Уверенность: {confidence}%")
-                            print(f"    📍 Позиция: ({x}, {y})")
-                            
-                            self.save_debug_screenshot(processed_image, f"arrow_{method_name}_found")
-                            self.arrow_position = (x, y)
-                            return True
-                            
-                except Exception as e:
-                    print(f"    ⚠️ Ошибка в дополнительном методе {method_name}: {e}")
+                processed_image = dict(additional_methods)[method_name]
+                self.save_debug_screenshot(processed_image, f"arrow_{method_name}_found")
+                self.arrow_position = (x, y)
+                position_cache.remember('ARROW', (x, y), confidence, (x, y, w, h))
+                return True
             
             # 🔥 ЕСЛИ ВСЕ МЕТОДЫ НЕ СРАБОТАЛИ, СОХРАНЯЕМ СКРИНШОТЫ ДЛЯ АНАЛИЗА
-            print("❌ Стрелка '>' не найдена ни одним методом")
+            debug("❌ Стрелка '>' не найдена ни одним методом")
             self.save_debug_screenshot(screenshot, "arrow_search_area")
             
             # Сохраняем все обработанные изображения для анализа
@@ -203,14 +207,14 @@ class AvatarMonitor:
         print("🐛 УСИЛЕННЫЙ ДЕБАГ ПОИСКА СТРЕЛКИ")
         print("=" * 50)
         
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = frame_capture.screen_size()
         search_region = (0, 0, int(screen_width * 0.10), int(screen_height * 0.30))
         
         print(f"📐 Экран: {screen_width}x{screen_height}")
         print(f"🔍 Область поиска: {search_region}")
         
         # Делаем скриншот
-        screenshot = pyautogui.screenshot(region=search_region)
+        screenshot = frame_capture.screenshot(region=search_region)
         #self.save_debug_screenshot(screenshot, "debug_arrow_area")
         print("✅ Скриншот сохранен: debug_arrow_area.png")
         
@@ -225,7 +229,7 @@ class AvatarMonitor:
             print(f"\n📝 Метод {method_name}:")
             custom_config = r'--oem 3 --psm 6'
             try:
-                data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, config=custom_config, lang='eng')
+                data = ocr_engine.image_to_data(image, config=custom_config, lang='eng')
                 
                 found_anything = False
                 for i in range(len(data['text'])):
@@ -260,6 +264,7 @@ class AvatarMonitor:
             pyautogui.moveTo(x, y, duration=0.1)
             time.sleep(0.1)
             pyautogui.click()
+            frame_capture.invalidate()
             print("✅ Клик по стрелке выполнен!")
             
             # 🔥 ВАЖНО: Убираем мышь в сторону после клика!
@@ -286,6 +291,7 @@ class AvatarMonitor:
             pyautogui.moveTo(safe_x, safe_y, duration=0.2)
             
             time.sleep(0.5)  # Даем время на исчезновение курсора
+            frame_capture.invalidate()
             return True
             
         except Exception as e:
@@ -298,6 +304,12 @@ class AvatarMonitor:
         """
         print("🎯 ПОИСК СЕРОЙ РАМКИ РЯДОМ СО СТРЕЛКОЙ")
         
+        if not self.arrow_position:
+            # Стрелка могла быть найдена до перезапуска скрипта
+            self.arrow_position = position_cache.get_position('ARROW')
+            if self.arrow_position:
+                print(f"📍 Позиция стрелки из кэша: {self.arrow_position}")
+        
         if not self.arrow_position:
             print("❌ Позиция стрелки не определена, ищем по всей области")
             return self.find_avatar_frame_with_debug()
@@ -306,7 +318,7 @@ class AvatarMonitor:
         print(f"📍 Стрелка найдена в: ({arrow_x}, {arrow_y})")
         
         try:
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = frame_capture.screen_size()
             target_color = (100, 101, 105)  # HEX #646569
             color_tolerance = 20
             
@@ -321,37 +333,25 @@ class AvatarMonitor:
             
             print(f"🔍 Область поиска рамки вокруг стрелки: {search_region}")
             
-            # Сохраняем скриншот области поиска
-            search_screenshot = pyautogui.screenshot(region=search_region)
-            #self.save_debug_screenshot(search_screenshot, "frame_search_near_arrow")
-            
-            screenshot = pyautogui.screenshot(region=search_region)
+            # Один кадр области поиска (раньше снимался дважды)
+            screenshot = frame_capture.grab(search_region)
+            #self.save_debug_screenshot(screenshot, "frame_search_near_arrow")
             
             if screenshot.mode != 'RGB':
                 rgb_screenshot = screenshot.convert('RGB')
             else:
                 rgb_screenshot = screenshot
             
-            pixels = rgb_screenshot.load()
-            width, height = rgb_screenshot.size
-            
-            # Ищем области целевого цвета
-            gray_areas = []
-            for y in range(height):
-                for x in range(width):
-                    current_color = pixels[x, y]
-                    if (abs(current_color[0] - target_color[0]) <= color_tolerance and
-                        abs(current_color[1] - target_color[1]) <= color_tolerance and
-                        abs(current_color[2] - target_color[2]) <= color_tolerance):
-                        gray_areas.append((x, y))
+            # Маска пикселей целевого цвета (векторизованно)
+            gray_mask = self._color_mask(rgb_screenshot, target_color, color_tolerance)
             
-            if not gray_areas:
+            if not gray_mask.any():
                 print("❌ Серая рамка не найдена рядом со стрелкой")
                 # Пробуем поискать во всей области
                 return self.find_avatar_frame_with_debug()
             
             # Группируем в прямоугольники
-            rectangles = self.group_areas_into_rectangles(gray_areas)
+            rectangles = self.group_mask_into_rectangles(gray_mask)
             
             # Сохраняем скриншот с найденными областями
             found_screenshot = screenshot.copy()
@@ -392,16 +392,15 @@ class AvatarMonitor:
                 abs_x = x + search_region[0]
                 abs_y = y + search_region[1]
                 
-                self.avatar_frame_position = (abs_x, abs_y)
-                self.avatar_frame_size = (w, h)
+                self.set_avatar_frame(abs_x, abs_y, w, h, best_score)
                 
                 print(f"✅ Рамка аватарки найдена рядом со стрелкой!")
                 print(f"📍 Позиция: ({abs_x}, {abs_y})")
                 print(f"📏 Размер: {w}x{h} (квадратность: {best_score:.1f}%)")
                 print(f"🎯 Расстояние от стрелки: {abs(arrow_x - abs_x)}px по X, {abs(arrow_y - abs_y)}px по Y")
                 pause_handler.set_current_operation("Идёт игра, ожидаем красную рамку")
-                # Сохраняем скриншот выбранной рамки
-                frame_screenshot = pyautogui.screenshot(region=(abs_x, abs_y, w, h))
+                # Скриншот выбранной рамки (для отладки)
+                #frame_screenshot = frame_capture.grab((abs_x, abs_y, w, h))
                 #self.save_debug_screenshot(frame_screenshot, "selected_frame_near_arrow")
                 
                 return True
@@ -420,7 +419,7 @@ class AvatarMonitor:
         print("🎯 ПОИСК СЕРОЙ РАМКИ ПО ВСЕЙ ОБЛАСТИ (РЕЗЕРВНЫЙ МЕТОД)")
         
         try:
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = frame_capture.screen_size()
             target_color = (100, 101, 105)  # HEX #646569
             color_tolerance = 20
             
@@ -434,32 +433,22 @@ class AvatarMonitor:
             
             print(f"🔍 Резервный поиск по области: {search_region}")
             
-            screenshot = pyautogui.screenshot(region=search_region)
+            screenshot = frame_capture.grab(search_region)
             
             if screenshot.mode != 'RGB':
                 rgb_screenshot = screenshot.convert('RGB')
             else:
                 rgb_screenshot = screenshot
             
-            pixels = rgb_screenshot.load()
-            width, height = rgb_screenshot.size
-            
-            # Ищем области целевого цвета
-            gray_areas = []
-            for y in range(height):
-                for x in range(width):
-                    current_color = pixels[x, y]
-                    if (abs(current_color[0] - target_color[0]) <= color_tolerance and
-                        abs(current_color[1] - target_color[1]) <= color_tolerance and
-                        abs(current_color[2] - target_color[2]) <= color_tolerance):
-                        gray_areas.append((x, y))
+            # Маска пикселей целевого цвета (векторизованно)
+            gray_mask = self._color_mask(rgb_screenshot, target_color, color_tolerance)
             
-            if not gray_areas:
+            if not gray_mask.any():
                 print("❌ Серая рамка не найдена")
                 return False
             
             # Группируем в прямоугольники
-            rectangles = self.group_areas_into_rectangles(gray_areas)
+            rectangles = self.group_mask_into_rectangles(gray_mask)
             
             # Ищем самую квадратную рамку подходящего размера
             best_rectangle = None
@@ -483,8 +472,7 @@ class AvatarMonitor:
                 abs_x = x + search_region[0]
                 abs_y = y + search_region[1]
                 
-                self.avatar_frame_position = (abs_x, abs_y)
-                self.avatar_frame_size = (w, h)
+                self.set_avatar_frame(abs_x, abs_y, w, h, best_score)
                 
                 print(f"✅ Рамка аватарки найдена резервным методом!")
                 print(f"📍 Позиция: ({abs_x}, {abs_y})")
@@ -539,60 +527,7 @@ class AvatarMonitor:
             return result
         
         try:
-            x, y = self.avatar_frame_position
-            w, h = self.avatar_frame_size
-            
-            # Область рамки
-            region = (x, y, w, h)
-            screenshot = pyautogui.screenshot(region=region)
-            
-            if screenshot.mode != 'RGB':
-                rgb_screenshot = screenshot.convert('RGB')
-            else:
-                rgb_screenshot = screenshot
-            
-            pixels = rgb_screenshot.load()
-            width, height = rgb_screenshot.size
-            
-            # 🔥 ПРОСТОЙ АНАЛИЗ ЦВЕТА - на основе реальных данных
-            red_count = 0
-            gray_count = 0
-            total_pixels = 0
-            
-            # Анализируем только границы (1 пиксель от края)
-            for x_pos in range(width):
-                # Верхняя граница
-                r, g, b = pixels[x_pos, 0]
-                total_pixels += 1
-                if self._is_red_color(r, g, b):
-                    red_count += 1
-                elif self._is_gray_color(r, g, b):
-                    gray_count += 1
-                
-                # Нижняя граница
-                r, g, b = pixels[x_pos, height-1]
-                total_pixels += 1
-                if self._is_red_color(r, g, b):
-                    red_count += 1
-                elif self._is_gray_color(r, g, b):
-                    gray_count += 1
-            
-            for y_pos in range(1, height-1):  # Исключаем углы чтобы не дублировать
-                # Левая граница
-                r, g, b = pixels[0, y_pos]
-                total_pixels += 1
-                if self._is_red_color(r, g, b):
-                    red_count += 1
-                elif self._is_gray_color(r, g, b):
-                    gray_count += 1
-                
-                # Правая граница
-                r, g, b = pixels[width-1, y_pos]
-                total_pixels += 1
-                if self._is_red_color(r, g, b):
-                    red_count += 1
-                elif self._is_gray_color(r, g, b):
-                    gray_count += 1
+            red_count, gray_count, total_pixels = self.measure_frame_colors()
             
             # Рассчитываем проценты
             if total_pixels > 0:
@@ -605,8 +540,9 @@ class AvatarMonitor:
             result['red_percentage'] = red_ratio * 100
             result['gray_percentage'] = gray_ratio * 100
             
-            print(f"🔍 Анализ цвета: красных {red_count}/{total_pixels} ({result['red_percentage']:.1f}%), "
-                f"серых {gray_count}/{total_pixels} ({result['gray_percentage']:.1f}%)")
+            debug("🔍 Анализ цвета: красных %s/%s (%.1f%%), серых %s/%s (%.1f%%)",
+                  red_count, total_pixels, result['red_percentage'],
+                  gray_count, total_pixels, result['gray_percentage'])
             
             # 🔥 ПРОСТОЕ ОПРЕДЕЛЕНИЕ ЦВЕТА
             if red_ratio > 0.3:  # 30% красных
@@ -642,6 +578,106 @@ class AvatarMonitor:
             print(f"⚠️ Ошибка при анализе цвета: {e}")
             return result
 
+    def measure_frame_colors(self):
+        """
+        Подсчет красных и серых пикселей на границе рамки
+        Возвращает (красных, серых, всего пикселей границы)
+        """
+        x, y = self.avatar_frame_position
+        w, h = self.avatar_frame_size
+        
+        # Область рамки
+        region = (x, y, w, h)
+        screenshot = frame_capture.grab(region)
+        
+        if screenshot.mode != 'RGB':
+            rgb_screenshot = screenshot.convert('RGB')
+        else:
+            rgb_screenshot = screenshot
+        
+        pixels = np.asarray(rgb_screenshot, dtype=np.int16)
+        
+        # 🔥 ПРОСТОЙ АНАЛИЗ ЦВЕТА - только границы (1 пиксель от края)
+        # Индексы границ считаются один раз при фиксации рамки
+        border_y, border_x = self._get_border_index(pixels.shape[1], pixels.shape[0])
+        border = pixels[border_y, border_x]
+        r, g, b = border[:, 0], border[:, 1], border[:, 2]
+        
+        red_mask = self._red_mask(r, g, b)
+        gray_mask = self._gray_mask(r, g, b) & ~red_mask
+        
+        return int(red_mask.sum()), int(gray_mask.sum()), len(border)
+
+    def set_avatar_frame(self, x, y, w, h, confidence=100):
+        """Фиксирует найденную рамку и заранее считает индексы её границ"""
+        self.avatar_frame_position = (x, y)
+        self.avatar_frame_size = (w, h)
+        self.border_index = None
+        self._get_border_index(w, h)
+        position_cache.remember('AVATAR_FRAME', (x + w // 2, y + h // 2), confidence, (x, y, w, h))
+
+    def restore_cached_frame(self):
+        """
+        Восстанавливает рамку аватарки из кэша позиций (после перезапуска скрипта).
+        Рамка принимается, только если на её границе сейчас преобладает серый цвет.
+        """
+        bbox = position_cache.get_bbox('AVATAR_FRAME')
+        if not bbox:
+            return False
+        
+        x, y, w, h = bbox
+        self.avatar_frame_position = (x, y)
+        self.avatar_frame_size = (w, h)
+        self.border_index = None
+        
+        try:
+            red_count, gray_count, total_pixels = self.measure_frame_colors()
+        except Exception as e:
+            print(f"⚠️ Ошибка проверки рамки из кэша: {e}")
+            total_pixels = 0
+        
+        if total_pixels and gray_count / total_pixels > 0.6:
+            print(f"📍 Рамка аватарки из кэша подтверждена: ({x}, {y}) {w}x{h}")
+            position_cache.hit('AVATAR_FRAME')
+            return True
+        
+        print("❌ Рамка аватарки из кэша не подтвердилась")
+        self.avatar_frame_position = None
+        self.avatar_frame_size = None
+        return False
+
+    def _get_border_index(self, width, height):
+        """
+        Индексы (y, x) пикселей границы рамки шириной 1 пиксель.
+        Порядок как при обходе: верх/низ по всей ширине, лево/право без углов.
+        Пересчитываются только если размер области изменился.
+        """
+        if self.border_index is not None and self.border_index_size == (width, height):
+            return self.border_index
+        
+        xs = np.arange(width)
+        ys = np.arange(1, height - 1)
+        border_y = np.concatenate([np.zeros(width, dtype=int), np.full(width, height - 1),
+                                   ys, ys])
+        border_x = np.concatenate([xs, xs,
+                                   np.zeros(len(ys), dtype=int), np.full(len(ys), width - 1)])
+        
+        self.border_index = (border_y, border_x)
+        self.border_index_size = (width, height)
+        return self.border_index
+
+    def _red_mask(self, r, g, b):
+        """Векторный вариант _is_red_color для массивов каналов"""
+        return (r > 160) & (g < 110) & (b < 110)
+
+    def _gray_mask(self, r, g, b):
+        """Векторный вариант _is_gray_color для массивов каналов"""
+        return ((r >= 90) & (r <= 110) &
+                (g >= 90) & (g <= 110) &
+                (b >= 90) & (b <= 110) &
+                (np.abs(r - g) <= 10) &
+                (np.abs(r - b) <= 10))
+
     def _is_red_color(self, r, g, b):
         """Простая проверка красного цвета"""
         return r > 160 and g < 110 and b < 110
@@ -704,7 +740,7 @@ class AvatarMonitor:
         w, h = self.avatar_frame_size
         
         # Делаем скриншот рамки
-        screenshot = pyautogui.screenshot(region=(x, y, w, h))
+        screenshot = frame_capture.screenshot(region=(x, y, w, h))
         #self.save_debug_screenshot(screenshot, "color_test_original")
         
         rgb_screenshot = screenshot.convert('RGB')
@@ -775,74 +811,82 @@ class AvatarMonitor:
         return self.find_avatar_frame_near_arrow()
 
     # Остальные методы остаются без изменений
-    def group_areas_into_rectangles(self, areas, max_gap=5):
+    def _color_mask(self, image, target_color, tolerance):
+        """
+        Булева маска пикселей, совпадающих с цветом в пределах допуска
+        """
+        pixels = np.asarray(image.convert('RGB'), dtype=np.int16)
+        target = np.array(target_color, dtype=np.int16)
+        return np.all(np.abs(pixels - target) <= tolerance, axis=2)
+
+    def group_mask_into_rectangles(self, mask, max_gap=5):
         """
-        Группирует пиксели в прямоугольники
+        Группирует пиксели маски в прямоугольники через связные компоненты.
+        Разрывы до max_gap пикселей закрываются дилатацией маски,
+        прямоугольник считается по исходным пикселям компоненты.
         """
+        if not mask.any():
+            return []
+        
+        # Дилатация квадратом max_gap x max_gap: пиксели на расстоянии до max_gap
+        # попадают в одну 8-связную компоненту
+        dilated = ndimage.binary_dilation(mask, structure=np.ones((max_gap, max_gap), dtype=bool))
+        labels, _ = ndimage.label(dilated, structure=np.ones((3, 3), dtype=int))
+        labels = np.where(mask, labels, 0)
+        
+        boxes = {}
+        for label, slices in enumerate(ndimage.find_objects(labels), start=1):
+            if slices is not None:
+                boxes[label] = (slices[1].start, slices[0].start, slices[1].stop - 1, slices[0].stop - 1)
+        
+        # Порядок компонент - по первому пикселю построчно, как в исходном обходе
+        ys, xs = np.nonzero(labels)
+        found, first_index = np.unique(labels[ys, xs], return_index=True)
+        order = [int(found[i]) for i in np.argsort(first_index)]
+        
+        # Наращиваем прямоугольник: компоненты, пиксели которых попали в рамку
+        # с запасом max_gap, присоединяются к нему
+        height, width = mask.shape
         rectangles = []
-        used_areas = set()
+        used_labels = set()
         
-        for area in areas:
-            if area in used_areas:
+        for label in order:
+            if label in used_labels:
                 continue
-                
-            x, y = area
-            min_x, max_x = x, x
-            min_y, max_y = y, y
-            used_areas.add(area)
+            used_labels.add(label)
+            min_x, min_y, max_x, max_y = boxes[label]
             
             changed = True
             while changed:
                 changed = False
-                for check_x in range(min_x - max_gap, max_x + max_gap + 1):
-                    for check_y in range(min_y - max_gap, max_y + max_gap + 1):
-                        if (check_x, check_y) in areas and (check_x, check_y) not in used_areas:
-                            used_areas.add((check_x, check_y))
-                            min_x = min(min_x, check_x)
-                            max_x = max(max_x, check_x)
-                            min_y = min(min_y, check_y)
-                            max_y = max(max_y, check_y)
-                            changed = True
-            
-            width = max_x - min_x + 1
-            height = max_y - min_y + 1
-            
-            if width >= 10 and height >= 10:
-                rectangles.append((min_x, min_y, width, height))
+                window = labels[max(0, min_y - max_gap):min(height, max_y + max_gap + 1),
+                                max(0, min_x - max_gap):min(width, max_x + max_gap + 1)]
+                for other in np.unique(window):
+                    other = int(other)
+                    if other == 0 or other in used_labels:
+                        continue
+                    used_labels.add(other)
+                    o_min_x, o_min_y, o_max_x, o_max_y = boxes[other]
+                    min_x, min_y = min(min_x, o_min_x), min(min_y, o_min_y)
+                    max_x, max_y = max(max_x, o_max_x), max(max_y, o_max_y)
+                    changed = True
+            
+            rect_width = max_x - min_x + 1
+            rect_height = max_y - min_y + 1
+            
+            if rect_width >= 10 and rect_height >= 10:
+                rectangles.append((int(min_x), int(min_y), int(rect_width), int(rect_height)))
         
         return rectangles
+
+    def group_areas_into_rectangles(self, areas, max_gap=5):
         """
-        Группирует пиксели в прямоугольники
+        Группирует пиксели (список координат (x, y)) в прямоугольники
         """
-        rectangles = []
-        used_areas = set()
+        if not areas:
+            return []
         
-        for area in areas:
-            if area in used_areas:
-                continue
-                
-            x, y = area
-            min_x, max_x = x, x
-            min_y, max_y = y, y
-            used_areas.add(area)
-            
-            changed = True
-            while changed:
-                changed = False
-                for check_x in range(min_x - max_gap, max_x + max_gap + 1):
-                    for check_y in range(min_y - max_gap, max_y + max_gap + 1):
-                        if (check_x, check_y) in areas and (check_x, check_y) not in used_areas:
-                            used_areas.add((check_x, check_y))
-                            min_x = min(min_x, check_x)
-                            max_x = max(max_x, check_x)
-                            min_y = min(min_y, check_y)
-                            max_y = max(max_y, check_y)
-                            changed = True
-            
-            width = max_x - min_x + 1
-            height = max_y - min_y + 1
-            
-            if width >= 10 and height >= 10:
-                rectangles.append((min_x, min_y, width, height))
-        
-        return rectangles
\ No newline at end of file
+        xs, ys = zip(*areas)
+        mask = np.zeros((max(ys) + 1, max(xs) + 1), dtype=bool)
+        mask[list(ys), list(xs)] = True
+        return self.group_mask_into_rectangles(mask, max_gap)
\ No newline at end of file
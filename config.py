@@ -25,7 +25,7 @@ RESTART_ON_CRITICAL_ERROR = False  # True - перезапускать Dota 2 п
 START_TIME_SEC = 30
 
 ARROW_CLICK_DELAY = 420  # 7 минут в секундах после ACCEPT
-FRAME_MONITOR_INTERVAL = 5  # Проверка цвета рамки каждые 5 секунд
+FRAME_MONITOR_INTERVAL = 1  # Проверка цвета рамки каждую секунду
 RED_COLOR_THRESHOLD = 150   # Порог красного цвета для обнаружения смерти
 
 # Таймауты для поиска
@@ -36,11 +36,15 @@ OK_TIMEOUT = 5          # Таймаут для поиска OK
 
 # Таймауты для поиска (одна попытка)
 ACCEPT_SINGLE_ATTEMPT_TIMEOUT = 5    # 5 секунд на одну попытку распознавания ACCEPT
+POSITION_ROI_MARGIN = 150            # Поиск ACCEPT/OK сначала в области ±150px вокруг запомненной позиции
 OK_SINGLE_ATTEMPT_TIMEOUT = 3        # 3 секунды на одну попытку распознавания OK
 
 # Настройки для мониторинга после ACCEPT
 GOLD_MONITOR_TIMEOUT = 5000 # 1 час для мониторинга 999999999
 GOLD_CHECK_INTERVAL = 3     # Проверять текст каждые 5 секунд
+ARROW_SEARCH_INTERVAL = 1   # Поиск стрелки '>' каждую секунду (первые ARROW_CLICK_DELAY секунд)
+PET_TRIGGER_CHECK_INTERVAL = 10  # Проверка триггеров питомцев каждые 10 секунд
+LOBBY_STATUS_INTERVAL = 30  # Статус лобби в консоль и Telegram каждые 30 секунд
 
 # Интервалы между действиями (в секундах) - УМЕНЬШЕНЫ
 REFRESH_INTERVAL = 1.5     # Уменьшил с 2 до 1.5 секунд
@@ -52,10 +56,35 @@ MAX_RESTARTS = 9999         # Максимальное количество пе
 
 # Настройки логирования
 LOG_FILE = "log\\bot_log.txt"  # Файл для записи логов
+LOG_LEVEL = "INFO"  # Уровень логов: DEBUG / INFO / WARNING / ERROR (DEBUG - каждая попытка поиска, меняется на лету)
+LOG_MAX_SIZE_MB = 5  # Ротация лога при достижении размера (МБ)
+LOG_ROTATE_HOURS = 24  # Ротация лога по возрасту файла (часы)
+LOG_BACKUP_COUNT = 10  # Сколько сжатых архивов лога хранить
+LOG_FLUSH_INTERVAL = 1  # Накопленные строки лога записываются раз в N секунд
 # 🔥 ДОПОЛНИТЕЛЬНЫЕ НАСТРОЙКИ ДЛЯ БЕСКОНЕЧКИ
 INFINITE_STATS_FILE = "log\\infinite_stats.json"  # Файл для сохранения статистики бесконечки
 # Настройки статистики
-STATS_FILE = "log\\statistics.json"  # Файл для статистики
+STATS_FILE = "log\\statistics.json"  # Файл для статистики (снимок общей статистики)
+STATS_JOURNAL_FILE = "log\\statistics_events.jsonl"  # Журнал событий: одна строка на событие
+STATS_SNAPSHOT_EVERY = 50  # Снимок общей статистики каждые 50 событий
+STATS_JOURNAL_MAX_SIZE = 1024 * 1024  # После снимка журнал больше 1 МБ начинается заново (старый - в .1)
+STATS_FSYNC_BATCH = 10     # Сброс журнала на диск (fsync) каждые 10 событий или раз в PERSIST_FLUSH_INTERVAL
+STATS_RECENT_EVENTS = 100  # Сколько последних событий сессии держать в памяти и в снимке
+STATS_DB_ENABLED = True    # Дублировать статистику в SQLite для быстрых выборок за период
+STATS_DB_FILE = "log\\statistics.db"  # База статистики (сессии, события, циклы бесконечки)
+PERSIST_FLUSH_INTERVAL = 5  # Статистика пишется на диск фоновым потоком раз в 5 секунд
+STATS_ROLLUP_HOURS = 48     # Почасовые агрегаты за последние 48 часов
+STATS_ROLLUP_DAYS = 90      # Посуточные агрегаты за последние 90 дней
+STATS_QUANTILE_ACCURACY = 0.02  # Относительная точность квантилей p50/p90/p99
+# Запомненные позиции кнопок, стрелки и рамки аватарки (по разрешениям экрана)
+POSITION_CACHE_FILE = "log\\positions.json"
+POSITION_MIN_CONFIDENCE = 60  # Ниже этой уверенности позиция не используется
+POSITION_TARGET_MIN_CONFIDENCE = {  # Свой порог для целей с другой шкалой уверенности
+    'ARROW': 5,  # OCR стрелки '>' принимается уже при уверенности > 5
+    'AVATAR_FRAME': 0  # Уверенность рамки - квадратность, рамка перепроверяется по цвету границы
+}
+POSITION_CONFIDENCE_DECAY = 5  # Потеря уверенности позиции в % за час
+POSITION_MAX_MISSES = 3  # Промахов подряд до сброса позиции
 # Конфигурация питомцев
 PET_CONFIG_FILE = "config\\pets_config.json"
 
@@ -79,10 +108,44 @@ INFINITE_AFTER_KEY = "d"  # Клавиша для нажатия после ус
 # 🔥 НОВЫЙ ПАРАМЕТР: Включение/отключение скриншотов отладки
 ENABLE_DEBUG_SCREENSHOTS = False  # True - сохранять скриншоты, False - не сохранять
 
+# Скриншоты для Telegram (сжимаются в памяти, без записи на диск)
+SCREENSHOT_MAX_EDGE = 1280  # Длинная сторона скриншота в пикселях (0 - без уменьшения)
+SCREENSHOT_FORMAT = "JPEG"  # JPEG или WEBP
+SCREENSHOT_QUALITY = 80  # Качество сжатия (1-95)
+SCREENSHOT_ARCHIVE = False  # True - дополнительно сохранять отправленные скриншоты в папку screenshots (в фоне)
+
+# 🔥 ЗАХВАТ ЭКРАНА
+CAPTURE_BACKEND = "auto"  # auto (mss если установлен), mss, pyautogui, replay
+CAPTURE_REPLAY_SOURCE = "replay"  # Папка с PNG или zip-архив для CAPTURE_BACKEND = "replay"
+CAPTURE_RECORD_DIR = None  # Папка для записи кадров AFK мониторинга (None - не записывать)
+
+# 🔥 РАСПОЗНАВАНИЕ ТЕКСТА
+OCR_ENGINE = "auto"  # auto (tesserocr если установлен), tesserocr, pytesseract
+OCR_PARALLEL_ENABLED = True  # Методы предобработки распознаются параллельно, побеждает первый уверенный
+OCR_PARALLEL_WORKERS = 4  # Потоков для параллельного распознавания
+
+# 🔥 ПОИСК КНОПОК ПО ШАБЛОНАМ (ACCEPT, OK, FIND, REFRESH, DOTALAND, DISCONNECT, '>')
+TEMPLATE_MATCHING_ENABLED = True  # Сначала искать кнопки по шаблону, OCR - только при сомнениях
+TEMPLATE_DIR = "templates"  # Папка шаблонов (подпапки по разрешению экрана, например 2560x1440)
+TEMPLATE_MATCH_THRESHOLD = 0.85  # Совпадение выше порога - кнопка найдена без OCR
+TEMPLATE_REJECT_THRESHOLD = 0.5  # Совпадение ниже порога - кнопки точно нет, OCR не нужен
+TEMPLATE_OCR_RECHECK = 10  # Каждое N-е "кнопки нет" все равно проверяем через OCR
+TEMPLATE_LEARN_CONFIDENCE = 70  # Минимальная уверенность OCR для сохранения шаблона
+
+# 🔥 ИЗМЕНЕНИЕ НАСТРОЕК НА ЛЕТУ
+CONFIG_CHECK_INTERVAL = 2  # Как часто (сек) проверять, изменился ли config.py
+
 # Настройки Telegram бота
 TELEGRAM_BOT_TOKEN = ""  # 🔴 ВСТАВЬТЕ ВАШ ТОКЕН ЗДЕСЬ
 TELEGRAM_BOT_ENABLED = True  # Включить/выключить бота
 TELEGRAM_ADMIN_IDS = []  # 🔴 ДОБАВЬТЕ ID АДМИНОВ [123456789, ...]
+TELEGRAM_GLOBAL_RATE = 25  # Не больше N сообщений в секунду во все чаты (лимит Telegram - 30)
+TELEGRAM_CHAT_INTERVAL = 1.0  # Минимальный интервал между сообщениями в один чат (сек)
+TELEGRAM_MAX_RETRIES = 5  # Повторов отправки при ошибке сети
+TELEGRAM_RETRY_DELAY = 2  # Первая задержка повтора (сек), дальше удваивается
+TELEGRAM_DASHBOARD_INTERVAL = 5  # Живой статус: не чаще раза в N секунд (меняется на лету)
+TELEGRAM_DASHBOARD_REFRESH = 60  # Живой статус: обновлять время работы раз в N секунд без изменений (меняется на лету)
+DASHBOARD_FILE = "log\\status_dashboards.json"  # Закрепленные сообщения живого статуса (chat_id -> message_id)
 
 # Файлы для бота
 PASSWORDS_FILE = "log\\saved_passwords.json"
@@ -0,0 +1,303 @@
+# config_service.py
+import ast
+import os
+import threading
+import time
+import weakref
+from types import MappingProxyType
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.py")
+DEFAULT_CHECK_INTERVAL = 2  # Если в config.py нет CONFIG_CHECK_INTERVAL
+
+
+class ConfigSnapshot:
+    """
+    Неизменяемый снимок config.py
+    Раздается по ссылке: чтение значения - обычный доступ к словарю
+    """
+    def __init__(self, values, version, mtime):
+        self.values = MappingProxyType(values)
+        self.version = version
+        self.mtime = mtime
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __contains__(self, key):
+        return key in self.values
+
+
+class ConfigService:
+    """
+    Единый источник настроек из config.py вместо config_loader/dynamic_config.
+    Файл разбирается один раз (ast.literal_eval, без выполнения кода) в
+    снимок значений. Время изменения файла проверяется не чаще раза в
+    CONFIG_CHECK_INTERVAL секунд; при изменении строится новый снимок,
+    а подписчики получают только изменившиеся ключи.
+    Типы значений фиксируются по первому разбору: значение другого типа
+    после правки файла отклоняется, остается прежнее.
+    """
+    def __init__(self, config_file=CONFIG_FILE):
+        self.config_file = config_file
+        self.lock = threading.Lock()
+        self.subscribers = []  # [(набор ключей или None, callback)]
+        self.types = {}        # ключ -> тип значения при первом разборе
+        self.snapshot = ConfigSnapshot({}, 0, 0)
+        self.last_check_time = 0
+        self.watched_files = []  # [[путь, ссылка на callback, время изменения]] - доп. файлы (pets_config.json)
+        self.watcher_thread = None
+        self.reload()
+
+    def _parse(self):
+        """Значения всех присваиваний верхнего уровня с литералами"""
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=self.config_file)
+
+        values = {}
+        for node in tree.body:
+            if not isinstance(node, ast.Assign):
+                continue
+            try:
+                value = ast.literal_eval(node.value)
+            except ValueError:
+                continue  # Вычисляемое выражение - не настройка
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    values[target.id] = value
+        return values
+
+    def _validate(self, key, value, old_values):
+        """Значение с проверкой типа; при несовпадении - прежнее значение"""
+        expected = self.types.get(key)
+        if expected is None or expected is type(None):
+            # Значение по умолчанию None (например CAPTURE_RECORD_DIR) - тип задает первое заданное
+            if value is not None:
+                self.types[key] = type(value)
+            return value
+
+        if isinstance(value, expected) and not (expected is int and isinstance(value, bool)):
+            return value
+        if expected is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+
+        print(f"⚠️ config.{key}: ожидается {expected.__name__}, получено {type(value).__name__} - оставляем прежнее значение")
+        return old_values.get(key, value)
+
+    def reload(self):
+        """
+        Перечитывает config.py и уведомляет подписчиков об изменениях
+        Возвращает словарь изменившихся ключей
+        """
+        with self.lock:
+            try:
+                mtime = os.path.getmtime(self.config_file)
+                parsed = self._parse()
+            except Exception as e:
+                print(f"⚠️ Ошибка чтения {self.config_file}: {e}")
+                return {}
+
+            old_values = self.snapshot.values
+            values = {key: self._validate(key, value, old_values) for key, value in parsed.items()}
+            changed = {key: value for key, value in values.items()
+                       if key not in old_values or old_values[key] != value}
+
+            self.last_check_time = time.monotonic()
+            if not changed and self.snapshot.version:
+                self.snapshot = ConfigSnapshot(dict(old_values), self.snapshot.version, mtime)
+                return {}
+
+            is_first = self.snapshot.version == 0
+            self.snapshot = ConfigSnapshot(values, self.snapshot.version + 1, mtime)
+            snapshot = self.snapshot
+            subscribers = list(self.subscribers)
+
+        if not is_first:
+            print(f"⚙️ config.py изменен: {', '.join(sorted(changed))}")
+            self._notify(subscribers, changed, snapshot)
+        return changed
+
+    def _notify(self, subscribers, changed, snapshot):
+        for keys, callback in subscribers:
+            relevant = changed if keys is None else {key: value for key, value in changed.items() if key in keys}
+            if not relevant:
+                continue
+            try:
+                callback(relevant, snapshot)
+            except Exception as e:
+                print(f"⚠️ Ошибка обработчика изменения настроек: {e}")
+
+    def get_snapshot(self):
+        """Текущий снимок; файл проверяется не чаще CONFIG_CHECK_INTERVAL секунд"""
+        snapshot = self.snapshot
+        interval = snapshot.get('CONFIG_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+        if time.monotonic() - self.last_check_time < interval:
+            return snapshot
+
+        self.last_check_time = time.monotonic()
+        try:
+            if os.path.getmtime(self.config_file) != snapshot.mtime:
+                self.reload()
+        except OSError as e:
+            print(f"⚠️ Не удалось проверить {self.config_file}: {e}")
+        return self.snapshot
+
+    def get(self, key, default=None):
+        return self.get_snapshot().get(key, default)
+
+    def subscribe(self, callback, keys=None):
+        """
+        callback(изменившиеся ключи {ключ: значение}, снимок) вызывается после
+        изменения config.py; keys - интересующие ключи (None - все)
+        """
+        with self.lock:
+            self.subscribers.append((set(keys) if keys else None, callback))
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            self.subscribers = [(keys, cb) for keys, cb in self.subscribers if cb != callback]
+
+    def update_value(self, key, value, allow_float=False):
+        """
+        Записывает новое значение настройки в config.py (комментарий в строке
+        сохраняется) и сразу применяет его. Возвращает (успех, сообщение)
+        allow_float - целая настройка может стать дробной (интервалы: 1 -> 1.5)
+        """
+        expected = self.types.get(key)
+        if key not in self.snapshot:
+            return False, f"Настройка {key} не найдена в config.py"
+        if expected is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if expected is int and allow_float and isinstance(value, float):
+            expected = float
+        if expected not in (None, type(None)) and (
+                not isinstance(value, expected) or (expected is int and isinstance(value, bool))):
+            return False, f"{key}: ожидается {expected.__name__}, получено {type(value).__name__}"
+
+        with self.lock:
+            try:
+                with open(self.config_file, 'r', encoding='utf-8', newline='') as f:
+                    lines = f.readlines()
+
+                node = None
+                for statement in ast.parse(''.join(lines)).body:
+                    if (isinstance(statement, ast.Assign) and len(statement.targets) == 1 and
+                            isinstance(statement.targets[0], ast.Name) and statement.targets[0].id == key):
+                        node = statement.value
+                if node is None or node.lineno != node.end_lineno:
+                    return False, f"{key}: значение занимает несколько строк, измените config.py вручную"
+
+                # Смещения ast - в байтах UTF-8
+                line = lines[node.lineno - 1].encode('utf-8')
+                line = line[:node.col_offset] + repr(value).encode('utf-8') + line[node.end_col_offset:]
+                lines[node.lineno - 1] = line.decode('utf-8')
+
+                with open(self.config_file, 'w', encoding='utf-8', newline='') as f:
+                    f.writelines(lines)
+                if expected is float:
+                    # Расширение int -> float, иначе перечитанное значение будет отклонено
+                    self.types[key] = float
+            except Exception as e:
+                return False, f"Ошибка записи {self.config_file}: {e}"
+
+        self.reload()
+        return True, f"{key} = {value!r}"
+
+    def bind(self, owner, attributes, name):
+        """
+        Настройки как атрибуты объекта, обновляемые на лету.
+        attributes - {ключ config.py: имя атрибута}. Объект получает текущие
+        значения сразу, а после правки config.py - только изменившиеся.
+        Подписка держит объект по слабой ссылке и снимается вместе с ним.
+        """
+        snapshot = self.get_snapshot()
+        for key, attribute in attributes.items():
+            setattr(owner, attribute, snapshot.get(key))
+
+        owner_ref = weakref.ref(owner)
+
+        def apply(changed, snapshot):
+            target = owner_ref()
+            if target is None:
+                self.unsubscribe(apply)
+                return
+            for key, value in changed.items():
+                setattr(target, attributes[key], value)
+                print(f"⚙️ {name}: {key} = {value}")
+
+        self.subscribe(apply, keys=attributes)
+        return apply
+
+    def watch_file(self, path, callback):
+        """
+        callback() вызывается из наблюдателя после изменения файла path.
+        Метод объекта хранится по слабой ссылке - подписка снимается вместе с объектом
+        """
+        if hasattr(callback, '__self__'):
+            callback_ref = weakref.WeakMethod(callback)
+        else:
+            callback_ref = lambda: callback
+        with self.lock:
+            self.watched_files.append([path, callback_ref, self._get_mtime(path)])
+
+    def mark_file_seen(self, path, callback):
+        """Файл изменен самим подписчиком (сохранение) - не уведомлять его"""
+        with self.lock:
+            for entry in self.watched_files:
+                if entry[0] == path and entry[1]() == callback:
+                    entry[2] = self._get_mtime(path)
+
+    @staticmethod
+    def _get_mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def _check_files(self):
+        with self.lock:
+            # Подписчики, которых уже нет, больше не проверяем
+            self.watched_files = [entry for entry in self.watched_files if entry[1]() is not None]
+            changed = []
+            for entry in self.watched_files:
+                mtime = self._get_mtime(entry[0])
+                if mtime != entry[2]:
+                    entry[2] = mtime
+                    callback = entry[1]()
+                    if callback is not None:
+                        changed.append((entry[0], callback))
+
+        for path, callback in changed:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️ Ошибка обработчика изменения {path}: {e}")
+
+    def start_watcher(self):
+        """
+        Фоновая проверка config.py и отслеживаемых файлов раз в CONFIG_CHECK_INTERVAL
+        секунд - изменения доходят до подписчиков, даже если настройки никто не читает
+        """
+        if self.watcher_thread is not None:
+            return
+        self.watcher_thread = threading.Thread(target=self._watch, name="config_watcher", daemon=True)
+        self.watcher_thread.start()
+        print("👁️ Наблюдение за config.py запущено")
+
+    def _watch(self):
+        while True:
+            time.sleep(self.snapshot.get('CONFIG_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL))
+            try:
+                self.get_snapshot()
+                self._check_files()
+            except Exception as e:
+                print(f"⚠️ Ошибка наблюдения за настройками: {e}")
+
+# Глобальный экземпляр
+config_service = ConfigService()
+
+# Удобная функция для использования
+def get_config(key, default=None):
+    return config_service.get(key, default)
\ No newline at end of file
@@ -0,0 +1,256 @@
+# frame_capture.py
+import os
+import threading
+import time
+import zipfile
+from PIL import Image
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+
+class PyAutoGuiBackend:
+    """Захват экрана через pyautogui (стандартный, медленный)"""
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self.pyautogui = pyautogui
+
+    def screenshot(self, region=None):
+        if region:
+            return self.pyautogui.screenshot(region=region)
+        return self.pyautogui.screenshot()
+
+    def size(self):
+        return tuple(self.pyautogui.size())
+
+
+class MssBackend:
+    """
+    Быстрый нативный захват экрана через mss
+    Объект mss создается для каждого потока отдельно (требование mss на Windows)
+    """
+    name = "mss"
+
+    def __init__(self):
+        if not MSS_AVAILABLE:
+            raise ImportError("mss не установлен (pip install mss)")
+        self.local = threading.local()
+
+    def _sct(self):
+        if not hasattr(self.local, 'sct'):
+            self.local.sct = mss.mss()
+        return self.local.sct
+
+    def screenshot(self, region=None):
+        sct = self._sct()
+        if region:
+            x, y, w, h = region
+            monitor = {'left': int(x), 'top': int(y), 'width': int(w), 'height': int(h)}
+        else:
+            monitor = sct.monitors[1]  # Основной монитор
+        shot = sct.grab(monitor)
+        return Image.frombytes('RGB', shot.size, shot.bgra, 'raw', 'BGRX')
+
+    def size(self):
+        monitor = self._sct().monitors[1]
+        return monitor['width'], monitor['height']
+
+
+class ReplayBackend:
+    """
+    Воспроизведение записанных кадров вместо реального экрана
+    source - папка с PNG или zip-архив с PNG (кадры идут по имени файла)
+    Каждый вызов screenshot() выдает следующий кадр, region вырезается из него.
+    Позволяет гонять детекторы без запущенной Dota 2.
+    """
+    name = "replay"
+
+    def __init__(self, source, loop=True):
+        self.source = source
+        self.loop = loop
+        self.lock = threading.Lock()
+        self.archive = None
+        self.index = -1
+
+        if os.path.isdir(source):
+            self.frames = sorted(
+                os.path.join(source, f) for f in os.listdir(source)
+                if f.lower().endswith('.png')
+            )
+        elif zipfile.is_zipfile(source):
+            self.archive = zipfile.ZipFile(source)
+            self.frames = sorted(
+                f for f in self.archive.namelist() if f.lower().endswith('.png')
+            )
+        else:
+            raise FileNotFoundError(f"Источник кадров не найден: {source}")
+
+        if not self.frames:
+            raise ValueError(f"В источнике нет PNG кадров: {source}")
+
+        self.frame_size = self._load(0).size
+        print(f"🎞️ Воспроизведение кадров: {len(self.frames)} шт. из {source}")
+
+    def _load(self, index):
+        name = self.frames[index]
+        if self.archive is not None:
+            with self.archive.open(name) as f:
+                image = Image.open(f)
+                image.load()
+        else:
+            image = Image.open(name)
+            image.load()
+        return image.convert('RGB')
+
+    def screenshot(self, region=None):
+        with self.lock:
+            if self.index + 1 < len(self.frames):
+                self.index += 1
+            elif self.loop:
+                self.index = 0
+            frame = self._load(self.index)
+
+        if region:
+            x, y, w, h = region
+            return frame.crop((x, y, x + w, y + h))
+        return frame
+
+    def size(self):
+        return self.frame_size
+
+
+def create_backend(name="auto", replay_source=None):
+    """
+    Создает бэкенд захвата по имени: auto, mss, pyautogui, replay
+    auto - mss если установлен, иначе pyautogui
+    """
+    if name == "replay":
+        return ReplayBackend(replay_source)
+    if name == "mss" or (name == "auto" and MSS_AVAILABLE):
+        try:
+            return MssBackend()
+        except Exception as e:
+            print(f"⚠️ mss недоступен ({e}), используем pyautogui")
+    return PyAutoGuiBackend()
+
+
+class FrameCapture:
+    """
+    Единая точка захвата экрана для всех модулей.
+    screenshot() - прямой захват через выбранный бэкенд,
+    grab() - вырезка из общего кадра текущего тика цикла мониторинга
+    (один полноэкранный скриншот на тик вместо отдельного на каждый детектор).
+    """
+    def __init__(self, backend=None, max_frame_age=5.0):
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.frame = None
+        self.frame_time = 0.0
+        self.frame_id = 0
+        self.max_frame_age = max_frame_age  # Страховка: старый кадр снимается заново
+        self.capture_count = 0
+        self.record_dir = None
+
+    def get_backend(self):
+        """Бэкенд создается лениво, при первом захвате"""
+        if self.backend is None:
+            from config import CAPTURE_BACKEND, CAPTURE_REPLAY_SOURCE, CAPTURE_RECORD_DIR
+            self.backend = create_backend(CAPTURE_BACKEND, CAPTURE_REPLAY_SOURCE)
+            print(f"📷 Бэкенд захвата экрана: {self.backend.name}")
+            if CAPTURE_RECORD_DIR and self.backend.name != "replay":
+                self.start_recording(CAPTURE_RECORD_DIR)
+        return self.backend
+
+    def set_backend(self, backend):
+        """Замена бэкенда (например, на ReplayBackend для тестов)"""
+        with self.lock:
+            self.backend = backend
+            self.frame = None
+
+    def screenshot(self, region=None):
+        """
+        Прямой захват экрана - замена pyautogui.screenshot(region=...)
+        region - (x, y, width, height) или None для всего экрана
+        """
+        return self.get_backend().screenshot(region)
+
+    def screen_size(self):
+        """Размер экрана (или записанного кадра) - замена pyautogui.size()"""
+        return self.get_backend().size()
+
+    def _capture(self):
+        """Снимает полноэкранный кадр (вызывается под блокировкой)"""
+        self.frame = self.get_backend().screenshot()
+        self.frame_time = time.time()
+        self.frame_id += 1
+        self.capture_count += 1
+
+        if self.record_dir:
+            try:
+                self.frame.save(os.path.join(self.record_dir, f"frame_{self.frame_id:06d}.png"))
+            except Exception as e:
+                print(f"⚠️ Не удалось записать кадр: {e}")
+
+    def new_tick(self):
+        """
+        Начало нового тика: снимаем один кадр для всех проверок тика
+        Возвращает номер кадра
+        """
+        with self.lock:
+            self._capture()
+            return self.frame_id
+
+    def invalidate(self):
+        """
+        Сбрасывает текущий кадр после действий, меняющих экран
+        (клики, нажатия клавиш). Следующий grab снимет свежий кадр.
+        """
+        with self.lock:
+            self.frame = None
+
+    def get_frame(self):
+        """Возвращает текущий полноэкранный кадр (снимает его при необходимости)"""
+        with self.lock:
+            if self.frame is None or time.time() - self.frame_time > self.max_frame_age:
+                self._capture()
+            return self.frame
+
+    def grab(self, region=None):
+        """
+        Вырезка области из кадра текущего тика
+        region - (x, y, width, height) или None для всего экрана
+        """
+        frame = self.get_frame()
+        if region is None:
+            return frame.copy()
+
+        x, y, w, h = region
+        return frame.crop((x, y, x + w, y + h))
+
+    def start_recording(self, record_dir):
+        """Сохранять каждый кадр тика в папку (для последующего воспроизведения)"""
+        os.makedirs(record_dir, exist_ok=True)
+        self.record_dir = record_dir
+        print(f"⏺️ Запись кадров в {record_dir}")
+
+    def stop_recording(self):
+        self.record_dir = None
+
+    def get_frame_info(self):
+        """Информация о текущем кадре (для отладки)"""
+        with self.lock:
+            return {
+                'backend': self.backend.name if self.backend else None,
+                'frame_id': self.frame_id,
+                'frame_time': self.frame_time,
+                'frame_age': time.time() - self.frame_time if self.frame is not None else None,
+                'capture_count': self.capture_count
+            }
+
+# Глобальный экземпляр
+frame_capture = FrameCapture()
\ No newline at end of file
@@ -2,26 +2,35 @@
 
 import json
 import os
+import numpy as np
 import pyautogui
 import time
 import keyboard
 from config import (
     INFINITE_MODE_ENABLED, 
-    INFINITE_ATTEMPT_INTERVAL,
-    INFINITE_KEY_PRESS,
-    INFINITE_CLICK_X,
-    INFINITE_CLICK_Y,
-    INFINITE_BUTTON_COLOR,
-    INFINITE_COLOR_TOLERANCE,
-    INFINITE_SEARCH_REGION,
-    INFINITE_AFTER_PRESS_DELAY,
-    INFINITE_AFTER_KEY,
     INFINITE_STATS_FILE
 )
 from pause_handler import pause_handler
 from statistics import stats
+from frame_capture import frame_capture
+from stats_db import stats_db
+from persistence import persistence, atomic_write_json
+from config_service import config_service
 
 class InfiniteMode:
+    # Настройки, меняющиеся на лету без перезапуска: ключ config.py -> атрибут
+    LIVE_CONFIG = {
+        'INFINITE_ATTEMPT_INTERVAL': 'attempt_interval',
+        'INFINITE_KEY_PRESS': 'key_press',
+        'INFINITE_CLICK_X': 'click_x',
+        'INFINITE_CLICK_Y': 'click_y',
+        'INFINITE_BUTTON_COLOR': 'button_color',
+        'INFINITE_COLOR_TOLERANCE': 'color_tolerance',
+        'INFINITE_SEARCH_REGION': 'search_region',
+        'INFINITE_AFTER_PRESS_DELAY': 'after_press_delay',
+        'INFINITE_AFTER_KEY': 'after_key'
+    }
+
     def __init__(self, logger):
         self.logger = logger
         self.enabled = INFINITE_MODE_ENABLED
@@ -44,6 +53,9 @@ class InfiniteMode:
         
         self.total_infinite_stats = self._load_stats()
 
+        # 🔥 НАСТРОЙКИ ИЗ config.py С ОБНОВЛЕНИЕМ НА ЛЕТУ
+        config_service.bind(self, self.LIVE_CONFIG, "Бесконечка")
+
         print(f"🌀 Режим бесконечки: {'ВКЛЮЧЕН' if self.enabled else 'ВЫКЛЮЧЕН'}")
     
     def _load_stats(self):  # 🔥 ИЗМЕНЕНИЕ: Переименовали в _load_stats и определили ДО вызова
@@ -68,13 +80,14 @@ class InfiniteMode:
         }
     
     def _save_stats(self):  # 🔥 ИЗМЕНЕНИЕ: Переименовали в _save_stats
-        """Сохранение статистики в файл"""
+        """Сохранение статистики в файл (в фоновом потоке при ближайшем сбросе)"""
+        persistence.mark_dirty(INFINITE_STATS_FILE, self._write_stats)
+        return True
+    
+    def _write_stats(self):
+        """Запись статистики бесконечки (вызывается фоновым потоком persistence)"""
         try:
-            # Создаем папку если не существует
-            os.makedirs(os.path.dirname(INFINITE_STATS_FILE), exist_ok=True)
-            
-            with open(INFINITE_STATS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.total_infinite_stats, f, indent=2, ensure_ascii=False)
+            atomic_write_json(INFINITE_STATS_FILE, dict(self.total_infinite_stats))
             
             # print(f"✅ Статистика бесконечки сохранена в {INFINITE_STATS_FILE}")  # Можно раскомментировать для отладки
             return True
@@ -103,12 +116,12 @@ class InfiniteMode:
 
     def calculate_search_region(self):
         """Расчет области поиска на основе процентов"""
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = frame_capture.screen_size()
         
-        top_offset = int(screen_height * (INFINITE_SEARCH_REGION["top_percent"] / 100))
-        bottom_offset = int(screen_height * (INFINITE_SEARCH_REGION["bottom_percent"] / 100))
-        left_offset = int(screen_width * (INFINITE_SEARCH_REGION["left_percent"] / 100))
-        right_offset = int(screen_width * (INFINITE_SEARCH_REGION["right_percent"] / 100))
+        top_offset = int(screen_height * (self.search_region["top_percent"] / 100))
+        bottom_offset = int(screen_height * (self.search_region["bottom_percent"] / 100))
+        left_offset = int(screen_width * (self.search_region["left_percent"] / 100))
+        right_offset = int(screen_width * (self.search_region["right_percent"] / 100))
         
         region = (
             left_offset,
@@ -124,33 +137,28 @@ class InfiniteMode:
         region = self.calculate_search_region()
         
         try:
-            screenshot = pyautogui.screenshot(region=region)
+            screenshot = frame_capture.grab(region)
             rgb_screenshot = screenshot.convert('RGB')
-            pixels = rgb_screenshot.load()
-            width, height = rgb_screenshot.size
-            
-            target_color = INFINITE_BUTTON_COLOR
-            tolerance = INFINITE_COLOR_TOLERANCE
             
-            # Поиск пикселей с похожим цветом
-            found_pixels = []
+            # 🔥 Векторизованный поиск: маска допуска по всем пикселям за один проход
+            pixels = np.asarray(rgb_screenshot, dtype=np.int16)
+            target_color = np.array(self.button_color, dtype=np.int16)
+            tolerance = self.color_tolerance
             
-            for y in range(height):
-                for x in range(width):
-                    current_color = pixels[x, y]
-                    if self.color_match(current_color, target_color, tolerance):
-                        found_pixels.append((x, y))
+            mask = np.all(np.abs(pixels - target_color) <= tolerance, axis=2)
+            ys, xs = np.nonzero(mask)
+            count = len(xs)
             
-            if found_pixels:
+            if count:
                 # Находим центр группы пикселей
-                avg_x = sum(p[0] for p in found_pixels) / len(found_pixels)
-                avg_y = sum(p[1] for p in found_pixels) / len(found_pixels)
+                avg_x = xs.mean()
+                avg_y = ys.mean()
                 
                 # Конвертируем в абсолютные координаты
                 abs_x = region[0] + int(avg_x)
                 abs_y = region[1] + int(avg_y)
                 
-                return (abs_x, abs_y, len(found_pixels))
+                return (abs_x, abs_y, count)
             else:
                 return None
                 
@@ -181,7 +189,7 @@ class InfiniteMode:
         """
         try:
             print(f"\n🌀 НАЧАЛО ЦИКЛА БЕСКОНЕЧКИ (попытка #{self.current_attempt_count + 1})")
-            print(f"   Клавиша: '{INFINITE_KEY_PRESS}', Жесткие координаты: ({INFINITE_CLICK_X}, {INFINITE_CLICK_Y})")
+            print(f"   Клавиша: '{self.key_press}', Жесткие координаты: ({self.click_x}, {self.click_y})")
             
             # 🔥 УВЕЛИЧИВАЕМ СЧЕТЧИК ПОПЫТОК
             self.current_attempt_count += 1
@@ -225,20 +233,23 @@ class InfiniteMode:
             print(f"📊 Определено как: {'ВХОД' if is_entry_attempt else 'ВЫХОД'}")
             
             # 🔥 ШАГ 1: Всегда нажимаем клавишу перемещения камеры через keyboard
-            print(f"⌨️ 1. Нажатие клавиши перемещения камеры: '{INFINITE_KEY_PRESS}'...")
-            keyboard.press_and_release(INFINITE_KEY_PRESS)
+            print(f"⌨️ 1. Нажатие клавиши перемещения камеры: '{self.key_press}'...")
+            keyboard.press_and_release(self.key_press)
             time.sleep(0.2)
             
             # 🔥 ШАГ 2: Всегда кликаем по жестко заданным координатам
-            print(f"🖱️ 2. Клик по жестким координатам: ({INFINITE_CLICK_X}, {INFINITE_CLICK_Y})...")
+            print(f"🖱️ 2. Клик по жестким координатам: ({self.click_x}, {self.click_y})...")
             try:
-                pyautogui.moveTo(INFINITE_CLICK_X, INFINITE_CLICK_Y, duration=0.2)
+                pyautogui.moveTo(self.click_x, self.click_y, duration=0.2)
                 pyautogui.click()
                 print(f"✅ Клик по координатам выполнен!")
                 time.sleep(0.3)
             except Exception as e:
                 print(f"⚠️ Ошибка клика по координатах: {e}")
             
+            # Экран изменился после клавиши и клика - нужен свежий кадр
+            frame_capture.invalidate()
+            
             # 🔥 ШАГ 3: После клика проверяем результат - ищем кнопку по цвету
             print("🔍 3. Проверка результата - поиск кнопки по цвету...")
             button_result = self.find_button_by_color()
@@ -246,7 +257,7 @@ class InfiniteMode:
             if button_result:
                 x, y, pixel_count = button_result
                 print(f"✅ Кнопка бесконечки найдена после клика! Пикселей: {pixel_count}")
-                print(f"📍 Найденные координаты: ({x}, {y}) vs жесткие: ({INFINITE_CLICK_X}, {INFINITE_CLICK_Y})")
+                print(f"📍 Найденные координаты: ({x}, {y}) vs жесткие: ({self.click_x}, {self.click_y})")
                 print(f"📊 Тип попытки: {'ВХОД' if is_entry_attempt else 'ВЫХОД'}")
                 
                 # 🔥 ОБРАБОТКА СМЕРТИ ГЕРОЯ: если это попытка ВХОДА
@@ -288,7 +299,7 @@ class InfiniteMode:
                         return "HERO_DEAD"
                 
                 # 🔥 ШАГ 4: Дополнительный клик по найденной кнопке (если координаты отличаются)
-                if abs(x - INFINITE_CLICK_X) > 10 or abs(y - INFINITE_CLICK_Y) > 10:
+                if abs(x - self.click_x) > 10 or abs(y - self.click_y) > 10:
                     print(f"🖱️ 4. Дополнительный клик по найденной кнопке...")
                     pyautogui.moveTo(x, y, duration=0.1)
                     pyautogui.click()
@@ -297,9 +308,12 @@ class InfiniteMode:
                 # 🔥 ШАГ 5: ВЫПОЛНЯЕМ ВХОД ИЛИ ВЫХОД (если герой не умер)
                 if is_entry_attempt and not self.hero_dead:
                     print("🎯 ВЫПОЛНЯЕМ ВХОД - ожидаю и нажимаю D...")
-                    time.sleep(INFINITE_AFTER_PRESS_DELAY)
-                    keyboard.press_and_release(INFINITE_AFTER_KEY)
-                    print(f"⌨️ Нажата клавиша '{INFINITE_AFTER_KEY}' после входа")
+                    if not pause_handler.interruptible_sleep(self.after_press_delay):
+                        # Перезапуск/завершение - вход не выполнен, счетчики не трогаем
+                        print("🛑 Вход в бесконечку прерван (перезапуск/завершение)")
+                        return "INTERRUPTED"
+                    keyboard.press_and_release(self.after_key)
+                    print(f"⌨️ Нажата клавиша '{self.after_key}' после входа")
                     
                     # Сбрасываем счетчик подряд найденных входов при успешном входе
                     self.consecutive_found_entries = 0
@@ -312,6 +326,7 @@ class InfiniteMode:
                     
                     # 🔥 СОХРАНЯЕМ СТАТИСТИКУ
                     self._save_stats()
+                    stats_db.add_infinite_action('entry', self.total_infinite_stats)
 
                     try:
                         # Получаем текущее значение
@@ -355,6 +370,7 @@ class InfiniteMode:
                     
                     # 🔥 СОХРАНЯЕМ СТАТИСТИКУ
                     self._save_stats()
+                    stats_db.add_infinite_action('exit', self.total_infinite_stats)
 
                     print(f"📊 УСПЕШНЫЙ ВЫХОД! Всего выходов: {self.total_infinite_stats['total_exits']}")
                     print(f"🎉 ЦИКЛОВ БЕСКОНЕЧКИ: {self.total_infinite_stats['total_cycles']}")
@@ -369,10 +385,9 @@ class InfiniteMode:
                             'infinite_last_exit': time.strftime("%H:%M:%S")
                         })
                         
-                        # 🔥 ОБНОВЛЯЕМ ОБЩУЮ СТАТИСТИКУ
-                        from statistics import stats
-                        # Обновляем счетчик циклов в текущей сессии
-                        stats.current_session_data['infinite_cycles'] = self.total_infinite_stats['total_cycles']
+                        # 🔥 ОБНОВЛЯЕМ ОБЩУЮ СТАТИСТИКУ: выход после входа - завершенный цикл в текущей сессии
+                        if self.total_infinite_stats['total_entries'] >= self.total_infinite_stats['total_exits']:
+                            stats.record_infinite_cycle()
                         
                     except Exception as stats_error:
                         print(f"⚠️ Не удалось обновить статистику: {stats_error}")
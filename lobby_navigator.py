@@ -1,12 +1,16 @@
 # lobby_navigator.py
 import time
 import pyautogui
-import pytesseract
 import sys
 from PIL import Image, ImageEnhance, ImageOps, ImageFilter
-from config import (ACCEPT_SINGLE_ATTEMPT_TIMEOUT, ENABLE_DEBUG_SCREENSHOTS, INVITE_MODE_ACCEPT_TIMEOUT, INVITE_MODE_SECOND_ACCEPT_TIMEOUT, OK_SINGLE_ATTEMPT_TIMEOUT, OK_TIMEOUT, PASS_LOBBY, ACCEPT_TIMEOUT, REFRESH_TIMEOUT, REFRESH_INTERVAL, 
-                   SEARCH_INTERVAL, CLICK_INTERVAL)
+from config import (ACCEPT_SINGLE_ATTEMPT_TIMEOUT, ENABLE_DEBUG_SCREENSHOTS, INVITE_MODE_ACCEPT_TIMEOUT, INVITE_MODE_SECOND_ACCEPT_TIMEOUT, OK_SINGLE_ATTEMPT_TIMEOUT, OK_TIMEOUT, PASS_LOBBY, ACCEPT_TIMEOUT, REFRESH_TIMEOUT, POSITION_ROI_MARGIN)
 from pause_handler import pause_handler
+from frame_capture import frame_capture
+from ocr_engine import ocr_engine
+from template_matcher import template_matcher, FOUND, ABSENT
+from position_cache import position_cache
+from config_service import config_service
+from logger import debug
 
 # 🔥 ПРАВИЛЬНЫЙ ИМПОРТ
 from AFK_lobby import AFKLobbyMonitor  # Убедитесь что имя класса совпадает
@@ -18,17 +22,20 @@ except ImportError:
     print("⚠️ pyperclip не установлен, русские символы могут не вводиться правильно")
 
 class LobbyNavigator:
+    # Настройки, меняющиеся на лету без перезапуска: ключ config.py -> атрибут
+    LIVE_CONFIG = {
+        'REFRESH_INTERVAL': 'refresh_interval',
+        'SEARCH_INTERVAL': 'search_interval',
+        'CLICK_INTERVAL': 'click_interval'
+    }
+
     def __init__(self, text_detector, logger, pet_manager=None):
         self.detector = text_detector
         self.logger = logger
         
         self.afk_monitor = AFKLobbyMonitor(logger)  # Теперь должно работать
-        self.refresh_position = None
-        self.refresh_confidence = 0
-        self.dotaland_position = None
-        self.dotaland_confidence = 0
-        self.dotaland_miss_count = 0
         self.dotaland_check_counter = 0
+        config_service.bind(self, self.LIVE_CONFIG, "Навигатор лобби")
 
     def safe_password_input(self, password):
         """
@@ -54,7 +61,7 @@ class LobbyNavigator:
             
             if success:
                 print("✅ Пароль введен СУПЕРУМНО с авто-переключением раскладки!")
-                time.sleep(CLICK_INTERVAL)
+                time.sleep(self.click_interval)
                 return True
             else:
                 # Запасной вариант: простой ввод
@@ -71,7 +78,7 @@ class LobbyNavigator:
             import pyautogui
             print(f"⌨️ Простой ввод пароля...")
             pyautogui.write(password, interval=0.15)
-            time.sleep(CLICK_INTERVAL)
+            time.sleep(self.click_interval)
             return True
         except Exception as e:
             print(f"❌ Ошибка простого ввода: {e}")
@@ -88,61 +95,24 @@ class LobbyNavigator:
         
         while time.time() - start_time < timeout:
             attempt += 1
-            print(f"  🔍 Попытка {attempt} распознавания ACCEPT...")
+            debug("  🔍 Попытка %s распознавания ACCEPT...", attempt)
             
             try:
-                screenshot = pyautogui.screenshot()
-                
-                # Обработка для ACCEPT (белый текст на зеленом фоне)
-                if screenshot.mode != 'L':
-                    processed = screenshot.convert('L')
-                else:
-                    processed = screenshot.copy()
-                
-                # Усиление контраста для белого текста
-                binary_high = processed.point(lambda x: 255 if x > 200 else 0)
-                
-                custom_config = r'--oem 3 --psm 6'
-                data = pytesseract.image_to_data(
-                    binary_high, 
-                    output_type=pytesseract.Output.DICT,
-                    config=custom_config,
-                    lang='eng'
-                )
-                
-                valid_accepts = []
-                
-                for i in range(len(data['text'])):
-                    text = data['text'][i].strip().upper()
-                    confidence = int(data['conf'][i])
-                    
-                    if text == "ACCEPT" and confidence > 50:
-                        x = data['left'][i]
-                        y = data['top'][i]
-                        w = data['width'][i]
-                        h = data['height'][i]
-                        
-                        center_x_btn = x + w // 2
-                        center_y_btn = y + h // 2
-                        
-                        valid_accepts.append({
-                            'text': text,
-                            'position': (center_x_btn, center_y_btn),
-                            'confidence': confidence,
-                            'bbox': (x, y, w, h)
-                        })
+                # 🔥 Шаблон, затем область прошлой позиции, затем весь экран
+                best_accept = self.detector.detect_accept_button()
                 
-                if valid_accepts:
-                    best_accept = max(valid_accepts, key=lambda x: x['confidence'])
+                if best_accept:
                     print(f"    ✅ ACCEPT найден за {time.time() - start_time:.1f} сек! Уверенность: {best_accept['confidence']}%")
                     return best_accept
                 
                 # Если не нашли в этой попытке, ждем немного перед повторным скриншотом
-                time.sleep(0.5)
+                if not pause_handler.interruptible_sleep(0.5):
+                    return None
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске ACCEPT: {e}")
-                time.sleep(1)
+                if not pause_handler.interruptible_sleep(1):
+                    return None
         
         print(f"❌ ACCEPT не найден за {timeout} сек (одна попытка)")
         return None
@@ -152,9 +122,9 @@ class LobbyNavigator:
         Временный метод для отладки - покажет где используется self.screenshot
         """
         print("❌ ОШИБКА: Обнаружен вызов self.screenshot()!")
-        print("📍 Это должно быть pyautogui.screenshot()")
+        print("📍 Это должно быть frame_capture.screenshot()")
         print(f"📋 Аргументы: {args}, {kwargs}")
-        raise AttributeError("Используйте pyautogui.screenshot() вместо self.screenshot()")
+        raise AttributeError("Используйте frame_capture.screenshot() вместо self.screenshot()")
 
     def find_disconnect_button_fast(self):
         """
@@ -164,7 +134,7 @@ class LobbyNavigator:
         
         try:
             # Область поиска
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = frame_capture.screen_size()
             search_region = (
                 int(screen_width * 0.6),
                 int(screen_height * 0.7),
@@ -173,7 +143,16 @@ class LobbyNavigator:
             )
             print(f"📍 Область поиска: {search_region}")
             
-            screenshot = pyautogui.screenshot(region=search_region)
+            screenshot = frame_capture.screenshot(region=search_region)
+            
+            # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+            status, match = template_matcher.match('DISCONNECT', screenshot, offset=search_region[:2])
+            if status == FOUND:
+                match['button_type'] = "DISCONNECT"
+                return match
+            if status == ABSENT:
+                print("❌ DISCONNECT/LEAVE не найдены")
+                return None
             
             # 🔥 ИСПОЛЬЗУЕМ ТОЛЬКО РАБОЧИЙ МЕТОД
             if screenshot.mode != 'RGB':
@@ -190,9 +169,8 @@ class LobbyNavigator:
             
             print("  🧪 Метод: white_mask (оптимизированный)")
             
-            data = pytesseract.image_to_data(
+            data = ocr_engine.image_to_data(
                 processed_image, 
-                output_type=pytesseract.Output.DICT,
                 config=custom_config,
                 lang='eng'
             )
@@ -221,6 +199,10 @@ class LobbyNavigator:
                     print(f"    📍 Позиция: ({center_x}, {center_y})")
                     print(f"    📏 Размер: {w}x{h}")
                     
+                    if button_type == "DISCONNECT":
+                        template_matcher.learn('DISCONNECT', screenshot, (x, y, w, h),
+                                               offset=search_region[:2], confidence=confidence)
+                    
                     return {
                         'text': text,
                         'position': (center_x, center_y),
@@ -253,7 +235,7 @@ class LobbyNavigator:
                 time.sleep(0.05)
                 pyautogui.click()
                 print("✅ DISCONNECT нажат!")
-                time.sleep(1)  # Ждем реакции
+                pause_handler.interruptible_sleep(1)  # Ждем реакции
                 return True
             except Exception as e:
                 print(f"❌ Ошибка клика по DISCONNECT: {e}")
@@ -276,11 +258,19 @@ class LobbyNavigator:
                 return None
                 
             attempt += 1
-            print(f"🔍 Попытка {attempt} поиска OK...")
+            debug("🔍 Попытка %s поиска OK...", attempt)
             
             try:
-                # 🔥 УБЕДИТЕСЬ ЧТО ИСПОЛЬЗУЕТСЯ pyautogui.screenshot(), а не self.screenshot
-                screenshot = pyautogui.screenshot()  # Правильно!
+                # 🔥 УБЕДИТЕСЬ ЧТО ИСПОЛЬЗУЕТСЯ frame_capture.screenshot(), а не self.screenshot
+                screenshot = frame_capture.screenshot()  # Правильно!
+                
+                # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+                status, match = template_matcher.match('OK', screenshot)
+                if status == FOUND:
+                    return match
+                if status == ABSENT:
+                    pause_handler.interruptible_sleep(self.search_interval)
+                    continue
                 
                 # Обработка для OK (белый текст на зеленом фоне)
                 if screenshot.mode != 'L':
@@ -292,9 +282,8 @@ class LobbyNavigator:
                 binary_high = processed.point(lambda x: 255 if x > 200 else 0)
                 
                 custom_config = r'--oem 3 --psm 6'
-                data = pytesseract.image_to_data(
+                data = ocr_engine.image_to_data(
                     binary_high, 
-                    output_type=pytesseract.Output.DICT,
                     config=custom_config,
                     lang='eng'
                 )
@@ -313,6 +302,7 @@ class LobbyNavigator:
                         center_y = y + h // 2
                         
                         print(f"✅ OK найден во время поиска ACCEPT! Уверенность: {confidence}%")
+                        template_matcher.learn('OK', screenshot, (x, y, w, h), confidence=confidence)
                         
                         return {
                             'text': text,
@@ -324,7 +314,7 @@ class LobbyNavigator:
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске OK: {e}")
             
-            time.sleep(1)
+            pause_handler.interruptible_sleep(1)
         
         return None
 
@@ -375,7 +365,7 @@ class LobbyNavigator:
             
             if self.detector.reliable_click(x, y):
                 print("✅ OK нажат! Обновляем список...")
-                time.sleep(CLICK_INTERVAL)
+                time.sleep(self.click_interval)
                 
                 # Нажимаем REFRESH
                 print("🔄 Нажимаем REFRESH после OK...")
@@ -383,7 +373,7 @@ class LobbyNavigator:
                 
                 if refresh_success:
                     print("✅ REFRESH нажат! Проверяем DOTALAND...")
-                    time.sleep(2)
+                    pause_handler.interruptible_sleep(2)
                     
                     # Проверяем наличие DOTALAND
                     dotaland_result = self.find_dotaland_single_attempt()
@@ -409,7 +399,7 @@ class LobbyNavigator:
         """
         print(f"🎯 БЫСТРЫЙ ПОИСК КНОПКИ ACCEPT ({timeout} СЕКУНД)")
         
-        start_time = time.time()
+        start_time = pause_handler.start_timer()
         attempt = 0
         
         while True:
@@ -428,8 +418,8 @@ class LobbyNavigator:
                     return "RESTART"  # Прервано пользователем
                     
             attempt += 1
-            print(f"\n🔍 ПОПЫТКА {attempt} ПОИСКА ACCEPT")
-            print(f"⏱ Прошло времени: {elapsed:.1f}с, Осталось: {timeout - elapsed:.1f}с")
+            debug("\n🔍 ПОПЫТКА %s ПОИСКА ACCEPT", attempt)
+            debug("⏱ Прошло времени: %.1fс, Осталось: %.1fс", elapsed, timeout - elapsed)
             
             # 🔥 ИЗМЕНЕНИЕ 1: Проверяем наличие OK (ложного OK после DOTALAND)
             ok_result = self.find_ok_during_accept_search(timeout=2)
@@ -442,7 +432,7 @@ class LobbyNavigator:
                 # 🔥 ИЗМЕНЕНИЕ 2: Просто нажимаем OK и продолжаем цикл
                 if self.detector.reliable_click(x, y):
                     print("✅ OK нажат! Продолжаем поиск ACCEPT...")
-                    time.sleep(CLICK_INTERVAL)
+                    time.sleep(self.click_interval)
                     continue  # 🔥 ВАЖНО: продолжаем поиск ACCEPT, а не возвращаем RESTART
                 else:
                     print("⚠️ Не удалось нажать OK, продолжаем поиск ACCEPT...")
@@ -459,12 +449,12 @@ class LobbyNavigator:
                 
                 if self.detector.reliable_click(x, y):
                     print("✅ Успешный клик по ACCEPT!")
-                    time.sleep(CLICK_INTERVAL)
+                    time.sleep(self.click_interval)
                     return True
                 else:
                     print("❌ Не удалось кликнуть по ACCEPT")
             
-            time.sleep(SEARCH_INTERVAL)
+            pause_handler.interruptible_sleep(self.search_interval)
 
     def navigate_to_lobby(self):
         """
@@ -489,15 +479,15 @@ class LobbyNavigator:
             # Определяем область поиска
             region = None
             if search_region == "top_half":
-                screen_width, screen_height = pyautogui.size()
+                screen_width, screen_height = frame_capture.screen_size()
                 region = (0, 0, screen_width, screen_height // 3)  # Верхняя половина экрана
                 print(f"📍 Поиск только в верхней половине экрана: {region}")
             
-            result = self.detector.find_text_on_screen(texts, timeout=30, interval=SEARCH_INTERVAL, region=region)
+            result = self.detector.find_text_on_screen(texts, timeout=30, interval=self.search_interval, region=region)
             if result:
                 x, y = result['position']
                 self.detector.reliable_click(x, y)
-                time.sleep(CLICK_INTERVAL)
+                time.sleep(self.click_interval)
             else:
                 print(f"❌ Не удалось найти {step_name}")
                 return False
@@ -527,7 +517,7 @@ class LobbyNavigator:
     
         if find_success:
             print("🎉 FIND найден и кликнут! Продолжаем...")
-            time.sleep(CLICK_INTERVAL)
+            time.sleep(self.click_interval)
             
 
             # 🔥 КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ: Читаем пароль из config.py ТАК ЖЕ, как в telegram_bot.py
@@ -538,7 +528,7 @@ class LobbyNavigator:
                 self.safe_password_input(current_password)
             else:
                 print("⚠️ Пароль пустой, пропускаем ввод")
-            time.sleep(CLICK_INTERVAL)
+            time.sleep(self.click_interval)
             
             ok_success = self.detector.find_and_click_ok_button(timeout=90)
             
@@ -547,7 +537,7 @@ class LobbyNavigator:
                 
                 # Сразу ищем DOTALAND после входа
                 print("🔍 Сразу ищем DOTALAND...")
-                time.sleep(2)
+                pause_handler.interruptible_sleep(2)
                 
                 dotaland_result = self.find_dotaland_single_attempt()
                 if dotaland_result:
@@ -568,34 +558,8 @@ class LobbyNavigator:
             return False
 
     def _read_password_from_config(self):
-        """Читает пароль напрямую из config.py (тот же код, что и в telegram_bot.py)"""
-        try:
-            with open("config.py", "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith("PASS_LOBBY ="):
-                    # Извлекаем значение
-                    parts = line.split('=', 1)
-                    if len(parts) > 1:
-                        value = parts[1].strip()
-                        
-                        # Убираем кавычки
-                        if value.startswith('"') and value.endswith('"'):
-                            return value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            return value[1:-1]
-                        else:
-                            # Убираем комментарии
-                            if '#' in value:
-                                value = value.split('#')[0].strip()
-                            return value
-        except Exception as e:
-            print(f"⚠️ Ошибка чтения пароля из config.py: {e}")
-        
-        return "1"  # значение по умолчанию
+        """Актуальный пароль из config.py (тот же источник, что и в telegram_bot.py)"""
+        return str(config_service.get('PASS_LOBBY', "1"))
 
     def ultra_fast_click_dotaland(self, x, y):
         """
@@ -628,17 +592,25 @@ class LobbyNavigator:
                 return None
                 
             attempt += 1
-            print(f"🔍 Попытка {attempt} поиска REFRESH...")
+            debug("🔍 Попытка %s поиска REFRESH...", attempt)
             
             try:
                 # Делаем скриншот
                 if region:
-                    screenshot = pyautogui.screenshot(region=region)
+                    screenshot = frame_capture.screenshot(region=region)
                 else:
-                    screenshot = pyautogui.screenshot()
+                    screenshot = frame_capture.screenshot()
+                
+                # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+                status, match = template_matcher.match('REFRESH', screenshot, offset=region[:2] if region else (0, 0))
+                if status == FOUND:
+                    return match
+                if status == ABSENT:
+                    pause_handler.interruptible_sleep(self.search_interval)
+                    continue
                 
                 # Пробуем разные области для обхода проблемы с указателем
-                screen_width, screen_height = pyautogui.size()
+                screen_width, screen_height = frame_capture.screen_size()
                 search_regions = [
                     ("Полный экран", None),
                     ("Правая часть", (screen_width//2, 0, screen_width//2, screen_height)),
@@ -651,7 +623,7 @@ class LobbyNavigator:
                     print(f"  📍 Область: {reg_name}")
                     
                     if search_region:
-                        region_screenshot = pyautogui.screenshot(region=search_region)
+                        region_screenshot = frame_capture.screenshot(region=search_region)
                     else:
                         region_screenshot = screenshot
                     
@@ -666,9 +638,8 @@ class LobbyNavigator:
                     processed = enhancer.enhance(2.0)
                     
                     custom_config = r'--oem 3 --psm 6'
-                    data = pytesseract.image_to_data(
+                    data = ocr_engine.image_to_data(
                         processed, 
-                        output_type=pytesseract.Output.DICT,
                         config=custom_config,
                         lang='eng'
                     )
@@ -693,6 +664,9 @@ class LobbyNavigator:
                             center_y = y + h // 2
                             
                             print(f"    ✅ REFRESH найден в области {reg_name}! Уверенность: {confidence}%")
+                            template_matcher.learn('REFRESH', region_screenshot, (x, y, w, h),
+                                                   offset=search_region[:2] if search_region else (0, 0),
+                                                   confidence=confidence)
                             
                             return {
                                 'text': text,
@@ -702,50 +676,99 @@ class LobbyNavigator:
                                 'bbox': (x, y, w, h)
                             }
                 
-                print(f"❌ REFRESH не найден в попытке {attempt}")
+                debug("❌ REFRESH не найден в попытке %s", attempt)
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске REFRESH: {e}")
             
-            time.sleep(SEARCH_INTERVAL)
+            pause_handler.interruptible_sleep(self.search_interval)
         
         print(f"❌ Кнопка REFRESH не найдена за {timeout} секунд")
         return None
 
+    def confirm_cached_refresh(self, cached_refresh):
+        """
+        Проверяет, что REFRESH действительно на запомненном месте: шаблон,
+        при сомнениях - OCR небольшой области вокруг запомненной рамки.
+        Возвращает позицию для клика или None
+        """
+        bbox = cached_refresh['bbox']
+        if not bbox:
+            return None
+        
+        x, y, w, h = bbox
+        screen_width, screen_height = frame_capture.screen_size()
+        left = max(0, x - POSITION_ROI_MARGIN)
+        top = max(0, y - POSITION_ROI_MARGIN)
+        right = min(screen_width, x + w + POSITION_ROI_MARGIN)
+        bottom = min(screen_height, y + h + POSITION_ROI_MARGIN)
+        if right <= left or bottom <= top:
+            return None
+        
+        region = (left, top, right - left, bottom - top)
+        screenshot = frame_capture.screenshot(region=region)
+        
+        status, match = template_matcher.match('REFRESH', screenshot, offset=region[:2])
+        if status == FOUND:
+            return match['position']
+        if status == ABSENT:
+            return None
+        
+        data = ocr_engine.image_to_data(
+            ImageEnhance.Contrast(screenshot.convert('L')).enhance(2.0),
+            config=r'--oem 3 --psm 6',
+            lang='eng'
+        )
+        for i in range(len(data['text'])):
+            if data['text'][i].strip().upper() == "REFRESH" and int(data['conf'][i]) > 40:
+                return (left + data['left'][i] + data['width'][i] // 2,
+                        top + data['top'][i] + data['height'][i] // 2)
+        return None
+
     def guaranteed_click_refresh(self):
         """
-        Гарантированный клик по REFRESH - использует запомненную позицию или ищет заново
+        Гарантированный клик по REFRESH - использует запомненную позицию
+        (после проверки, что кнопка на месте) или ищет заново
         """
-        if self.refresh_position and self.refresh_confidence > 60:
-            # Используем запомненную позицию с высокой уверенностью
-            x, y = self.refresh_position
-            print(f"🎯 Используем запомненную позицию REFRESH: ({x}, {y})")
-            print(f"📊 Уверенность в позиции: {self.refresh_confidence}%")
+        cached_refresh = position_cache.get('REFRESH')
+        if cached_refresh:
+            print(f"🎯 Проверяем запомненную позицию REFRESH: {cached_refresh['position']}")
+            print(f"📊 Уверенность в позиции: {cached_refresh['confidence']:.0f}%")
             
-            # Всегда перемещаем мышь на позицию REFRESH перед кликом
             try:
-                pyautogui.moveTo(x, y, duration=0.1)
-                time.sleep(0.05)
-                pyautogui.click()
-                print("✅ Успешный клик по запомненному REFRESH!")
-                return True
+                position = self.confirm_cached_refresh(cached_refresh)
             except Exception as e:
-                print(f"❌ Ошибка клика по запомненному REFRESH: {e}")
-                # Если клик не удался, сбрасываем позицию и ищем заново
-                self.refresh_position = None
-                self.refresh_confidence = 0
+                print(f"⚠️ Ошибка проверки запомненного REFRESH: {e}")
+                position = None
+            
+            if position is None:
+                # Кнопки нет на прежнем месте (сдвинулось окно/интерфейс)
+                print("❌ REFRESH не найден на запомненной позиции")
+                position_cache.miss('REFRESH')
+            else:
+                x, y = position
+                try:
+                    pyautogui.moveTo(x, y, duration=0.1)
+                    time.sleep(0.05)
+                    pyautogui.click()
+                    print("✅ Успешный клик по запомненному REFRESH!")
+                    position_cache.hit('REFRESH')
+                    return True
+                except Exception as e:
+                    print(f"❌ Ошибка клика по запомненному REFRESH: {e}")
+                    position_cache.miss('REFRESH')
         
         # Если позиция не запомнена или клик не удался, ищем REFRESH заново
         print("🔍 Поиск REFRESH заново...")
         refresh_result = self.find_refresh_button_enhanced(timeout=5)
         
         if refresh_result:
-            self.refresh_position = refresh_result['position']
-            self.refresh_confidence = refresh_result['confidence']
-            x, y = self.refresh_position
+            position_cache.remember('REFRESH', refresh_result['position'],
+                                    refresh_result['confidence'], refresh_result['bbox'])
+            x, y = refresh_result['position']
             
             print(f"✅ REFRESH найден! Позиция: ({x}, {y})")
-            print(f"📊 Уверенность: {self.refresh_confidence}%")
+            print(f"📊 Уверенность: {refresh_result['confidence']}%")
             
             # Перемещаем мышь на позицию REFRESH и кликаем
             try:
@@ -769,11 +792,12 @@ class LobbyNavigator:
         self.dotaland_check_counter += 1
         need_full_search = (self.dotaland_check_counter % 5 == 0)
         
-        if self.dotaland_position and self.dotaland_confidence > 60 and not need_full_search:
+        cached_dotaland = position_cache.get('DOTALAND')
+        if cached_dotaland and not need_full_search:
             # Используем запомненную позицию - СВЕРХБЫСТРЫЙ КЛИК
-            x, y = self.dotaland_position
+            x, y = cached_dotaland['position']
             print(f"🎯 Используем запомненную позицию DOTALAND: ({x}, {y})")
-            print(f"📊 Уверенность: {self.dotaland_confidence}%")
+            print(f"📊 Уверенность: {cached_dotaland['confidence']:.0f}%")
             
             # 🔥 СВЕРХБЫСТРЫЙ клик по запомненной позиции
             try:
@@ -781,23 +805,18 @@ class LobbyNavigator:
                     print("✅ Сверхбыстрый клик по запомненному DOTALAND!")
                     
                     # Быстрая проверка результата клика
-                    time.sleep(0.5)
+                    pause_handler.interruptible_sleep(0.5)
                     ok_found = self.find_ok_button_after_dotaland(timeout=2)  # Очень быстрая проверка OK
                     if ok_found:
+                        position_cache.hit('DOTALAND')
                         return "OK_FOUND"
                     return "CLICKED"
                 else:
-                    self.dotaland_miss_count += 1
+                    position_cache.miss('DOTALAND')
             except Exception as e:
                 print(f"❌ Ошибка клика по запомненному DOTALAND: {e}")
-                self.dotaland_miss_count += 1
-            
-            # Если много промахов, сбрасываем позицию
-            if self.dotaland_miss_count >= 3:
-                print("🔄 Слишком много промахов, сбрасываем позицию DOTALAND")
-                self.dotaland_position = None
-                self.dotaland_confidence = 0
-                self.dotaland_miss_count = 0
+                # Если много промахов, позиция сбрасывается
+                position_cache.miss('DOTALAND')
         
         # Если позиция не запомнена или нужен полный поиск, ищем DOTALAND заново
         print("🔍 Полный поиск DOTALAND...")
@@ -805,19 +824,18 @@ class LobbyNavigator:
         
         if dotaland_result:
             # Запоминаем новую позицию
-            self.dotaland_position = dotaland_result['position']
-            self.dotaland_confidence = dotaland_result['confidence']
-            self.dotaland_miss_count = 0
+            position_cache.remember('DOTALAND', dotaland_result['position'],
+                                    dotaland_result['confidence'], dotaland_result['bbox'])
             
-            x, y = self.dotaland_position
+            x, y = dotaland_result['position']
             print(f"✅ DOTALAND найден! Новая позиция: ({x}, {y})")
-            print(f"📊 Уверенность: {self.dotaland_confidence}%")
+            print(f"📊 Уверенность: {dotaland_result['confidence']}%")
             
             # СВЕРХБЫСТРЫЙ клик
             try:
                 if self.ultra_fast_click_dotaland(x, y):
                     print("🎉 DOTALAND кликнут дважды!")
-                    time.sleep(0.5)
+                    pause_handler.interruptible_sleep(0.5)
                     
                     # Проверяем результат
                     ok_found = self.find_ok_button_after_dotaland(timeout=2)
@@ -839,7 +857,7 @@ class LobbyNavigator:
         """
         print("🎯 УСКОРЕННЫЙ ЦИКЛ: УМНЫЙ DOTALAND + REFRESH")
         
-        start_time = time.time()  # 🔥 ЗАПОМИНАЕМ ВРЕМЯ НАЧАЛА
+        start_time = pause_handler.start_timer()  # 🔥 ЗАПОМИНАЕМ ВРЕМЯ НАЧАЛА
         attempt = 0
         
         while True:
@@ -870,7 +888,7 @@ class LobbyNavigator:
                 if dotaland_result == "OK_FOUND":
                     print("🔍 OK уже найден при клике DOTALAND, продолжаем...")
                 
-                time.sleep(CLICK_INTERVAL)
+                time.sleep(self.click_interval)
                 
                 # ШАГ 2: Ищем OK после DOTALAND (если еще не нашли)
                 if dotaland_result != "OK_FOUND":
@@ -882,7 +900,7 @@ class LobbyNavigator:
                     else:
                         print("ℹ️ OK не найден, продолжаем поиск ACCEPT...")
                 
-                time.sleep(CLICK_INTERVAL)
+                time.sleep(self.click_interval)
                 
                 # ШАГ 3: Ищем ACCEPT с обработкой OK
                 print("🔍 Ищем ACCEPT...")
@@ -909,8 +927,8 @@ class LobbyNavigator:
             if not refresh_success:
                 print("❌ Не удалось кликнуть REFRESH, продолжаем цикл...")
             
-            print(f"⏳ Ждем {REFRESH_INTERVAL} секунды до следующего цикла...")
-            time.sleep(REFRESH_INTERVAL)
+            print(f"⏳ Ждем {self.refresh_interval} секунды до следующего цикла...")
+            pause_handler.interruptible_sleep(self.refresh_interval)
 
     def find_ok_button_after_dotaland(self, timeout=OK_TIMEOUT):
         """
@@ -926,56 +944,70 @@ class LobbyNavigator:
                 return None
                 
             attempt += 1
-            print(f"🔍 Попытка {attempt} поиска OK...")
+            debug("🔍 Попытка %s поиска OK...", attempt)
             
             try:
-                screenshot = pyautogui.screenshot()
-                
-                # Обработка для OK (белый текст на зеленом фоне)
-                if screenshot.mode != 'L':
-                    processed = screenshot.convert('L')
-                else:
-                    processed = screenshot.copy()
+                screenshot = frame_capture.screenshot()
                 
-                # Усиление контраста для белого текста
-                binary_high = processed.point(lambda x: 255 if x > 200 else 0)
-                
-                custom_config = r'--oem 3 --psm 6'
-                data = pytesseract.image_to_data(
-                    binary_high, 
-                    output_type=pytesseract.Output.DICT,
-                    config=custom_config,
-                    lang='eng'
-                )
+                # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+                status, match = template_matcher.match('OK', screenshot)
+                if status == FOUND:
+                    return match
+                if status == ABSENT:
+                    debug("❌ OK не найден в попытке %s", attempt)
+                    pause_handler.interruptible_sleep(self.search_interval)
+                    continue
                 
-                for i in range(len(data['text'])):
-                    text = data['text'][i].strip().upper()
-                    confidence = int(data['conf'][i])
+                # 🔥 Сначала область вокруг запомненной позиции OK, потом весь экран
+                for region_name, region in self.detector.get_search_regions('OK', screenshot):
+                    image, offset = self.detector.crop_search_region(screenshot, region)
                     
-                    if text == "OK" and confidence > 40:
-                        x = data['left'][i]
-                        y = data['top'][i]
-                        w = data['width'][i]
-                        h = data['height'][i]
-                        
-                        center_x = x + w // 2
-                        center_y = y + h // 2
-                        
-                        print(f"✅ OK найден! Уверенность: {confidence}%")
+                    # Обработка для OK (белый текст на зеленом фоне)
+                    if image.mode != 'L':
+                        processed = image.convert('L')
+                    else:
+                        processed = image.copy()
+                    
+                    # Усиление контраста для белого текста
+                    binary_high = processed.point(lambda x: 255 if x > 200 else 0)
+                    
+                    custom_config = r'--oem 3 --psm 6'
+                    data = ocr_engine.image_to_data(
+                        binary_high, 
+                        config=custom_config,
+                        lang='eng'
+                    )
+                    
+                    for i in range(len(data['text'])):
+                        text = data['text'][i].strip().upper()
+                        confidence = int(data['conf'][i])
                         
-                        return {
-                            'text': text,
-                            'position': (center_x, center_y),
-                            'confidence': confidence,
-                            'bbox': (x, y, w, h)
-                        }
+                        if text == "OK" and confidence > 40:
+                            x = data['left'][i] + offset[0]
+                            y = data['top'][i] + offset[1]
+                            w = data['width'][i]
+                            h = data['height'][i]
+                            
+                            center_x = x + w // 2
+                            center_y = y + h // 2
+                            
+                            print(f"✅ OK найден ({region_name})! Уверенность: {confidence}%")
+                            template_matcher.learn('OK', screenshot, (x, y, w, h), confidence=confidence)
+                            position_cache.remember('OK', (center_x, center_y), confidence, (x, y, w, h))
+                            
+                            return {
+                                'text': text,
+                                'position': (center_x, center_y),
+                                'confidence': confidence,
+                                'bbox': (x, y, w, h)
+                            }
                 
-                print(f"❌ OK не найден в попытке {attempt}")
+                debug("❌ OK не найден в попытке %s", attempt)
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске OK: {e}")
             
-            time.sleep(1)
+            pause_handler.interruptible_sleep(1)
         
         print("❌ Кнопка OK не найдена")
         return None
@@ -992,7 +1024,7 @@ class LobbyNavigator:
             
             if self.detector.reliable_click(x, y):
                 print("✅ Успешный клик по OK!")
-                time.sleep(CLICK_INTERVAL)
+                time.sleep(self.click_interval)
                 return True
             else:
                 print("❌ Не удалось кликнуть по OK")
@@ -1016,7 +1048,6 @@ class LobbyNavigator:
         
         # Сбрасываем счетчики при новом запуске
         self.dotaland_check_counter = 0
-        self.dotaland_miss_count = 0
         
         cycle_success, restart_reason = self.guaranteed_refresh_dotaland_cycle(timeout=REFRESH_TIMEOUT)
         
@@ -1024,8 +1055,7 @@ class LobbyNavigator:
             print("🎉 ACCEPT успешно нажат! Передаем управление в AFK лобби...")
             
             # Сбрасываем позицию DOTALAND при успешном входе
-            self.dotaland_position = None
-            self.dotaland_confidence = 0
+            position_cache.forget('DOTALAND')
             
             monitor_result, monitor_reason = self.afk_monitor.monitor_after_accept(restart_count)
             
@@ -1052,12 +1082,19 @@ class LobbyNavigator:
         Одиночная попытка найти DOTALAND
         """
         try:
-            screenshot = pyautogui.screenshot()
+            screenshot = frame_capture.screenshot()
+            
+            # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+            status, match = template_matcher.match('DOTALAND', screenshot)
+            if status == FOUND:
+                return match
+            if status == ABSENT:
+                print("❌ DOTALAND не найден в этой попытке")
+                return None
             
             custom_config = r'--oem 3 --psm 6'
-            data = pytesseract.image_to_data(
+            data = ocr_engine.image_to_data(
                 screenshot, 
-                output_type=pytesseract.Output.DICT,
                 config=custom_config,
                 lang='eng'
             )
@@ -1076,6 +1113,7 @@ class LobbyNavigator:
                     center_y = y + h // 2
                     
                     print(f"✅ DOTALAND найден! Уверенность: {confidence}%")
+                    template_matcher.learn('DOTALAND', screenshot, (x, y, w, h), confidence=confidence)
                     
                     return {
                         'text': text,
@@ -1107,51 +1145,10 @@ class InviteModeNavigator:
         ТОЧНЫЙ поиск кнопки ACCEPT без проверки размера
         """
         try:
-            screenshot = pyautogui.screenshot()
-            
-            # Обработка для ACCEPT (белый текст на зеленом фоне)
-            if screenshot.mode != 'L':
-                processed = screenshot.convert('L')
-            else:
-                processed = screenshot.copy()
-            
-            # Усиление контраста для белого текста
-            binary_high = processed.point(lambda x: 255 if x > 200 else 0)
-            
-            custom_config = r'--oem 3 --psm 6'
-            data = pytesseract.image_to_data(
-                binary_high, 
-                output_type=pytesseract.Output.DICT,
-                config=custom_config,
-                lang='eng'
-            )
-            
-            valid_accepts = []
-            
-            for i in range(len(data['text'])):
-                text = data['text'][i].strip().upper()
-                confidence = int(data['conf'][i])
-                
-                if text == "ACCEPT" and confidence > 50:  # 🔥 Повышаем уверенность до 50%
-                    x = data['left'][i]
-                    y = data['top'][i]
-                    w = data['width'][i]
-                    h = data['height'][i]
-                    
-                    # 🔥 УБИРАЕМ ПРОВЕРКУ РАЗМЕРА - принимаем любые размеры
-                    center_x_btn = x + w // 2
-                    center_y_btn = y + h // 2
-                    
-                    valid_accepts.append({
-                        'text': text,
-                        'position': (center_x_btn, center_y_btn),
-                        'confidence': confidence,
-                        'bbox': (x, y, w, h)
-                    })
+            # 🔥 Шаблон, затем область прошлой позиции, затем весь экран
+            best_accept = self.detector.detect_accept_button()
             
-            if valid_accepts:
-                # 🔥 ВЫБИРАЕМ РЕЗУЛЬТАТ С НАИВЫСШЕЙ УВЕРЕННОСТЬЮ
-                best_accept = max(valid_accepts, key=lambda x: x['confidence'])
+            if best_accept:
                 print(f"    ✅ ACCEPT найден! Уверенность: {best_accept['confidence']}%, "
                       f"Размер: {best_accept['bbox'][2]}x{best_accept['bbox'][3]}")
                 
@@ -1183,8 +1180,8 @@ class InviteModeNavigator:
             elapsed = int(time.time() - start_time)
             remaining = timeout - elapsed
             
-            print(f"\n🔍 Попытка {attempt} поиска первого ACCEPT...")
-            print(f"⏱ Прошло: {elapsed}сек, Осталось: {remaining}сек")
+            debug("\n🔍 Попытка %s поиска первого ACCEPT...", attempt)
+            debug("⏱ Прошло: %sсек, Осталось: %sсек", elapsed, remaining)
             
             # Ищем ACCEPT с улучшенным алгоритмом
             accept_result = self.find_accept_button_accurate(timeout=10)
@@ -1203,14 +1200,14 @@ class InviteModeNavigator:
                     self.logger.log_info("Первый ACCEPT найден и нажат", attempt)
                     
                     # 🔥 Ждем немного после клика
-                    time.sleep(2)
+                    pause_handler.interruptible_sleep(2)
                     return True, ""
                 else:
                     print("❌ Не удалось кликнуть по первому ACCEPT")
                     return False, "Ошибка клика по первому ACCEPT"
             
             # Ждем перед следующей попыткой
-            time.sleep(3)
+            pause_handler.interruptible_sleep(3)
         
         print("❌ Первый ACCEPT не найден за отведенное время")
         return False, "Таймаут ожидания первого ACCEPT"
@@ -1233,8 +1230,8 @@ class InviteModeNavigator:
             elapsed = int(time.time() - start_time)
             remaining = timeout - elapsed
             
-            print(f"\n🔍 Попытка {attempt} поиска второго ACCEPT...")
-            print(f"⏱ Прошло: {elapsed}сек, Осталось: {remaining}сек")
+            debug("\n🔍 Попытка %s поиска второго ACCEPT...", attempt)
+            debug("⏱ Прошло: %sсек, Осталось: %sсек", elapsed, remaining)
             
             # Ищем ACCEPT с улучшенным алгоритмом
             accept_result = self.find_accept_button_accurate(timeout=10)
@@ -1253,14 +1250,14 @@ class InviteModeNavigator:
                     self.logger.log_info("Второй ACCEPT найден и нажат", attempt)
                     
                     # 🔥 Ждем немного после клика
-                    time.sleep(2)
+                    pause_handler.interruptible_sleep(2)
                     return True, ""
                 else:
                     print("❌ Не удалось кликнуть по второму ACCEPT")
                     return False, "Ошибка клика по второму ACCEPT"
             
             # Ждем 5 секунд перед следующей попыткой
-            time.sleep(5)
+            pause_handler.interruptible_sleep(5)
         
         print("❌ Второй ACCEPT не найден за отведенное время")
         return False, "Таймаут ожидания второго ACCEPT"
@@ -1281,7 +1278,7 @@ class InviteModeNavigator:
                 h + 40
             )
             
-            screenshot = pyautogui.screenshot(region=expanded_region)
+            screenshot = frame_capture.screenshot(region=expanded_region)
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"debug/accept_{timestamp}_{description}.png"
             
@@ -1302,7 +1299,7 @@ class InviteModeNavigator:
         
         # 🔥 ПРОВЕРКА: убедимся что игра загрузилась
         print("⏳ Ожидаем полной загрузки игры...")
-        time.sleep(10)
+        pause_handler.interruptible_sleep(10)
         
         # ШАГ 1: Ожидание первого ACCEPT (5 минут)
         first_accept, reason = self.wait_for_first_accept(INVITE_MODE_ACCEPT_TIMEOUT)
@@ -1316,7 +1313,7 @@ class InviteModeNavigator:
         
         # 🔥 ДОПОЛНИТЕЛЬНОЕ ОЖИДАНИЕ между ACCEPT'ами
         print("⏳ Ожидаем появление второго ACCEPT...")
-        time.sleep(10)
+        pause_handler.interruptible_sleep(10)
         
         # ШАГ 2: Ожидание второго ACCEPT (4 минуты)
         second_accept, reason = self.wait_for_second_accept(INVITE_MODE_SECOND_ACCEPT_TIMEOUT)
@@ -1330,7 +1327,7 @@ class InviteModeNavigator:
         
         # 🔥 ДОПОЛНИТЕЛЬНОЕ ОЖИДАНИЕ перед AFK мониторингом
         print("⏳ Ожидаем загрузку лобби...")
-        time.sleep(15)
+        pause_handler.interruptible_sleep(15)
         
         # ШАГ 3: Стандартный AFK мониторинг (как в обычном режиме)
         monitor_result, monitor_reason = self.afk_monitor.monitor_after_accept(0)
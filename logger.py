@@ -1,34 +1,215 @@
+import atexit
 import datetime
+import glob
+import gzip
 import os
-from config import LOG_FILE
+import queue
+import shutil
+import threading
+from config import LOG_FILE, LOG_MAX_SIZE_MB, LOG_ROTATE_HOURS, LOG_BACKUP_COUNT, LOG_FLUSH_INTERVAL
+from config_service import config_service
+
+# Уровни логов
+DEBUG = 10    # Подробности горячих циклов (каждая попытка OCR, каждая проверка)
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+HEADER_CREATED = "Создан: "
+
+
+def get_timestamp():
+    """Текущая дата и время в формате строки"""
+    return datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+class LogWriter:
+    """
+    Фоновая запись лога.
+    Вызывающий поток только кладет строку в очередь; отдельный поток раз в
+    LOG_FLUSH_INTERVAL секунд записывает все накопленные строки одной записью.
+    Файл ротируется по размеру (LOG_MAX_SIZE_MB) и возрасту (LOG_ROTATE_HOURS),
+    старые файлы сжимаются в .gz, хранится LOG_BACKUP_COUNT архивов.
+    Уровень LOG_LEVEL меняется на лету через config.py.
+    """
+    # Настройки, меняющиеся на лету без перезапуска: ключ config.py -> атрибут
+    LIVE_CONFIG = {
+        'LOG_LEVEL': 'level_name'
+    }
+
+    def __init__(self, log_file=LOG_FILE):
+        self.log_file = log_file
+        self.level = INFO
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.file = None
+        self.created_at = None  # Время создания текущего файла лога
+        self.stop_event = threading.Event()
+        self.thread = None
+        config_service.bind(self, self.LIVE_CONFIG, "Лог")
+
+    @property
+    def level_name(self):
+        return LEVEL_NAMES[self.level]
+
+    @level_name.setter
+    def level_name(self, name):
+        self.level = LEVELS.get(str(name).upper(), INFO)
+
+    def is_enabled(self, level):
+        return level >= self.level
+
+    def write(self, line):
+        """Ставит строку в очередь записи"""
+        self.queue.put(line)
+        if self.thread is None:
+            self.start()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="log_writer", daemon=True)
+                self.thread.start()
+                atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.stop_event.wait(LOG_FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        """Записывает все строки из очереди"""
+        lines = []
+        while True:
+            try:
+                lines.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
+
+        with self.lock:
+            try:
+                log = self._get_file()
+                if self._needs_rotation(log):
+                    self._rotate()
+                    log = self._get_file()
+                log.write(''.join(lines))
+                log.flush()
+            except Exception as e:
+                print(f"⚠️ Ошибка записи лога {self.log_file}: {e}")
+
+    def _get_file(self):
+        """Открытый файл лога; новый файл начинается с заголовка"""
+        if self.file is not None:
+            return self.file
+
+        os.makedirs(os.path.dirname(self.log_file) or '.', exist_ok=True)
+        self.created_at = self._read_created_at()
+        self.file = open(self.log_file, 'a', encoding='utf-8')
+        if self.created_at is None:
+            self.created_at = datetime.datetime.now()
+            self.file.write("=== ЛОГ АВТОМАТИЗАЦИИ DOTA 2 ===\n")
+            self.file.write(f"{HEADER_CREATED}{self.created_at.strftime(TIMESTAMP_FORMAT)}\n")
+            self.file.write("=" * 50 + "\n\n")
+        return self.file
+
+    def _read_created_at(self):
+        """Время создания существующего файла из заголовка (None - файла нет)"""
+        if not os.path.exists(self.log_file) or os.path.getsize(self.log_file) == 0:
+            return None
+        try:
+            with open(self.log_file, 'r', encoding='utf-8', errors='replace') as f:
+                for _ in range(3):
+                    line = f.readline()
+                    if line.startswith(HEADER_CREATED):
+                        return datetime.datetime.strptime(line[len(HEADER_CREATED):].strip(), TIMESTAMP_FORMAT)
+        except (OSError, ValueError):
+            pass
+        # Заголовка нет (старый формат) - считаем от времени изменения
+        return datetime.datetime.fromtimestamp(os.path.getmtime(self.log_file))
+
+    def _needs_rotation(self, log):
+        if log.tell() >= LOG_MAX_SIZE_MB * 1024 * 1024:
+            return True
+        age = datetime.datetime.now() - self.created_at
+        return age.total_seconds() >= LOG_ROTATE_HOURS * 3600
+
+    def _rotate(self):
+        """Закрывает текущий файл и сжимает его в архив"""
+        self.file.close()
+        self.file = None
+
+        base, ext = os.path.splitext(self.log_file)
+        archive = f"{base}_{self.created_at.strftime('%Y%m%d_%H%M%S')}{ext}.gz"
+        with open(self.log_file, 'rb') as source, gzip.open(archive, 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(self.log_file)
+        print(f"🗜️ Лог заархивирован: {archive}")
+
+        # Имена архивов содержат дату - старейшие первыми
+        archives = sorted(glob.glob(f"{base}_*{ext}.gz"))
+        expired = archives[:-LOG_BACKUP_COUNT] if LOG_BACKUP_COUNT > 0 else archives
+        for old_archive in expired:
+            try:
+                os.remove(old_archive)
+            except OSError as e:
+                print(f"⚠️ Не удалось удалить старый архив лога {old_archive}: {e}")
+
+    def shutdown(self):
+        """Финальная запись при завершении программы"""
+        self.stop_event.set()
+        self.flush()
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+# Глобальный экземпляр
+log_writer = LogWriter()
+
+
+def debug(message, *args):
+    """
+    Диагностика горячих циклов - выводится и пишется в лог только при LOG_LEVEL = "DEBUG".
+    Аргументы подставляются в message (%s) только когда DEBUG включен,
+    поэтому выключенный вызов стоит одну проверку уровня
+    """
+    if log_writer.level > DEBUG:
+        return
+    if args:
+        message = message % args
+    print(message)
+    log_writer.write(f"[{get_timestamp()}] [DEBUG] {message.strip()}\n")
+
 
 class Logger:
     def __init__(self):
         self.log_file = LOG_FILE
-        self.ensure_log_file()
-    
-    def ensure_log_file(self):
-        """Создает файл лога если он не существует"""
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                f.write("=== ЛОГ АВТОМАТИЗАЦИИ DOTA 2 ===\n")
-                f.write(f"Создан: {self.get_timestamp()}\n")
-                f.write("=" * 50 + "\n\n")
     
     def get_timestamp(self):
         """Возвращает текущую дату и время в формате строки"""
-        return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return get_timestamp()
     
-    def log_event(self, event_type, message, attempt_number=None):
-        """Записывает событие в лог"""
+    def log_event(self, event_type, message, attempt_number=None, level=INFO):
+        """Записывает событие в лог (запись на диск - в фоновом потоке)"""
+        if not log_writer.is_enabled(level):
+            return
+
         timestamp = self.get_timestamp()
         attempt_info = f" [Попытка {attempt_number}]" if attempt_number else ""
         log_entry = f"[{timestamp}]{attempt_info} [{event_type}] {message}\n"
         
         print(f"📝 ЛОГ: {log_entry.strip()}")
-        
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        log_writer.write(log_entry)
+    
+    def log_debug(self, message, attempt_number=None):
+        """Логирует подробности (только при LOG_LEVEL = "DEBUG")"""
+        self.log_event("DEBUG", message, attempt_number, level=DEBUG)
     
     def log_dota_start(self, attempt_number):
         """Логирует запуск Dota 2"""
@@ -40,7 +221,7 @@ class Logger:
     
     def log_restart(self, attempt_number, reason):
         """Логирует перезапуск"""
-        self.log_event("RESTART", f"Перезапуск. Причина: {reason}", attempt_number)
+        self.log_event("RESTART", f"Перезапуск. Причина: {reason}", attempt_number, level=WARNING)
     
     def log_success(self, attempt_number, operation):
         """Логирует успешное выполнение операции"""
@@ -49,7 +230,7 @@ class Logger:
     def log_error(self, attempt_number, operation, error_details=""):
         """Логирует ошибку"""
         details = f" - {error_details}" if error_details else ""
-        self.log_event("ERROR", f"Ошибка: {operation}{details}", attempt_number)
+        self.log_event("ERROR", f"Ошибка: {operation}{details}", attempt_number, level=ERROR)
     
     def log_info(self, message, attempt_number=None):
         """Логирует информационное сообщение"""
@@ -61,5 +242,5 @@ class Logger:
         """
         death_name = "9999999 в чате" if death_type == 'gold_text' else "красная рамка"
         message = f"Смерть хоста ({death_name}): {details}"
-        self.log_event("HOST_DEATH", message, attempt_number)
+        self.log_event("HOST_DEATH", message, attempt_number, level=WARNING)
         print(f"🔴 ЛОГ СМЕРТИ: {message}")
\ No newline at end of file
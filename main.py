@@ -15,8 +15,7 @@ from pause_handler import pause_handler
 from AFK_lobby import AFKLobbyMonitor
 from statistics import stats
 from config import WORK_MODE
-import importlib
-from config_loader import get_config
+from config_service import config_service
 
 def close_dota2():
     """
@@ -38,17 +37,6 @@ def close_dota2():
             print("❌ Не удалось закрыть Dota 2 автоматически")
             return False
 
-def get_config(key, default=None):
-    """Динамическое получение значения из config.py"""
-    try:
-        # Перезагружаем модуль config, чтобы получить актуальные значения
-        import config
-        importlib.reload(config)
-        return getattr(config, key, default)
-    except Exception as e:
-        print(f"⚠️ Ошибка при чтении config.{key}: {e}")
-        return default
-
 def handle_critical_error(error, restart_count, logger, is_afk_monitoring=False):
     """
     Обработка критической ошибки
@@ -129,12 +117,12 @@ def is_critical_error(error_reason):
     error_str = str(error_reason).lower()
     return any(indicator.lower() in error_str for indicator in critical_indicators)
 
-def safe_afk_monitoring(afk_monitor, attempt_number, logger, restart_count):
+def safe_afk_monitoring(afk_monitor, attempt_number, logger, restart_count, restore_frame=False):
     """
     Безопасный AFK мониторинг с обработкой ошибок
     """
     try:
-        return afk_monitor.monitor_after_accept(restart_count)
+        return afk_monitor.monitor_after_accept(restart_count, restore_frame)
     except Exception as e:
         # 🔥 ПРОВЕРЯЕМ НАСТРОЙКУ ДЛЯ AFK ОШИБОК
         if not RESTART_ON_CRITICAL_ERROR:
@@ -184,6 +172,9 @@ def main():
     print("=" * 60)
     logger = Logger()
     stats.record_session_start()
+
+    # 🔥 ПРАВКИ config.py И pets_config.json ПРИМЕНЯЮТСЯ БЕЗ ПЕРЕЗАПУСКА
+    config_service.start_watcher()
     
     print("=== АВТОМАТИЧЕСКИЙ ВХОД В DOTA 2 ЛОББИ ===")
     print(f"🔧 Режим работы: { 'ОБЫЧНЫЙ' if WORK_MODE == 1 else 'ПО ПРИГЛАШЕНИЮ' }")
@@ -495,9 +486,10 @@ def run_from_afk(attempt_number, logger, restart_count):
     # Создаем AFK монитор
     afk_monitor = AFKLobbyMonitor(logger)
     
-    # Безопасный AFK мониторинг
+    # Безопасный AFK мониторинг (лобби уже открыто - рамку берем из кэша позиций)
     print("🚀 Запускаем AFK мониторинг...")
-    monitor_result, monitor_reason = safe_afk_monitoring(afk_monitor, attempt_number, logger, restart_count)
+    monitor_result, monitor_reason = safe_afk_monitoring(afk_monitor, attempt_number, logger, restart_count,
+                                                         restore_frame=True)
     
     if monitor_result == "RESTART":
         logger.log_success(attempt_number, f"AFK мониторинг завершен: {monitor_reason}")
@@ -0,0 +1,235 @@
+# ocr_engine.py
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pytesseract
+from logger import debug, log_writer, DEBUG
+
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+
+TSV_COLUMNS = ['level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+               'left', 'top', 'width', 'height', 'conf', 'text']
+
+
+def parse_tesseract_config(config):
+    """
+    Разбирает строку конфига pytesseract: '--oem 3 --psm 6 -c key=value'
+    Возвращает (oem, psm, {переменные})
+    """
+    oem, psm, variables = None, None, {}
+    tokens = config.split() if config else []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '--oem' and i + 1 < len(tokens):
+            oem = int(tokens[i + 1])
+            i += 1
+        elif token == '--psm' and i + 1 < len(tokens):
+            psm = int(tokens[i + 1])
+            i += 1
+        elif token == '-c' and i + 1 < len(tokens):
+            key, _, value = tokens[i + 1].partition('=')
+            variables[key] = value
+            i += 1
+        i += 1
+    return oem, psm, variables
+
+
+def tsv_to_dict(tsv):
+    """TSV вывод Tesseract -> словарь в формате pytesseract.Output.DICT"""
+    result = {column: [] for column in TSV_COLUMNS}
+    for line in tsv.splitlines():
+        if not line.strip():
+            continue
+        cells = line.split('\t')
+        if len(cells) < len(TSV_COLUMNS):
+            cells.append('')
+        for column, value in zip(TSV_COLUMNS, cells):
+            if column == 'text':
+                result[column].append(value)
+            else:
+                result[column].append(int(float(value)))
+    return result
+
+
+class OcrEngine:
+    """
+    Распознавание текста через долгоживущие экземпляры Tesseract API (tesserocr).
+    Для каждого потока и каждого набора (язык, oem, переменные) создается свой
+    экземпляр - модель загружается один раз, а не при каждом вызове.
+    Без tesserocr (или при ошибке) используется pytesseract с тем же форматом вывода.
+    """
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.apis = []
+        self.tesserocr_enabled = None  # Определяется лениво по конфигу
+        self.executor = None
+        self.method_wins = {}  # задача -> {метод: число побед}
+
+    def is_tesserocr_enabled(self):
+        if self.tesserocr_enabled is None:
+            try:
+                from config import OCR_ENGINE
+            except ImportError:
+                OCR_ENGINE = "auto"
+
+            self.tesserocr_enabled = TESSEROCR_AVAILABLE and OCR_ENGINE in ("auto", "tesserocr")
+            if OCR_ENGINE == "tesserocr" and not TESSEROCR_AVAILABLE:
+                print("⚠️ tesserocr не установлен (pip install tesserocr), используем pytesseract")
+            print(f"🔤 OCR движок: {'tesserocr' if self.tesserocr_enabled else 'pytesseract'}")
+        return self.tesserocr_enabled
+
+    def get_tessdata_path(self):
+        """Папка tessdata рядом с tesseract.exe, найденным в setup_tesseract"""
+        tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+        if tesseract_cmd and os.path.isabs(tesseract_cmd):
+            tessdata = os.path.join(os.path.dirname(tesseract_cmd), 'tessdata')
+            if os.path.isdir(tessdata):
+                return tessdata
+        return os.environ.get('TESSDATA_PREFIX')
+
+    def _get_api(self, lang, oem, variables):
+        """Экземпляр API текущего потока для данного набора параметров"""
+        if not hasattr(self.local, 'apis'):
+            self.local.apis = {}
+
+        key = (lang, oem, tuple(sorted(variables.items())))
+        api = self.local.apis.get(key)
+        if api is None:
+            kwargs = {'lang': lang}
+            tessdata = self.get_tessdata_path()
+            if tessdata:
+                kwargs['path'] = tessdata
+            if oem is not None:
+                kwargs['oem'] = oem
+
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+
+            self.local.apis[key] = api
+            with self.lock:
+                self.apis.append(api)
+            print(f"🔤 Tesseract API инициализирован (поток {threading.current_thread().name}, {lang})")
+        return api
+
+    def _tesserocr_image_to_data(self, image, config, lang):
+        oem, psm, variables = parse_tesseract_config(config)
+        api = self._get_api(lang, oem, variables)
+        api.SetPageSegMode(psm if psm is not None else 3)
+        api.SetImage(image)
+        api.Recognize()
+        return tsv_to_dict(api.GetTSVText(0))
+
+    def image_to_data(self, image, config='', lang='eng'):
+        """
+        Замена pytesseract.image_to_data(..., output_type=Output.DICT)
+        Возвращает словарь с ключами text, conf, left, top, width, height и т.д.
+        """
+        if self.is_tesserocr_enabled():
+            try:
+                return self._tesserocr_image_to_data(image, config, lang)
+            except Exception as e:
+                print(f"⚠️ Ошибка tesserocr, используем pytesseract: {e}")
+
+        return pytesseract.image_to_data(
+            image,
+            output_type=pytesseract.Output.DICT,
+            config=config,
+            lang=lang
+        )
+
+    def get_executor(self):
+        """Пул потоков для параллельного распознавания (создается лениво)"""
+        with self.lock:
+            if self.executor is None:
+                from config import OCR_PARALLEL_WORKERS
+                self.executor = ThreadPoolExecutor(max_workers=OCR_PARALLEL_WORKERS,
+                                                   thread_name_prefix="ocr")
+            return self.executor
+
+    def order_methods(self, task_name, methods):
+        """Методы по убыванию числа побед - самый удачный пробуется первым"""
+        wins = self.method_wins.get(task_name, {})
+        return sorted(methods, key=lambda method: -wins.get(method[0], 0))
+
+    def record_win(self, task_name, method_name):
+        with self.lock:
+            wins = self.method_wins.setdefault(task_name, {})
+            wins[method_name] = wins.get(method_name, 0) + 1
+
+    def _run_method(self, method, config, lang, find_match):
+        """Распознавание одного варианта предобработки"""
+        method_name, image = method[0], method[1]
+        method_config = method[2] if len(method) > 2 else config
+        try:
+            data = self.image_to_data(image, config=method_config, lang=lang)
+            return find_match(method_name, data)
+        except Exception as e:
+            print(f"    ⚠️ Ошибка в методе {method_name}: {e}")
+            return None
+
+    def run_methods(self, task_name, methods, find_match, config='', lang='eng'):
+        """
+        Распознает несколько вариантов предобработки одного изображения и
+        возвращает первый уверенный результат.
+        methods - [(имя метода, изображение)] или [(имя метода, изображение, config)]
+        find_match(имя метода, data) - результат или None, если метод не нашел цель
+        Возвращает (имя метода, результат) или (None, None)
+        Варианты идут параллельно в пуле потоков; после первого успеха оставшиеся
+        в очереди отменяются, а результаты уже запущенных игнорируются.
+        """
+        from config import OCR_PARALLEL_ENABLED
+
+        methods = self.order_methods(task_name, methods)
+
+        if not OCR_PARALLEL_ENABLED or len(methods) < 2:
+            for method in methods:
+                debug("  🧪 Метод: %s", method[0])
+                result = self._run_method(method, config, lang, find_match)
+                if result is not None:
+                    self.record_win(task_name, method[0])
+                    return method[0], result
+            return None, None
+
+        if log_writer.is_enabled(DEBUG):
+            debug("  🧪 Методы параллельно: %s", ', '.join(method[0] for method in methods))
+        executor = self.get_executor()
+        futures = {
+            executor.submit(self._run_method, method, config, lang, find_match): method[0]
+            for method in methods
+        }
+
+        winner = None, None
+        for future in as_completed(futures):
+            result = future.result()
+            if result is not None:
+                winner = futures[future], result
+                break
+
+        for future in futures:
+            future.cancel()
+
+        if winner[0] is not None:
+            self.record_win(task_name, winner[0])
+        return winner
+
+    def close(self):
+        """Освобождает все экземпляры Tesseract API"""
+        with self.lock:
+            for api in self.apis:
+                try:
+                    api.End()
+                except Exception:
+                    pass
+            self.apis = []
+        self.local = threading.local()
+
+# Глобальный экземпляр
+ocr_engine = OcrEngine()
\ No newline at end of file
@@ -4,6 +4,93 @@ import time
 import threading
 import os
 import sys
+from bisect import bisect_right
+from status_snapshot import status_board, format_duration
+
+
+class CancellationToken:
+    """
+    Токен отмены текущей работы: взводится при перезапуске или завершении
+    программы. Все ожидания (interruptible_sleep) просыпаются сразу.
+    """
+    def __init__(self):
+        self.event = threading.Event()
+        self.reason = ""
+
+    def cancel(self, reason=""):
+        self.reason = reason
+        self.event.set()
+
+    def reset(self):
+        self.reason = ""
+        self.event.clear()
+
+    def is_cancelled(self):
+        return self.event.is_set()
+
+
+class ActiveClock:
+    """
+    Монотонные часы активного времени (без времени на паузе).
+    Отметка now() - секунды работы программы без пауз, поэтому активное время
+    операции = now() - отметка ее начала. Не зависит от перевода системных
+    часов и от пауз, которые были до начала операции.
+    Интервалы пауз хранятся по порядку с накопленной суммой - перевод любого
+    момента time.monotonic() в активное время за O(log n).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pause_starts = []   # Начала пауз (time.monotonic())
+        self.pause_ends = []     # Концы пауз (None - пауза идет сейчас)
+        self.pause_totals = []   # Суммарная длительность завершенных пауз до i-й включительно
+
+    def is_paused(self):
+        return bool(self.pause_ends) and self.pause_ends[-1] is None
+
+    def pause(self):
+        with self.lock:
+            if not self.is_paused():
+                self.pause_starts.append(time.monotonic())
+                self.pause_ends.append(None)
+
+    def resume(self):
+        """Завершает текущую паузу, возвращает ее длительность"""
+        with self.lock:
+            if not self.is_paused():
+                return 0.0
+            end = time.monotonic()
+            duration = end - self.pause_starts[-1]
+            self.pause_ends[-1] = end
+            previous = self.pause_totals[-1] if self.pause_totals else 0.0
+            self.pause_totals.append(previous + duration)
+            return duration
+
+    def active_at(self, moment):
+        """Активное время на момент moment (по time.monotonic())"""
+        with self.lock:
+            index = bisect_right(self.pause_starts, moment)
+            if index == 0:
+                return moment
+
+            paused = self.pause_totals[index - 2] if index >= 2 else 0.0
+            last_end = self.pause_ends[index - 1]
+            if last_end is None or last_end > moment:
+                last_end = moment
+            paused += last_end - self.pause_starts[index - 1]
+            return moment - paused
+
+    def now(self):
+        return self.active_at(time.monotonic())
+
+    def elapsed(self, start):
+        """Активное время с отметки start (значение now() в начале операции)"""
+        return max(0.0, self.now() - start)
+
+    def total_paused(self):
+        """Общее время на паузе в этой сессии"""
+        moment = time.monotonic()
+        return moment - self.active_at(moment)
+
 
 class PauseHandler:
     def __init__(self):
@@ -15,9 +102,12 @@ class PauseHandler:
         self.shutdown_lock = threading.Lock()
         self.restart_lock = threading.Lock()
         
-        # 🔥 ПРОСТОЕ ДОБАВЛЕНИЕ ДЛЯ УЧЕТА ВРЕМЕНИ НА ПАУЗЕ
-        self.pause_start_time = None  # Когда началась текущая пауза
-        self.total_pause_time = 0.0   # Общее время на паузе в этой сессии
+        # 🔥 УВЕДОМЛЕНИЕ ОЖИДАНИЙ: пауза/продолжение/перезапуск/завершение будят их сразу
+        self.state_changed = threading.Condition()
+        self.cancel_token = CancellationToken()
+        
+        # 🔥 УЧЕТ ВРЕМЕНИ НА ПАУЗЕ: таймауты операций считаются по активному времени
+        self.active_clock = ActiveClock()
         
         self.current_operation = "Инициализация"
         self.last_operation = "Инициализация"
@@ -55,6 +145,7 @@ class PauseHandler:
             self.operation_details = details
         else:
             self.operation_details = {}
+        self.publish_status()
         
         print(f"📱 Текущая операция: {operation_name}")
         if details:
@@ -102,22 +193,23 @@ class PauseHandler:
     def update_operation_details(self, details):
         """Обновление деталей текущей операции"""
         self.operation_details.update(details)
+        self.publish_status()
+
+    def publish_status(self):
+        """Публикует состояние на табло статуса (Telegram читает оттуда)"""
+        status_board.publish(
+            paused=self.paused,
+            shutdown_requested=self.shutdown_requested,
+            restart_requested=self.restart_requested,
+            current_operation=self.current_operation,
+            operation_started=self.operation_start_time,
+            operation_details=self.operation_details
+        )
     
     def get_current_status(self):
         """Получение текущего статуса программы"""
-        operation_duration = time.time() - self.operation_start_time
-        
         # Форматируем время операции
-        if operation_duration < 60:
-            duration_str = f"{int(operation_duration)}сек"
-        elif operation_duration < 3600:
-            minutes = int(operation_duration // 60)
-            seconds = int(operation_duration % 60)
-            duration_str = f"{minutes}м {seconds}сек"
-        else:
-            hours = int(operation_duration // 3600)
-            minutes = int((operation_duration % 3600) // 60)
-            duration_str = f"{hours}ч {minutes}м"
+        duration_str = format_duration(time.time() - self.operation_start_time)
         
         status = {
             'paused': self.paused,
@@ -171,40 +263,67 @@ class PauseHandler:
             self.paused = not self.paused
             if self.paused:
                 # 🔥 ЗАПОМИНАЕМ КОГДА НАЧАЛАСЬ ПАУЗА
-                self.pause_start_time = time.time()
+                self.active_clock.pause()
                 print("\n⏸️ ПАУЗА: Скрипт приостановлен.")
                 print("   Нажмите F11 или Ctrl+Shift+P для продолжения...")
                 self.show_notification("Dota 2 Automator - ПАУЗА", "Скрипт приостановлен")
             else:
-                # 🔥 РАССЧИТЫВАЕМ СКОЛЬКО БЫЛО НА ПАУЗЕ И ДОБАВЛЯЕМ В ОБЩЕЕ ВРЕМЯ
-                if self.pause_start_time:
-                    pause_duration = time.time() - self.pause_start_time
-                    self.total_pause_time += pause_duration
-                    print(f"⏱ Время на паузе: {pause_duration:.1f} секунд")
-                    self.pause_start_time = None
+                # 🔥 ЗАКРЫВАЕМ ИНТЕРВАЛ ПАУЗЫ
+                pause_duration = self.active_clock.resume()
+                print(f"⏱ Время на паузе: {pause_duration:.1f} секунд")
                 
                 print("\n▶️ ПРОДОЛЖЕНИЕ: Скрипт возобновляет работу...")
                 self.show_notification("Dota 2 Automator - ПРОДОЛЖЕНИЕ", "Скрипт возобновляет работу")
+        self.notify_state_changed()
     
+    def notify_state_changed(self):
+        """Будит все ожидания - они заново проверяют паузу и отмену"""
+        with self.state_changed:
+            self.state_changed.notify_all()
+        self.publish_status()
+    
+    def is_cancelled(self):
+        """Запрошен перезапуск или завершение программы"""
+        return self.cancel_token.is_cancelled()
+    
+    def interruptible_sleep(self, seconds):
+        """
+        Замена time.sleep для всех ожиданий в программе
+        На паузе отсчет останавливается до продолжения, при перезапуске
+        или завершении ожидание прерывается сразу
+        Возвращает True, если ожидание прошло полностью, False - если отменено
+        """
+        remaining = seconds
+        with self.state_changed:
+            while remaining > 0:
+                if self.cancel_token.is_cancelled():
+                    return False
+                if self.paused:
+                    self.state_changed.wait()
+                    continue
+                
+                wait_start = time.monotonic()
+                self.state_changed.wait(remaining)
+                remaining -= time.monotonic() - wait_start
+        
+        return not self.cancel_token.is_cancelled()
+    
+    def start_timer(self):
+        """
+        Отметка начала операции для таймаутов с учетом паузы
+        Передается как start_time в check_pause_with_real_timeout,
+        check_pause_with_timeout и get_real_elapsed_time
+        """
+        return self.active_clock.now()
+
     def get_adjusted_time(self, operation_start_time=None):
         """
         Возвращает время с учетом пауз
-        Если передан start_time, возвращает прошедшее время с учетом пауз
+        Если передана отметка start_timer(), возвращает прошедшее активное время
         """
-        current_time = time.time()
-        
-        if operation_start_time:
-            # Рассчитываем прошедшее время с учетом текущей паузы
-            elapsed = current_time - operation_start_time - self.total_pause_time
-            
-            # Если сейчас на паузе, не считаем время текущей паузы
-            if self.paused and self.pause_start_time:
-                elapsed -= (current_time - self.pause_start_time)
-            
-            return elapsed
-        else:
-            # Возвращаем текущее время с поправкой на паузы
-            return current_time - self.total_pause_time
+        if operation_start_time is not None:
+            return self.active_clock.elapsed(operation_start_time)
+        return self.active_clock.now()
 
     def check_pause_with_timeout(self, operation_name, timeout, start_time=None):
         """
@@ -213,7 +332,7 @@ class PauseHandler:
         """
         # 🔥 Определяем время начала если не передано
         if start_time is None:
-            start_time = time.time()
+            start_time = self.start_timer()
         
         # Проверяем запросы на перезапуск и завершение
         restart_requested, restart_reason = self.check_restart()
@@ -260,8 +379,8 @@ class PauseHandler:
         Ожидание с таймаутом, которое учитывает паузу
         callback - функция, которая вызывается периодически (если нужно)
         """
-        start_time = time.time()
-        last_callback_time = start_time
+        start_time = self.start_timer()
+        last_callback_time = time.time()
         
         while True:
             should_continue, elapsed = self.check_pause_with_timeout(
@@ -283,7 +402,7 @@ class PauseHandler:
                 return False, elapsed
             
             # Ждем немного
-            time.sleep(1)
+            self.interruptible_sleep(1)
         
         return True, elapsed
 
@@ -292,6 +411,8 @@ class PauseHandler:
         with self.shutdown_lock:
             if not self.shutdown_requested:
                 self.shutdown_requested = True
+                self.cancel_token.cancel("Завершение программы")
+                self.notify_state_changed()
                 print("\n🛑 ЗАВЕРШЕНИЕ: Запрошено завершение программы...")
                 print("   Программа завершится после текущей операции.")
                 self.show_notification(
@@ -305,8 +426,9 @@ class PauseHandler:
     
     def wait_if_paused(self):
         """Блокирует выполнение если скрипт на паузе"""
-        while self.paused and not self.shutdown_requested:
-            time.sleep(0.5)
+        with self.state_changed:
+            while self.paused and not self.shutdown_requested:
+                self.state_changed.wait()
     
     def request_restart(self, reason=""):
         """Запрашивает немедленный перезапуск программы"""
@@ -314,6 +436,8 @@ class PauseHandler:
             if not self.restart_requested:
                 self.restart_requested = True
                 self.restart_reason = reason
+                self.cancel_token.cancel(reason)
+                self.notify_state_changed()
                 print(f"\n🔄 ЗАПРОШЕН НЕМЕДЛЕННЫЙ ПЕРЕЗАПУСК!")
                 print(f"   Причина: {reason}")
                 self.show_notification(
@@ -333,34 +457,21 @@ class PauseHandler:
         with self.restart_lock:
             self.restart_requested = False
             self.restart_reason = ""
+            if not self.shutdown_requested:
+                self.cancel_token.reset()
+        self.publish_status()
 
     def get_real_elapsed_time(self, start_time):
         """
         Возвращает реальное прошедшее время БЕЗ учета времени на паузе
+        start_time - отметка start_timer() в начале операции
         """
-        current_time = time.time()
-        
-        # 🔥 ПРОСТОЙ И ПРАВИЛЬНЫЙ РАСЧЕТ:
-        # 1. Общее прошедшее время
-        total_elapsed = current_time - start_time
-        
-        # 2. Вычитаем общее время на паузе
-        elapsed_without_pauses = total_elapsed - self.total_pause_time
-        
-        # 3. Если сейчас на паузе, вычитаем текущую паузу
-        if self.paused and self.pause_start_time:
-            current_pause_duration = current_time - self.pause_start_time
-            elapsed_without_pauses -= current_pause_duration
-        
-        # 🔥 НЕ ДОПУСКАЕМ ОТРИЦАТЕЛЬНЫХ ЗНАЧЕНИЙ
-        if elapsed_without_pauses < 0:
-            return 0.0
-        
-        return elapsed_without_pauses
+        return self.active_clock.elapsed(start_time)
     
     def check_pause_with_real_timeout(self, operation_name, timeout, start_time):
         """
         Простая проверка паузы с учетом реального времени (без времени на паузе)
+        start_time - отметка start_timer() в начале операции
         Возвращает: (should_continue, elapsed_without_pauses)
         """
         # 1. Сначала проверяем обычные прерывания
@@ -416,28 +527,47 @@ class PauseHandler:
         with self.pause_lock:
             if not self.paused:
                 self.paused = True
+                self.active_clock.pause()
                 print("\n⏸️ ПРИНУДИТЕЛЬНАЯ ПАУЗА: Скрипт приостановлен.")
                 self.show_notification(
                     "Dota 2 Automator - ПАУЗА", 
                     "Скрипт приостановлен"
                 )
+        self.notify_state_changed()
     
     def force_resume(self):
         """Принудительно снимает с паузы"""
         with self.pause_lock:
             if self.paused:
                 self.paused = False
+                self.active_clock.resume()
                 print("\n▶️ ПРИНУДИТЕЛЬНОЕ ПРОДОЛЖЕНИЕ: Скрипт возобновляет работу...")
                 self.show_notification(
                     "Dota 2 Automator - ПРОДОЛЖЕНИЕ", 
                     "Скрипт возобновляет работу"
                 )
+        self.notify_state_changed()
 
     def graceful_shutdown(self):
         """Выполняет graceful shutdown программы"""
         print("\n🎯 Завершение программы...")
         print("Спасибо за использование Dota 2 Automator!")
-        # Здесь можно добавить сохранение статистики или другие завершающие действия
+        
+        # 🔥 ФИНАЛЬНЫЙ СБРОС СТАТИСТИКИ НА ДИСК
+        try:
+            from statistics import stats
+            from persistence import persistence
+            stats.save_stats()
+            persistence.shutdown()
+            print("💾 Статистика сохранена")
+        except Exception as e:
+            print(f"⚠️ Ошибка сохранения статистики при завершении: {e}")
+
+        try:
+            from logger import log_writer
+            log_writer.shutdown()
+        except Exception as e:
+            print(f"⚠️ Ошибка записи лога при завершении: {e}")
         sys.exit(0)
 
 # Глобальный экземпляр
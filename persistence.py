@@ -0,0 +1,83 @@
+# persistence.py
+import atexit
+import json
+import os
+import threading
+from config import PERSIST_FLUSH_INTERVAL
+
+
+def atomic_write_json(path, data, indent=2):
+    """
+    Запись JSON через временный файл и переименование:
+    при сбое на диске остается либо старый, либо новый файл целиком
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class PersistenceWorker:
+    """
+    Отложенная запись на диск в фоновом потоке.
+    Рабочий поток только помечает данные измененными (mark_dirty) - повторные
+    изменения до сброса объединяются в одну запись. Сброс раз в
+    PERSIST_FLUSH_INTERVAL секунд, по request_flush() и при завершении программы.
+    """
+    def __init__(self, flush_interval=PERSIST_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.dirty = {}  # ключ (обычно путь к файлу) -> функция записи
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+                self.thread.start()
+                atexit.register(self.shutdown)
+
+    def mark_dirty(self, key, writer):
+        """writer() будет вызвана в фоновом потоке при ближайшем сбросе"""
+        with self.lock:
+            self.dirty[key] = writer
+        if self.thread is None:
+            self.start()
+
+    def request_flush(self):
+        """Сбросить изменения, не дожидаясь интервала"""
+        self.wake_event.set()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.wake_event.wait(self.flush_interval)
+            self.wake_event.clear()
+            self.flush()
+
+    def flush(self):
+        """Записывает все измененные данные"""
+        with self.flush_lock:
+            with self.lock:
+                writers = list(self.dirty.items())
+                self.dirty = {}
+
+            for key, writer in writers:
+                try:
+                    writer()
+                except Exception as e:
+                    print(f"⚠️ Ошибка сохранения {key}: {e}")
+
+    def shutdown(self):
+        """Финальный сброс при завершении программы"""
+        self.stop_event.set()
+        self.wake_event.set()
+        self.flush()
+
+# Глобальный экземпляр
+persistence = PersistenceWorker()
\ No newline at end of file
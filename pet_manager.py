@@ -5,6 +5,8 @@ import time
 import pyautogui
 from config import PET_CONFIG_FILE
 from pause_handler import pause_handler
+from frame_capture import frame_capture
+from config_service import config_service
 
 class PetManager:
     def __init__(self, logger):
@@ -12,6 +14,8 @@ class PetManager:
         self.config_file = PET_CONFIG_FILE
         self.pets = self.load_pets()
         self.current_pet = None
+        # 🔥 ПРАВКА pets_config.json (в том числе из другого экземпляра) ПОДХВАТЫВАЕТСЯ НА ЛЕТУ
+        config_service.watch_file(self.config_file, self.reload_pets_config)
         
     def load_pets(self):
         """Загрузка конфигурации питомцев из файла"""
@@ -55,6 +59,8 @@ class PetManager:
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.pets, f, indent=2, ensure_ascii=False)
+            # Свое сохранение не перечитываем
+            config_service.mark_file_seen(self.config_file, self.reload_pets_config)
             print(f"✅ Конфигурация питомцев сохранена")
             return True
         except Exception as e:
@@ -231,7 +237,7 @@ class PetManager:
                 pyautogui.moveTo(x, y, duration=0.2)
                 time.sleep(0.1)
                 pyautogui.click()
-                time.sleep(1)
+                pause_handler.interruptible_sleep(1)
                 # 🔥 ДЕЛАЕМ СКРИНШОТ НА 2-ОМ ШАГЕ
                 if i == 2:
                     print(f"📸 Делаем скриншот после 2-го шага...")
@@ -252,7 +258,9 @@ class PetManager:
 
                 # 🔥 УВЕЛИЧИВАЕМ ЗАДЕРЖКУ МЕЖДУ КЛИКАМИ
                 if i < len(clicks):  # Не ждем после последнего клика
-                    time.sleep(click_delay)
+                    if not pause_handler.interruptible_sleep(click_delay):
+                        print("🛑 Переключение питомца прервано (перезапуск/завершение)")
+                        return False, "Переключение прервано"
             
             self.current_pet = pet_id
             print(f"✅ Успешно переключились на питомца '{pet['name']}'")
@@ -265,58 +273,44 @@ class PetManager:
     def take_step_screenshot(self, pet_id, step_number, pet_name):
         """Сделать скриншот на определенном шаге и отправить в Telegram"""
         try:
-            import pyautogui
-            from PIL import Image
-            import io
             import datetime
-            import os
+            from screenshot_encoder import encode_screenshot, archive_screenshot
             
             # Делаем скриншот
-            screenshot = pyautogui.screenshot()
+            screenshot = frame_capture.screenshot()
             
-            # Создаем папку для скриншотов шагов если нет
-            screenshots_dir = "screenshots/pet_steps"
-            os.makedirs(screenshots_dir, exist_ok=True)
-            
-            # Сохраняем файл с временной меткой
+            # 🔥 СЖАТИЕ В ПАМЯТИ, НА ДИСК - ТОЛЬКО ПРИ SCREENSHOT_ARCHIVE (В ФОНЕ)
+            data, _, extension = encode_screenshot(screenshot)
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{screenshots_dir}/pet_{pet_id}_step_{step_number}_{timestamp}.png"
-            screenshot.save(filename)
+            filename = archive_screenshot(data, "screenshots/pet_steps",
+                                          f"pet_{pet_id}_step_{step_number}_{timestamp}", extension)
             
             # Получаем информацию о скриншоте
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = frame_capture.screen_size()
             current_time = datetime.datetime.now().strftime("%H:%M:%S")
             
             # 🔥 ОТПРАВЛЯЕМ В TELEGRAM
             try:
-                from telegram_bot import get_bot_manager
-                bot_manager = get_bot_manager()
+                from telegram_outbox import telegram_outbox
+                from config import TELEGRAM_ADMIN_IDS
                 
-                if bot_manager and hasattr(bot_manager, 'bot'):
-                    from config import TELEGRAM_ADMIN_IDS
+                if TELEGRAM_ADMIN_IDS:
+                    chat_id = TELEGRAM_ADMIN_IDS[0]
                     
-                    if TELEGRAM_ADMIN_IDS:
-                        chat_id = TELEGRAM_ADMIN_IDS[0]
-                        
-                        with open(filename, 'rb') as photo:
-                            caption = (
-                                f"📸 *Скриншот переключения питомца*\n\n"
-                                f"🐾 *Питомец:* {pet_name}\n"
-                                f"🔢 *Шаг:* {step_number}/5\n"
-                                f"🕐 *Время:* {current_time}\n"
-                                f"📏 *Разрешение:* {screen_width}x{screen_height}\n"
-                                f"💾 *Размер файла:* {os.path.getsize(filename) // 1024} KB\n"
-                                f"📁 *Путь:* `{filename}`"
-                            )
-                            
-                            bot_manager.bot.send_photo(
-                                chat_id,
-                                photo,
-                                caption=caption,
-                                parse_mode='Markdown'
-                            )
-                        
-                        print(f"✅ Скриншот шага {step_number} отправлен в Telegram")
+                    caption = (
+                        f"📸 *Скриншот переключения питомца*\n\n"
+                        f"🐾 *Питомец:* {pet_name}\n"
+                        f"🔢 *Шаг:* {step_number}/5\n"
+                        f"🕐 *Время:* {current_time}\n"
+                        f"📏 *Разрешение:* {screen_width}x{screen_height}\n"
+                        f"💾 *Размер файла:* {len(data) // 1024} KB"
+                    )
+                    if filename:
+                        caption += f"\n📁 *Путь:* `{filename}`"
+                    
+                    # 🔥 ПЕРЕКЛЮЧЕНИЕ ПИТОМЦА НЕ ЖДЕТ ЗАГРУЗКИ ФОТО
+                    if telegram_outbox.send_photo(chat_id, data, caption=caption, parse_mode='Markdown'):
+                        print(f"✅ Скриншот шага {step_number} поставлен в очередь Telegram")
                         return True
                         
             except Exception as e:
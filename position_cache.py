@@ -0,0 +1,151 @@
+# position_cache.py
+import copy
+import json
+import os
+import threading
+import time
+from config import (
+    POSITION_CACHE_FILE,
+    POSITION_MIN_CONFIDENCE,
+    POSITION_TARGET_MIN_CONFIDENCE,
+    POSITION_CONFIDENCE_DECAY,
+    POSITION_MAX_MISSES
+)
+from frame_capture import frame_capture
+from persistence import persistence, atomic_write_json
+
+
+class PositionCache:
+    """
+    Запомненные позиции кликабельных целей (REFRESH, DOTALAND, OK, ACCEPT, FIND,
+    стрелка, рамка аватарки) по имени цели и разрешению экрана.
+    Хранится на диске - после перезапуска (например START_FROM=3) позиции
+    известны сразу, без повторного поиска через OCR.
+    Уверенность позиции снижается со временем, после нескольких промахов
+    подряд позиция сбрасывается.
+    """
+    def __init__(self, cache_file=POSITION_CACHE_FILE):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.positions = {}  # разрешение -> {имя цели -> запись}
+        self.load()
+
+    def load(self):
+        """Загрузка позиций с диска"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.positions = json.load(f)
+                count = sum(len(targets) for targets in self.positions.values())
+                print(f"📍 Загружено запомненных позиций: {count}")
+        except Exception as e:
+            print(f"⚠️ Ошибка загрузки позиций: {e}")
+            self.positions = {}
+
+    def save(self):
+        """
+        Помечает позиции измененными (вызывается под блокировкой); запись
+        на диск - в фоновом потоке, частые попадания и промахи объединяются
+        """
+        persistence.mark_dirty(self.cache_file, self.write_file)
+
+    def write_file(self):
+        """Запись позиций на диск (в потоке persistence)"""
+        with self.lock:
+            positions = copy.deepcopy(self.positions)
+        atomic_write_json(self.cache_file, positions)
+
+    def get_resolution_key(self):
+        width, height = frame_capture.screen_size()
+        return f"{width}x{height}"
+
+    def _targets(self):
+        return self.positions.setdefault(self.get_resolution_key(), {})
+
+    def _effective_confidence(self, entry):
+        """Уверенность с учетом давности: минус POSITION_CONFIDENCE_DECAY% в час"""
+        hours = (time.time() - entry.get('updated', 0)) / 3600
+        return entry.get('confidence', 0) - POSITION_CONFIDENCE_DECAY * hours
+
+    def remember(self, name, position, confidence, bbox=None):
+        """Запоминает позицию цели после успешного поиска"""
+        with self.lock:
+            self._targets()[name] = {
+                'position': [int(position[0]), int(position[1])],
+                'bbox': [int(v) for v in bbox] if bbox else None,
+                'confidence': float(confidence),
+                'updated': time.time(),
+                'misses': 0
+            }
+            self.save()
+
+    def get(self, name, min_confidence=None):
+        """
+        Запись о позиции цели или None, если позиции нет
+        или уверенность (с учетом давности) ниже порога
+        (по умолчанию - порог цели из POSITION_TARGET_MIN_CONFIDENCE)
+        Возвращает {'position', 'bbox', 'confidence', 'misses'}
+        """
+        with self.lock:
+            entry = self._targets().get(name)
+            if not entry:
+                return None
+
+            if min_confidence is None:
+                min_confidence = POSITION_TARGET_MIN_CONFIDENCE.get(name, POSITION_MIN_CONFIDENCE)
+            confidence = self._effective_confidence(entry)
+            if confidence < min_confidence:
+                return None
+
+            return {
+                'position': tuple(entry['position']),
+                'bbox': tuple(entry['bbox']) if entry.get('bbox') else None,
+                'confidence': confidence,
+                'misses': entry.get('misses', 0)
+            }
+
+    def get_position(self, name, min_confidence=None):
+        entry = self.get(name, min_confidence)
+        return entry['position'] if entry else None
+
+    def get_bbox(self, name, min_confidence=None):
+        entry = self.get(name, min_confidence)
+        return entry['bbox'] if entry else None
+
+    def hit(self, name):
+        """Цель подтверждена на запомненной позиции - сбрасываем промахи и давность"""
+        with self.lock:
+            entry = self._targets().get(name)
+            if entry:
+                entry['misses'] = 0
+                entry['updated'] = time.time()
+                self.save()
+
+    def miss(self, name):
+        """
+        Промах по запомненной позиции
+        Возвращает True, если после POSITION_MAX_MISSES промахов позиция сброшена
+        """
+        with self.lock:
+            entry = self._targets().get(name)
+            if not entry:
+                return False
+
+            entry['misses'] = entry.get('misses', 0) + 1
+            if entry['misses'] >= POSITION_MAX_MISSES:
+                print(f"🔄 Слишком много промахов, сбрасываем позицию {name}")
+                del self._targets()[name]
+                self.save()
+                return True
+
+            self.save()
+            return False
+
+    def forget(self, name):
+        """Сброс позиции цели"""
+        with self.lock:
+            if self._targets().pop(name, None) is not None:
+                self.save()
+
+# Глобальный экземпляр
+position_cache = PositionCache()
\ No newline at end of file
@@ -0,0 +1,57 @@
+# screenshot_encoder.py
+import io
+import os
+from PIL import Image, features
+from config import SCREENSHOT_MAX_EDGE, SCREENSHOT_FORMAT, SCREENSHOT_QUALITY, SCREENSHOT_ARCHIVE
+from persistence import persistence
+
+# Все форматы, в которых скриншоты могут лежать в папке screenshots
+SCREENSHOT_EXTENSIONS = ('.png', '.jpg', '.webp')
+
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp', 'PNG': 'png'}
+
+
+def get_image_format():
+    """Формат из SCREENSHOT_FORMAT; WEBP без поддержки в Pillow заменяется на JPEG"""
+    image_format = SCREENSHOT_FORMAT.upper()
+    if image_format == 'WEBP' and not features.check('webp'):
+        return 'JPEG'
+    return image_format if image_format in EXTENSIONS else 'JPEG'
+
+
+def encode_screenshot(image, max_edge=SCREENSHOT_MAX_EDGE, quality=SCREENSHOT_QUALITY):
+    """
+    Уменьшает скриншот до max_edge по длинной стороне и сжимает в памяти
+    Возвращает (байты, (ширина, высота), расширение файла)
+    """
+    image_format = get_image_format()
+    if max_edge and max(image.size) > max_edge:
+        image = image.copy()
+        image.thumbnail((max_edge, max_edge), Image.BILINEAR)
+    if image_format != 'PNG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    if image_format == 'PNG':
+        image.save(buffer, format='PNG', optimize=False)
+    else:
+        image.save(buffer, format=image_format, quality=quality)
+    return buffer.getvalue(), image.size, EXTENSIONS[image_format]
+
+
+def _write_bytes(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def archive_screenshot(data, directory, name, extension):
+    """
+    Сохранение сжатого скриншота на диск в фоновом потоке (SCREENSHOT_ARCHIVE)
+    Возвращает путь к будущему файлу или None, если архив отключен
+    """
+    if not SCREENSHOT_ARCHIVE:
+        return None
+    path = os.path.join(directory, f"{name}.{extension}")
+    persistence.mark_dirty(path, lambda: _write_bytes(path, data))
+    return path
\ No newline at end of file
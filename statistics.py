@@ -2,11 +2,37 @@
 import datetime
 import json
 import os
-from config import STATS_FILE
+import threading
+from config import (
+    STATS_FILE,
+    STATS_JOURNAL_FILE,
+    STATS_SNAPSHOT_EVERY,
+    STATS_JOURNAL_MAX_SIZE,
+    STATS_FSYNC_BATCH,
+    STATS_RECENT_EVENTS
+)
+from stats_db import stats_db
+from persistence import persistence, atomic_write_json
+from stats_rollup import StatsRollup
+from status_snapshot import status_board
 
 class Statistics:
+    """
+    Статистика бота
+    Каждое событие дописывается одной строкой в журнал (STATS_JOURNAL_FILE),
+    fsync - пачками в фоновом потоке (persistence). Общая статистика
+    периодически сохраняется снимком в STATS_FILE вместе со смещением в журнале;
+    при запуске загружается снимок и применяются только события журнала после него.
+    """
     def __init__(self):
         self.stats_file = STATS_FILE
+        self.journal_file = STATS_JOURNAL_FILE
+        self.lock = threading.RLock()
+        self.journal = None
+        self.unsynced_events = 0
+        self.events_since_snapshot = 0
+        self.rollups = StatsRollup()  # Почасовые/посуточные агрегаты и квантили
+        self.revision = 0  # Номер события - экраны статистики перестраиваются при изменении
         self.session_start_time = datetime.datetime.now()
         self.current_session_data = {
             'session_start': self.session_start_time.isoformat(),
@@ -18,6 +44,7 @@ class Statistics:
             'events': []
         }
         self.load_existing_stats()
+        self.publish_status()
     
     def record_pet_switch_by_trigger(self, pet_id, pet_name, trigger_cycles, current_cycles, trigger_deactivated=True):
         """
@@ -38,20 +65,13 @@ class Statistics:
             'trigger_deactivated': trigger_deactivated  # 🔥 НОВЫЙ ПАРАМЕТР
         }
         
-        # Добавляем в текущую сессию
-        self.current_session_data['events'].append(event_data)
-        
         # Увеличиваем счетчик переключений
         if 'pet_switches_by_trigger' not in self.current_session_data:
             self.current_session_data['pet_switches_by_trigger'] = 0
         self.current_session_data['pet_switches_by_trigger'] += 1
         
-        # Обновляем общую статистику
-        if 'total_pet_switches_by_trigger' not in self.total_stats:
-            self.total_stats['total_pet_switches_by_trigger'] = 0
-        self.total_stats['total_pet_switches_by_trigger'] += 1
-        
-        self.save_stats()
+        # Обновляем общую статистику и пишем событие в журнал
+        self.record_event(event_data)
         
         print(f"\n📊 СТАТИСТИКА: Переключение питомца по триггеру бесконечки!")
         print(f"🐾 Питомец: {pet_name}")
@@ -74,20 +94,13 @@ class Statistics:
             'details': details
         }
         
-        # Добавляем в текущую сессию
-        self.current_session_data['events'].append(event_data)
-        
         # Увеличиваем счетчик смертей героя
         if 'hero_death_infinite_count' not in self.current_session_data:
             self.current_session_data['hero_death_infinite_count'] = 0
         self.current_session_data['hero_death_infinite_count'] += 1
         
-        # Обновляем общую статистику
-        if 'hero_death_infinite_count' not in self.total_stats:
-            self.total_stats['hero_death_infinite_count'] = 0
-        self.total_stats['hero_death_infinite_count'] += 1
-        
-        self.save_stats()
+        # Обновляем общую статистику и пишем событие в журнал
+        self.record_event(event_data)
         
         print(f"\n💀 СТАТИСТИКА: Зафиксирована смерть героя в бесконечке!")
         print(f"📅 Дата: {event_data['date']}")
@@ -124,16 +137,8 @@ class Statistics:
             'details': details
         }
         
-        # Добавляем в текущую сессию
-        self.current_session_data['events'].append(event_data)
-        
         # Увеличиваем счетчик в зависимости от типа
-        if death_type == 'gold_text':
-            key = 'gold_deaths_count'
-        elif death_type == 'red_frame':
-            key = 'red_frame_deaths_count'
-        else:
-            key = 'other_deaths_count'
+        key = self.get_death_key(death_type)
         
         # Инициализируем счетчики если их нет
         if key not in self.current_session_data:
@@ -141,12 +146,8 @@ class Statistics:
         
         self.current_session_data[key] += 1
         
-        # Обновляем общую статистику
-        if key not in self.total_stats:
-            self.total_stats[key] = 0
-        self.total_stats[key] += 1
-        
-        self.save_stats()
+        # Обновляем общую статистику и пишем событие в журнал
+        self.record_event(event_data)
         
         # Выводим информацию
         death_name = "9999999 в чате" if death_type == 'gold_text' else "красная рамка"
@@ -155,6 +156,15 @@ class Statistics:
         print(f"⏰ Время: {event_data['time']}")
         print(f"📋 Детали: {details}")
 
+    @staticmethod
+    def get_death_key(death_type):
+        """Счетчик смертей хоста для типа death_type"""
+        if death_type == 'gold_text':
+            return 'gold_deaths_count'
+        elif death_type == 'red_frame':
+            return 'red_frame_deaths_count'
+        return 'other_deaths_count'
+
     def get_death_statistics(self):
         """Возвращает статистику смертей хоста"""
         session_stats = {
@@ -189,18 +199,20 @@ class Statistics:
             'total_cycles': self.current_session_data['infinite_cycles']
         }
         
-        self.current_session_data['events'].append(event_data)
-        self.save_stats()
+        self.record_event(event_data)
         
         print(f"📊 СТАТИСТИКА: Записан цикл бесконечки!")
         print(f"   Всего циклов в сессии: {self.current_session_data['infinite_cycles']}")
 
     def load_existing_stats(self):
-        """Загружает существующую статистику из файла"""
+        """Загружает снимок общей статистики и события журнала после него"""
+        journal_offset = 0
         if os.path.exists(self.stats_file):
             try:
                 with open(self.stats_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
+                    journal_offset = data.get('journal_offset', 0)
+                    self.rollups = StatsRollup(data.get('rollups'))
                     # Загружаем только общую статистику, сессию начинаем заново
                     self.total_stats = data.get('total_stats', {
                         'total_sessions': 0,
@@ -229,6 +241,160 @@ class Statistics:
                 'total_multiplied_gold': 0,
                 'average_find_time': 0
             }
+        
+        self.replay_journal(journal_offset)
+    
+    def replay_journal(self, offset):
+        """
+        Применяет к общей статистике события журнала, записанные после снимка
+        Возвращает количество примененных событий
+        """
+        if not os.path.exists(self.journal_file):
+            return 0
+        
+        if os.path.getsize(self.journal_file) < offset:
+            offset = 0  # Журнал создан заново после снимка
+        
+        count = 0
+        try:
+            with open(self.journal_file, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        event_data = json.loads(line)
+                    except ValueError:
+                        continue  # Недописанная строка после аварийного завершения
+                    self._update_totals(event_data)
+                    count += 1
+        except Exception as e:
+            print(f"⚠️ Ошибка чтения журнала статистики: {e}")
+        
+        if count:
+            print(f"📊 Из журнала статистики применено событий: {count}")
+        return count
+    
+    def _update_totals(self, event_data):
+        """Изменение общей статистики по событию (при записи и при восстановлении из журнала)"""
+        event_type = event_data.get('event_type')
+        self.rollups.add_event(event_data)
+        
+        if event_type == 'gold_found':
+            find_time_seconds = event_data.get('find_time_seconds', 0)
+            self.total_stats['total_gold_found'] += 1
+            self.total_stats['total_multiplied_gold'] = self.total_stats['total_gold_found'] * 3
+            self.total_stats['total_gold_find_time'] += find_time_seconds
+            
+            # Рассчитываем среднее время поиска
+            if self.total_stats['total_gold_found'] > 0:
+                self.total_stats['average_find_time'] = (
+                    self.total_stats['total_gold_find_time'] / self.total_stats['total_gold_found']
+                )
+        
+        elif event_type == 'host_death':
+            key = self.get_death_key(event_data.get('death_type'))
+            self.total_stats[key] = self.total_stats.get(key, 0) + 1
+        
+        elif event_type == 'hero_death_infinite':
+            self.total_stats['hero_death_infinite_count'] = self.total_stats.get('hero_death_infinite_count', 0) + 1
+        
+        elif event_type == 'pet_switch_by_trigger':
+            self.total_stats['total_pet_switches_by_trigger'] = self.total_stats.get('total_pet_switches_by_trigger', 0) + 1
+        
+        elif event_type == 'session_start':
+            self.total_stats['total_sessions'] += 1
+    
+    def _open_journal(self):
+        """Файл журнала, открытый на дозапись (открывается один раз)"""
+        if self.journal is None:
+            os.makedirs(os.path.dirname(self.journal_file) or '.', exist_ok=True)
+            self.journal = open(self.journal_file, 'ab')
+            
+            # Недописанная строка после аварийного завершения - начинаем с новой строки
+            if self.journal.tell() > 0:
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self.journal.write(b'\n')
+        return self.journal
+    
+    def sync_journal(self):
+        """Сброс журнала на диск"""
+        with self.lock:
+            if self.journal is None or self.unsynced_events == 0:
+                return
+            try:
+                self.journal.flush()
+                os.fsync(self.journal.fileno())
+            except Exception as e:
+                print(f"⚠️ Ошибка сброса журнала статистики: {e}")
+            self.unsynced_events = 0
+    
+    def rotate_journal(self):
+        """
+        Начинает журнал заново (старый сохраняется с суффиксом .1).
+        Вызывается под блокировкой после записи снимка; журнал не трогаем,
+        пока база статистики не записала все события из очереди.
+        """
+        if not stats_db.flush_pending():
+            return False
+        try:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            os.replace(self.journal_file, self.journal_file + '.1')
+        except Exception as e:
+            print(f"⚠️ Ошибка ротации журнала статистики: {e}")
+            return False
+        
+        stats_db.journal_rotated()
+        print("📊 Журнал статистики начат заново")
+        return True
+    
+    def record_event(self, event_data):
+        """
+        Записывает событие: общая статистика, последние события сессии
+        и одна строка в журнале. Время записи не зависит от объема истории.
+        """
+        with self.lock:
+            self._update_totals(event_data)
+            
+            events = self.current_session_data['events']
+            events.append(event_data)
+            if len(events) > STATS_RECENT_EVENTS:
+                del events[:-STATS_RECENT_EVENTS]
+            
+            journal_offset = None
+            try:
+                journal = self._open_journal()
+                journal.write((json.dumps(event_data, ensure_ascii=False) + '\n').encode('utf-8'))
+                journal.flush()
+                journal_offset = journal.tell()
+                self.unsynced_events += 1
+            except Exception as e:
+                print(f"⚠️ Ошибка записи события в журнал статистики: {e}")
+            
+            # В базу - в фоновом потоке; смещение не дает вставить событие дважды,
+            # если новая база при создании импортирует журнал целиком
+            stats_db.add_event(event_data, journal_offset)
+            
+            # fsync - в фоновом потоке, не задерживая автоматизацию
+            persistence.mark_dirty(self.journal_file, self.sync_journal)
+            if self.unsynced_events >= STATS_FSYNC_BATCH:
+                persistence.request_flush()
+            
+            self.events_since_snapshot += 1
+            if self.events_since_snapshot >= STATS_SNAPSHOT_EVERY:
+                self.save_stats()
+            
+            self.publish_status()
+    
+    def publish_status(self):
+        """Счетчики сессии на табло статуса (без списка событий)"""
+        self.revision += 1
+        status_board.publish(
+            session={key: value for key, value in self.current_session_data.items() if key != 'events'},
+            stats_revision=self.revision
+        )
     
     def record_gold_found(self, find_time_seconds):
         """
@@ -254,21 +420,9 @@ class Statistics:
         self.current_session_data['gold_found_count'] += 1
         self.current_session_data['multiplied_gold_count'] = multiplied_count
         self.current_session_data['total_gold_find_time'] += find_time_seconds
-        self.current_session_data['events'].append(event_data)
         
-        # Обновляем общую статистику
-        self.total_stats['total_gold_found'] += 1
-        self.total_stats['total_multiplied_gold'] = self.total_stats['total_gold_found'] * 3
-        self.total_stats['total_gold_find_time'] += find_time_seconds
-        
-        # Рассчитываем среднее время поиска
-        if self.total_stats['total_gold_found'] > 0:
-            self.total_stats['average_find_time'] = (
-                self.total_stats['total_gold_find_time'] / self.total_stats['total_gold_found']
-            )
-        
-        # Сохраняем в файл
-        self.save_stats()
+        # Обновляем общую статистику и пишем событие в журнал
+        self.record_event(event_data)
         
         # Выводим информацию о событии
         print(f"\n🎯 СТАТИСТИКА: 9999999 найден!")
@@ -291,13 +445,11 @@ class Statistics:
             'event_type': 'restart'
         }
         
-        self.current_session_data['events'].append(event_data)
-        self.save_stats()
+        self.record_event(event_data)
     
     def record_session_start(self):
         """Записывает начало новой сессии"""
         self.session_start_time = datetime.datetime.now()
-        self.total_stats['total_sessions'] += 1
         self.current_session_data = {
             'session_start': self.session_start_time.isoformat(),
             'gold_found_count': 0,
@@ -306,25 +458,53 @@ class Statistics:
             'multiplied_gold_count': 0,
             'events': []
         }
+        stats_db.start_session(self.session_start_time.isoformat())
+        self.record_event({
+            'timestamp': self.session_start_time.isoformat(),
+            'date': self.session_start_time.strftime("%Y-%m-%d"),
+            'time': self.session_start_time.strftime("%H:%M:%S"),
+            'event_type': 'session_start'
+        })
         self.save_stats()
     
     def save_stats(self):
-        """Сохраняет статистику в файл"""
-        try:
-            stats_data = {
-                'total_stats': self.total_stats,
-                'current_session': self.current_session_data,
-                'last_update': datetime.datetime.now().isoformat()
-            }
-            
-            # Создаем директорию если не существует
-            os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
-            
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(stats_data, f, indent=2, ensure_ascii=False)
+        """Сохраняет снимок статистики в файл (в фоновом потоке при ближайшем сбросе)"""
+        persistence.mark_dirty(self.stats_file, self.write_snapshot)
+    
+    def write_snapshot(self):
+        """
+        Запись снимка статистики
+        journal_offset - позиция в журнале, до которой события уже учтены в снимке
+        """
+        with self.lock:
+            try:
+                self.sync_journal()
+                if self.journal is not None:
+                    journal_offset = self.journal.tell()
+                elif os.path.exists(self.journal_file):
+                    journal_offset = os.path.getsize(self.journal_file)
+                else:
+                    journal_offset = 0
                 
-        except Exception as e:
-            print(f"⚠️ Ошибка сохранения статистики: {e}")
+                stats_data = {
+                    'total_stats': self.total_stats,
+                    'current_session': self.current_session_data,
+                    'rollups': self.rollups.to_dict(),
+                    'journal_offset': journal_offset,
+                    'last_update': datetime.datetime.now().isoformat()
+                }
+                
+                atomic_write_json(self.stats_file, stats_data)
+                
+                # Все события журнала уже в снимке - большой журнал начинаем заново
+                if journal_offset >= STATS_JOURNAL_MAX_SIZE and self.rotate_journal():
+                    stats_data['journal_offset'] = 0
+                    atomic_write_json(self.stats_file, stats_data)
+                
+                self.events_since_snapshot = 0
+                    
+            except Exception as e:
+                print(f"⚠️ Ошибка сохранения статистики: {e}")
     
     def get_session_summary(self):
         """Возвращает сводку по текущей сессии"""
@@ -384,6 +564,38 @@ class Statistics:
         print(f"💰 Всего смертей по 9999999: {total_summary.get('red_frame_deaths_count', 0)}")
         print(f"⚰️ Всего смертей хоста: {total_summary.get('total_deaths', 0)}")
         print(f"🔄 Всего перезапусков: {total_summary['total_restarts']}")
+        
+        summary = self.get_rollup_summary()
+        print("\n⏱ РАСПРЕДЕЛЕНИЯ (p50 / p90 / p99)")
+        print("=" * 60)
+        for key, title in (('find_time', "Время поиска 9999999, сек"),
+                           ('restarts_per_gold', "Перезапусков на одну находку"),
+                           ('host_death_interval', "Между смертями хоста, сек")):
+            print(f"{title}: {self.format_quantiles(summary[key])}")
+    
+    def get_rollup_summary(self):
+        """Квантили времени поиска, перезапусков на находку и интервалов смертей хоста"""
+        with self.lock:
+            return self.rollups.get_summary()
+    
+    def get_hourly_rollups(self, hours=24):
+        """Почасовые агрегаты за последние hours часов: [(час, счетчики)]"""
+        with self.lock:
+            keys = sorted(self.rollups.hourly)[-hours:]
+            return [(key, dict(self.rollups.hourly[key])) for key in keys]
+    
+    def get_daily_rollups(self, days=7):
+        """Посуточные агрегаты за последние days дней: [(дата, счетчики)]"""
+        with self.lock:
+            keys = sorted(self.rollups.daily)[-days:]
+            return [(key, dict(self.rollups.daily[key])) for key in keys]
+    
+    @staticmethod
+    def format_quantiles(summary):
+        if not summary['count']:
+            return "нет данных"
+        return (f"{summary['p50']:.1f} / {summary['p90']:.1f} / {summary['p99']:.1f}"
+                f" (n={summary['count']})")
 
 # Глобальный экземпляр статистики
 stats = Statistics()
\ No newline at end of file
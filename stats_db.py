@@ -0,0 +1,254 @@
+# stats_db.py
+import datetime
+import json
+import os
+import threading
+from config import STATS_DB_ENABLED, STATS_DB_FILE, STATS_JOURNAL_FILE
+from persistence import persistence
+
+try:
+    import sqlite3
+    SQLITE_AVAILABLE = True
+except ImportError:
+    SQLITE_AVAILABLE = False
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_start TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER,
+    timestamp TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    death_type TEXT,
+    find_time_seconds REAL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_type_timestamp ON events (event_type, timestamp);
+CREATE TABLE IF NOT EXISTS infinite_cycles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    action TEXT NOT NULL,
+    total_entries INTEGER,
+    total_exits INTEGER,
+    total_cycles INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_infinite_cycles_timestamp ON infinite_cycles (timestamp);
+"""
+
+
+class StatsDatabase:
+    """
+    Необязательное хранилище статистики в SQLite (STATS_DB_ENABLED).
+    Таблицы сессий, событий и действий бесконечки с индексами по времени и
+    типу события - выборки за период не читают всю историю.
+    Время хранится строкой ISO (как в событиях статистики), поэтому
+    сравнение строк совпадает с сравнением времени.
+    Запись не блокирует автоматизацию: строки копятся в очереди и вставляются
+    одной транзакцией в фоновом потоке (persistence) или перед выборкой.
+    """
+    def __init__(self, db_file=STATS_DB_FILE):
+        self.db_file = db_file
+        self.lock = threading.Lock()        # Соединение с базой
+        self.queue_lock = threading.Lock()  # Очередь записи (короткие операции)
+        self.pending = []  # [(вид записи, данные, смещение в журнале)]
+        self.imported_until = None  # Смещение в журнале, до которого события импортированы в новую базу
+        self.write_count = 0  # Растет с каждой записью - кэши выборок сбрасываются по нему
+        self.connection = None
+        self.current_session_id = None
+        self.enabled = STATS_DB_ENABLED and SQLITE_AVAILABLE
+
+        if STATS_DB_ENABLED and not SQLITE_AVAILABLE:
+            print("⚠️ sqlite3 недоступен, статистика хранится только в JSON")
+
+    def get_connection(self):
+        """Соединение с базой (создается лениво, вызывается под блокировкой)"""
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.db_file) or '.', exist_ok=True)
+            is_new = not os.path.exists(self.db_file)
+
+            self.connection = sqlite3.connect(self.db_file, check_same_thread=False)
+            self.connection.row_factory = sqlite3.Row
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(SCHEMA)
+
+            if is_new:
+                self._import_journal()
+        return self.connection
+
+    def _import_journal(self):
+        """Новая база заполняется событиями из журнала статистики"""
+        if not os.path.exists(STATS_JOURNAL_FILE):
+            return
+
+        count = 0
+        offset = 0
+        with open(STATS_JOURNAL_FILE, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Строка еще дописывается - событие придет из очереди
+                offset += len(line)
+                try:
+                    event_data = json.loads(line)
+                except ValueError:
+                    continue
+                self._insert_event(event_data)
+                count += 1
+        self.connection.commit()
+        # События из очереди, уже попавшие в журнал, второй раз не вставляются
+        self.imported_until = offset
+        print(f"🗄️ В базу статистики импортировано событий из журнала: {count}")
+
+    def _insert_event(self, event_data):
+        self.connection.execute(
+            "INSERT INTO events (session_id, timestamp, event_type, death_type, find_time_seconds, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.current_session_id,
+                event_data.get('timestamp', datetime.datetime.now().isoformat()),
+                event_data.get('event_type', 'unknown'),
+                event_data.get('death_type'),
+                event_data.get('find_time_seconds'),
+                json.dumps(event_data, ensure_ascii=False)
+            )
+        )
+
+    def _execute(self, query, params=()):
+        """Выборка из базы (с учетом еще не записанных строк); при ошибке возвращает None"""
+        if not self.enabled:
+            return None
+        self.flush_pending()
+        with self.lock:
+            try:
+                return self.get_connection().execute(query, params).fetchall()
+            except Exception as e:
+                print(f"⚠️ Ошибка базы статистики: {e}")
+                return None
+
+    def _enqueue(self, kind, data, journal_offset=None):
+        """Ставит запись в очередь; вставка - в фоновом потоке при ближайшем сбросе"""
+        if not self.enabled:
+            return
+        with self.queue_lock:
+            self.pending.append((kind, data, journal_offset))
+            self.write_count += 1
+        persistence.mark_dirty(self.db_file, self.flush_pending)
+
+    def flush_pending(self):
+        """
+        Записывает накопленные строки одной транзакцией
+        Возвращает False, если запись в базу не удалась
+        """
+        with self.lock:
+            with self.queue_lock:
+                pending = self.pending
+                self.pending = []
+            if not pending:
+                return True
+
+            try:
+                self.get_connection()
+                for kind, data, journal_offset in pending:
+                    if kind == 'session':
+                        cursor = self.connection.execute(
+                            "INSERT INTO sessions (session_start) VALUES (?)", (data,))
+                        self.current_session_id = cursor.lastrowid
+                    elif kind == 'event':
+                        if (self.imported_until is not None and journal_offset is not None and
+                                journal_offset <= self.imported_until):
+                            continue  # Уже импортировано из журнала при создании базы
+                        self._insert_event(data)
+                    elif kind == 'infinite':
+                        self.connection.execute(
+                            "INSERT INTO infinite_cycles (timestamp, action, total_entries, total_exits, total_cycles) "
+                            "VALUES (?, ?, ?, ?, ?)", data)
+                self.connection.commit()
+                return True
+            except Exception as e:
+                print(f"⚠️ Ошибка записи в базу статистики: {e}")
+                return False
+
+    def journal_rotated(self):
+        """Журнал начат заново - смещения старого журнала больше не сравниваются"""
+        with self.queue_lock:
+            self.imported_until = None
+
+    def start_session(self, session_start):
+        """Запись новой сессии, дальнейшие события привязываются к ней"""
+        self._enqueue('session', session_start)
+
+    def add_event(self, event_data, journal_offset=None):
+        """journal_offset - конец строки события в журнале (для импорта новой базы)"""
+        self._enqueue('event', event_data, journal_offset)
+
+    def add_infinite_action(self, action, infinite_stats):
+        """Вход ('entry') или выход ('exit') в бесконечке со счетчиками после действия"""
+        self._enqueue('infinite', (
+            datetime.datetime.now().isoformat(),
+            action,
+            infinite_stats.get('total_entries', 0),
+            infinite_stats.get('total_exits', 0),
+            infinite_stats.get('total_cycles', 0)
+        ))
+
+    @staticmethod
+    def _since(hours):
+        return (datetime.datetime.now() - datetime.timedelta(hours=hours)).isoformat()
+
+    def count_gold_finds(self, hours=24):
+        """Сколько раз найдены 9999999 за последние hours часов"""
+        rows = self._execute(
+            "SELECT COUNT(*) FROM events WHERE event_type = 'gold_found' AND timestamp >= ?",
+            (self._since(hours),)
+        )
+        return rows[0][0] if rows else 0
+
+    def average_find_time_by_day(self, days=7):
+        """[(дата, находок, среднее время поиска)] за последние days дней"""
+        rows = self._execute(
+            "SELECT substr(timestamp, 1, 10) AS day, COUNT(*), AVG(find_time_seconds) "
+            "FROM events WHERE event_type = 'gold_found' AND timestamp >= ? "
+            "GROUP BY day ORDER BY day",
+            (self._since(days * 24),)
+        )
+        return [(row[0], row[1], row[2] or 0) for row in rows] if rows else []
+
+    def host_deaths_by_type(self, hours=None):
+        """{тип смерти: количество} за последние hours часов (None - за все время)"""
+        query = "SELECT death_type, COUNT(*) FROM events WHERE event_type = 'host_death'"
+        params = ()
+        if hours is not None:
+            query += " AND timestamp >= ?"
+            params = (self._since(hours),)
+        rows = self._execute(query + " GROUP BY death_type", params)
+        return {row[0]: row[1] for row in rows} if rows else {}
+
+    def count_infinite_cycles(self, hours=24):
+        """Сколько циклов бесконечки (выходов) за последние hours часов"""
+        rows = self._execute(
+            "SELECT COUNT(*) FROM infinite_cycles WHERE action = 'exit' AND timestamp >= ?",
+            (self._since(hours),)
+        )
+        return rows[0][0] if rows else 0
+
+    def recent_events(self, event_type, limit=5):
+        """Последние события типа event_type (старые первыми)"""
+        rows = self._execute(
+            "SELECT data FROM events WHERE event_type = ? ORDER BY timestamp DESC LIMIT ?",
+            (event_type, limit)
+        )
+        return [json.loads(row[0]) for row in reversed(rows)] if rows else []
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+# Глобальный экземпляр
+stats_db = StatsDatabase()
\ No newline at end of file
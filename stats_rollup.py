@@ -0,0 +1,166 @@
+# stats_rollup.py
+import datetime
+import math
+from config import STATS_ROLLUP_HOURS, STATS_ROLLUP_DAYS, STATS_QUANTILE_ACCURACY
+
+
+class QuantileSketch:
+    """
+    Потоковая оценка квантилей (p50/p90/p99) с относительной ошибкой accuracy.
+    Значения раскладываются по логарифмическим корзинам - память зависит только
+    от разброса значений, а не от их количества.
+    """
+    def __init__(self, accuracy=STATS_QUANTILE_ACCURACY, data=None):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}   # номер корзины -> количество значений
+        self.zero_count = 0  # значения <= 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+        if data:
+            self.buckets = {int(index): count for index, count in data.get('buckets', {}).items()}
+            self.zero_count = data.get('zero_count', 0)
+            self.count = data.get('count', 0)
+            self.total = data.get('total', 0.0)
+            self.min = data.get('min')
+            self.max = data.get('max')
+
+    def add(self, value):
+        value = float(value)
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q):
+        """Приблизительное значение квантиля q (0..1), None если значений нет"""
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """{'count', 'mean', 'p50', 'p90', 'p99', 'max'}"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'max': self.max
+        }
+
+    def to_dict(self):
+        return {
+            'buckets': {str(index): count for index, count in self.buckets.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+
+class StatsRollup:
+    """
+    Накопительные агрегаты по событиям статистики: почасовые и посуточные
+    счетчики (хранятся последние STATS_ROLLUP_HOURS часов и STATS_ROLLUP_DAYS дней)
+    и квантили времени поиска 9999999, перезапусков на одну находку и
+    интервалов между смертями хоста. Обновляются по одному событию за O(1).
+    """
+    def __init__(self, data=None):
+        data = data or {}
+        self.hourly = data.get('hourly', {})  # 'YYYY-MM-DD HH' -> счетчики
+        self.daily = data.get('daily', {})    # 'YYYY-MM-DD' -> счетчики
+        self.find_time = QuantileSketch(data=data.get('find_time'))
+        self.restarts_per_gold = QuantileSketch(data=data.get('restarts_per_gold'))
+        self.host_death_interval = QuantileSketch(data=data.get('host_death_interval'))
+        self.restarts_since_gold = data.get('restarts_since_gold', 0)
+        self.last_host_death = data.get('last_host_death')  # ISO время последней смерти хоста
+
+    @staticmethod
+    def _bump(buckets, key, limit, counters):
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {}
+            # Ключи - даты в формате ISO, старейший = минимальный
+            while len(buckets) > limit:
+                del buckets[min(buckets)]
+        for name, amount in counters.items():
+            bucket[name] = bucket.get(name, 0) + amount
+
+    def add_event(self, event_data):
+        """Учитывает событие статистики (при записи и при восстановлении из журнала)"""
+        event_type = event_data.get('event_type')
+        timestamp = event_data.get('timestamp')
+        if not timestamp:
+            return
+
+        counters = {}
+        if event_type == 'gold_found':
+            find_time_seconds = event_data.get('find_time_seconds', 0)
+            counters = {'gold_found': 1, 'find_time_total': find_time_seconds}
+            self.find_time.add(find_time_seconds)
+            self.restarts_per_gold.add(self.restarts_since_gold)
+            self.restarts_since_gold = 0
+
+        elif event_type == 'restart':
+            counters = {'restarts': 1}
+            self.restarts_since_gold += 1
+
+        elif event_type == 'host_death':
+            counters = {'host_deaths': 1}
+            if self.last_host_death:
+                try:
+                    interval = (datetime.datetime.fromisoformat(timestamp) -
+                                datetime.datetime.fromisoformat(self.last_host_death)).total_seconds()
+                    if interval >= 0:
+                        self.host_death_interval.add(interval)
+                except ValueError:
+                    pass
+            self.last_host_death = timestamp
+
+        elif event_type == 'infinite_cycle':
+            counters = {'infinite_cycles': 1}
+
+        if counters:
+            self._bump(self.hourly, timestamp[:13].replace('T', ' '), STATS_ROLLUP_HOURS, counters)
+            self._bump(self.daily, timestamp[:10], STATS_ROLLUP_DAYS, counters)
+
+    def get_summary(self):
+        """Квантили для подбора таймаутов (ACCEPT_TIMEOUT, GOLD_MONITOR_TIMEOUT и т.д.)"""
+        return {
+            'find_time': self.find_time.summary(),
+            'restarts_per_gold': self.restarts_per_gold.summary(),
+            'host_death_interval': self.host_death_interval.summary()
+        }
+
+    def to_dict(self):
+        return {
+            'hourly': self.hourly,
+            'daily': self.daily,
+            'find_time': self.find_time.to_dict(),
+            'restarts_per_gold': self.restarts_per_gold.to_dict(),
+            'host_death_interval': self.host_death_interval.to_dict(),
+            'restarts_since_gold': self.restarts_since_gold,
+            'last_host_death': self.last_host_death
+        }
\ No newline at end of file
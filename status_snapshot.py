@@ -0,0 +1,79 @@
+# status_snapshot.py
+import copy
+import threading
+import time
+from types import MappingProxyType
+
+
+class StatusSnapshot:
+    """
+    Неизменяемый снимок состояния программы для Telegram.
+    version растет при каждом изменении - по нему экраны статуса
+    понимают, нужно ли строить текст заново.
+    """
+    def __init__(self, values, version, published_at):
+        self.values = MappingProxyType(values)
+        self.version = version
+        self.published_at = published_at  # time.time() последнего изменения
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+
+class StatusBoard:
+    """
+    Табло состояния: автоматизация публикует изменения (операция, пауза,
+    детали операции, счетчики статистики), Telegram только читает снимок.
+    Публикация с теми же значениями версию не меняет. Значения копируются
+    при публикации - снимок не меняется после выдачи.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot = StatusSnapshot({
+            'paused': False,
+            'shutdown_requested': False,
+            'restart_requested': False,
+            'current_operation': "Инициализация",
+            'operation_started': time.time(),
+            'operation_details': {},
+            'session': {},         # Счетчики текущей сессии statistics
+            'stats_revision': 0    # Номер последнего события статистики
+        }, 0, time.time())
+
+    def publish(self, **changes):
+        """Обновляет значения; возвращает новую версию (или прежнюю, если ничего не изменилось)"""
+        with self.lock:
+            old_values = self.snapshot.values
+            changed = {key: copy.deepcopy(value)
+                       for key, value in changes.items()
+                       if key not in old_values or old_values[key] != value}
+            if not changed:
+                return self.snapshot.version
+
+            values = dict(old_values)
+            values.update(changed)
+            self.snapshot = StatusSnapshot(values, self.snapshot.version + 1, time.time())
+            return self.snapshot.version
+
+    def get_snapshot(self):
+        return self.snapshot
+
+    @property
+    def version(self):
+        return self.snapshot.version
+
+
+def format_duration(seconds):
+    """Длительность в стиле статуса: 45сек, 3м 12сек, 2ч 5м"""
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"{seconds}сек"
+    if seconds < 3600:
+        return f"{seconds // 60}м {seconds % 60}сек"
+    return f"{seconds // 3600}ч {seconds % 3600 // 60}м"
+
+# Глобальный экземпляр
+status_board = StatusBoard()
\ No newline at end of file
@@ -0,0 +1,134 @@
+# task_scheduler.py
+from pause_handler import pause_handler
+from frame_capture import frame_capture
+
+# Причины завершения планировщика
+TIMEOUT = 'timeout'          # Истек общий таймаут (без учета паузы)
+INTERRUPTED = 'interrupted'  # Перезапуск или завершение программы
+FINISHED = 'finished'        # Задача вернула результат
+
+
+class PeriodicTask:
+    """
+    Периодическая задача планировщика
+    period   - интервал в секундах (None - задача выполняется один раз) или функция
+               без аргументов, возвращающая интервал - читается при каждом перепланировании,
+               чтобы изменение настройки на лету сразу меняло частоту проверки
+    start    - когда выполнить впервые (секунды активного времени от начала)
+    deadline - после этого момента задача больше не выполняется (None - без ограничения)
+    priority - при одновременном сроке первой выполняется задача с меньшим значением
+    condition - функция без аргументов; если возвращает False, запуск пропускается
+    """
+    def __init__(self, name, callback, period=None, start=0, deadline=None, priority=0, condition=None):
+        self.name = name
+        self.callback = callback
+        self.period = period
+        self.next_run = start
+        self.deadline = deadline
+        self.priority = priority
+        self.condition = condition
+        self.run_count = 0
+
+    def is_expired(self, elapsed):
+        return self.deadline is not None and elapsed >= self.deadline
+
+    def get_period(self):
+        return self.period() if callable(self.period) else self.period
+
+
+class TaskScheduler:
+    """
+    Планировщик периодических проверок одного этапа (например, AFK лобби).
+    Время считается без учета паузы (pause_handler) - на паузе сроки задач
+    не наступают. Между запусками планировщик спит ровно до ближайшей задачи,
+    поэтому частота каждой проверки не зависит от длительности остальных.
+    """
+    def __init__(self, operation_name, timeout, max_sleep=1.0):
+        self.operation_name = operation_name
+        self.timeout = timeout
+        self.max_sleep = max_sleep  # Не спим дольше - чтобы вовремя заметить перезапуск/паузу
+        self.tasks = {}
+        self.start_time = None
+
+    def add_task(self, name, callback, period=None, start=0, deadline=None, priority=0, condition=None):
+        """
+        Добавляет задачу. callback(elapsed) возвращает None, чтобы продолжить,
+        или любое другое значение - тогда планировщик останавливается с этим результатом
+        """
+        self.tasks[name] = PeriodicTask(name, callback, period, start, deadline, priority, condition)
+        return self.tasks[name]
+
+    def cancel(self, name):
+        """Убирает задачу (например, стрелка уже нажата)"""
+        self.tasks.pop(name, None)
+
+    def get_elapsed(self):
+        return pause_handler.get_real_elapsed_time(self.start_time)
+
+    def _due_tasks(self, elapsed):
+        """Задачи, срок которых наступил, в порядке приоритета"""
+        due = [task for task in self.tasks.values() if task.next_run <= elapsed]
+        return sorted(due, key=lambda task: (task.priority, task.next_run))
+
+    def _reschedule(self, task, elapsed):
+        period = task.get_period()
+        if period is None:
+            self.cancel(task.name)
+            return
+
+        task.next_run += period
+        if task.next_run <= elapsed:
+            # Задача не успела (долгий OCR) - пропускаем просроченные запуски
+            task.next_run = elapsed + period
+
+    def _time_to_next(self, elapsed):
+        if not self.tasks:
+            return self.max_sleep
+        next_run = min(task.next_run for task in self.tasks.values())
+        return max(0.0, min(next_run - elapsed, self.timeout - elapsed, self.max_sleep))
+
+    def run(self):
+        """
+        Главный цикл
+        Возвращает (причина, результат, прошедшее время без учета паузы)
+        """
+        self.start_time = pause_handler.start_timer()
+
+        while True:
+            should_continue, elapsed = pause_handler.check_pause_with_real_timeout(
+                self.operation_name,
+                self.timeout,
+                self.start_time
+            )
+
+            if not should_continue:
+                if elapsed >= self.timeout:
+                    return TIMEOUT, None, elapsed
+                return INTERRUPTED, None, elapsed
+
+            due_tasks = self._due_tasks(elapsed)
+            if due_tasks:
+                # 🔥 ОДИН КАДР ЭКРАНА НА ТИК ДЛЯ ВСЕХ ДЕТЕКТОРОВ
+                frame_capture.new_tick()
+
+            for task in due_tasks:
+                if task.name not in self.tasks:
+                    continue  # Отменена задачей с более высоким приоритетом
+
+                if task.is_expired(elapsed):
+                    self.cancel(task.name)
+                    continue
+
+                if task.condition is None or task.condition():
+                    task.run_count += 1
+                    result = task.callback(elapsed)
+                    if result is not None:
+                        return FINISHED, result, elapsed
+
+                if task.name in self.tasks:
+                    self._reschedule(task, elapsed)
+
+                # Задачи могут быть долгими - обновляем время для следующих
+                elapsed = self.get_elapsed()
+
+            pause_handler.interruptible_sleep(self._time_to_next(self.get_elapsed()))
\ No newline at end of file
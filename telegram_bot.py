@@ -1,4 +1,5 @@
 # telegram_bot.py
+import ast
 import asyncio
 import re
 import shutil
@@ -16,8 +17,16 @@ import logging
 from config import INFINITE_STATS_FILE, PASS_LOBBY, LOG_FILE, PASSWORDS_FILE, STATS_FILE, TELEGRAM_ADMIN_IDS, TELEGRAM_BOT_TOKEN
 from pause_handler import pause_handler
 from statistics import stats
+from stats_db import stats_db
+from config_service import config_service
+from telegram_outbox import telegram_outbox
+from telegram_router import TelegramRouter
+from status_snapshot import status_board, format_duration
+from telegram_dashboard import status_dashboard
+from screenshot_encoder import encode_screenshot, archive_screenshot, SCREENSHOT_EXTENSIONS
 from logger import Logger
 from pet_manager import PetManager
+from frame_capture import frame_capture
 
 # Настройка логирования для бота
 logging.basicConfig(
@@ -26,6 +35,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Настройки, которые можно менять из Telegram на лету (без перезапуска программы)
+# Настройки, которые можно менять из Telegram: ключ -> (тип значения, допустим ли 0)
+# Интервалы строго больше 0: при 0 задачи планировщика крутятся без пауз
+LIVE_CONFIG_KEYS = {
+    'FRAME_MONITOR_INTERVAL': (float, False),
+    'INFINITE_ATTEMPT_INTERVAL': (float, False),
+    'INFINITE_COLOR_TOLERANCE': (int, True),
+    'INFINITE_AFTER_PRESS_DELAY': (float, True),
+    'REFRESH_INTERVAL': (float, False),
+    'SEARCH_INTERVAL': (float, False),
+    'CLICK_INTERVAL': (float, False)
+}
+
 class TelegramBotManager:
     def __init__(self, main_program=None):
         self.bot = None
@@ -36,6 +58,7 @@ class TelegramBotManager:
         self.saved_passwords = self.load_passwords()
         self.logger = Logger()
         self.pet_manager = PetManager(logger)
+        self.rendered_screens = {}  # экран -> (версия снимка табло статуса, текст)
         
         # Проверяем наличие токена
         if not TELEGRAM_BOT_TOKEN:
@@ -106,65 +129,6 @@ class TelegramBotManager:
             parse_mode='HTML'
         )
     
-    def pet_settings_menu(self, chat_id, pet_id):
-        """Меню настроек конкретного питомца"""
-        if pet_id not in self.pet_manager.pets:
-            self.bot.send_message(chat_id, "❌ Питомец не найден")
-            return
-        
-        # 🔥 ВСЕГДА ОБНОВЛЯЕМ СОСТОЯНИЕ С ТЕКУЩИМ PET_ID
-        self.user_state[chat_id] = {
-            'pet_id': pet_id,
-            'action': 'pet_settings'
-        }
-        
-        pet = self.pet_manager.pets[pet_id]
-        
-        markup = types.ReplyKeyboardMarkup(row_width=2, resize_keyboard=True)
-        
-        # 🔥 ИСПРАВЛЯЕМ ТЕКСТ КНОПОК
-        delay_text = f"⏱️ Задержка ({pet.get('click_delay', 2.0)}сек)"
-        
-        buttons = [
-            delay_text,
-            "🎯 Добавить триггер",
-            "📋 Триггеры",
-            "🐾 Переключить сейчас",
-            "⬅️ Назад к питомцам"
-        ]
-        
-        # Распределяем кнопки по рядам
-        row1 = buttons[:2]
-        row2 = buttons[2:4]
-        row3 = buttons[4:]
-        
-        markup.add(*[types.KeyboardButton(btn) for btn in row1])
-        markup.add(*[types.KeyboardButton(btn) for btn in row2])
-        markup.add(*[types.KeyboardButton(btn) for btn in row3])
-        
-        # Информация о триггерах
-        triggers_info = ""
-        triggers = pet.get('infinite_triggers', [])
-        if triggers:
-            triggers_info = "\n📋 *Триггеры бесконечки:*\n"
-            for trigger in triggers:
-                enabled = "✅" if trigger.get('enabled', True) else "❌"
-                triggers_info += f"{enabled} {trigger.get('cycles')} циклов\n"
-        else:
-            triggers_info = "\nℹ️ *Триггеры не настроены*"
-        
-        self.bot.send_message(
-            chat_id,
-            f"⚙️ *Настройки питомца: {pet['name']}*\n\n"
-            f"🐾 *ID:* `{pet_id}`\n"
-            f"⏱️ *Задержка между кликами:* {pet.get('click_delay', 2.0)} сек\n"
-            f"🖱️ *Кликов настроено:* {len(pet.get('clicks', []))}/5\n"
-            f"{triggers_info}\n\n"
-            f"Выберите действие:",
-            reply_markup=markup,
-            parse_mode='Markdown'
-        )
-
     def add_infinite_trigger_dialog(self, chat_id, pet_id):
         """Диалог добавления триггера бесконечки"""
         self.user_state[chat_id] = {
@@ -322,50 +286,6 @@ class TelegramBotManager:
             parse_mode='Markdown'
         )
     
-    def record_positions_menu(self, chat_id):
-        """Меню записи позиций для питомца"""
-        pets = self.pet_manager.get_pet_list()
-        
-        if not pets:
-            self.bot.send_message(
-                chat_id,
-                "❌ *Нет питомцев для записи*\n\n"
-                "Сначала создайте питомца через меню 'Новый питомец'.",
-                parse_mode='Markdown'
-            )
-            return
-        
-        markup = types.InlineKeyboardMarkup(row_width=1)
-        
-        for pet_id, pet_data in pets.items():
-            click_count = len(pet_data.get('clicks', []))
-            if click_count < 5:  # Только питомцы с незаполненными кликами
-                button_text = f"{pet_data['name']} ({click_count}/5 кликов)"
-                button = types.InlineKeyboardButton(
-                    text=button_text,
-                    callback_data=f"record_pet_{pet_id}"
-                )
-                markup.add(button)
-        
-        if markup.keyboard:  # Если есть кнопки
-            self.bot.send_message(
-                chat_id,
-                "🎯 *Запись позиций для питомца*\n\n"
-                "Выберите питомца для записи позиций:\n"
-                "• Подведите мышь к нужной позиции на экране\n"
-                "• Нажмите кнопку с питомцем\n"  # 🔥 ИСПРАВЛЕНО: кавычки
-                "• Система запишет текущую позицию мыши",
-                reply_markup=markup,
-                parse_mode='Markdown'
-            )
-        else:
-            self.bot.send_message(
-                chat_id,
-                "✅ *Все питомцы настроены*\n\n"
-                "У всех питомцев уже есть 5 кликов.",
-                parse_mode='Markdown'
-            )
-
     def save_passwords(self):
         """Сохранение паролей"""
         try:
@@ -381,9 +301,12 @@ class TelegramBotManager:
         """Настройка бота и команд"""
         try:
             self.bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN, parse_mode=None)
+            telegram_outbox.attach(self.bot)
+            status_dashboard.attach(self.bot)
             print("✅ Telegram бот инициализирован")
             
-            # Регистрация команд
+            # Регистрация команд и таблиц обработчиков
+            self.setup_routes()
             self.setup_commands()
             
         except Exception as e:
@@ -403,6 +326,7 @@ class TelegramBotManager:
     *Доступные команды:*
     /start - Главное меню
     /status - Статус программы  
+    /live - Живой статус (закрепленное сообщение)
     /statistics - Статистика
     /restart - Перезапуск программы
     /password - Управление паролями
@@ -430,6 +354,12 @@ class TelegramBotManager:
                 return
             self.send_status_info(message.chat.id)
         
+        @self.bot.message_handler(commands=['live'])
+        def live_status(message):
+            if not self.check_auth(message):
+                return
+            self.toggle_status_dashboard(message.chat.id)
+        
         # 🔥 ДОБАВЛЯЕМ НОВУЮ КОМАНДУ
         @self.bot.message_handler(commands=['cleanup'])
         def cleanup_command(message):
@@ -520,298 +450,12 @@ class TelegramBotManager:
         def handle_callback_query(call):
             print(f"🔄 Callback получен: {call.data}")
             
-            chat_id = call.message.chat.id
-            
-            # 🔥 ОБРАБОТКА ОЧИСТКИ
-            if call.data == "clean_infinite_confirm":
-                self.clean_infinite_stats(chat_id)
-                self.bot.answer_callback_query(call.id, "Статистика очищена")
-                
-                # Удаляем inline-кнопки
-                try:
-                    self.bot.edit_message_reply_markup(
-                        chat_id=chat_id,
-                        message_id=call.message.message_id,
-                        reply_markup=None
-                    )
-                except:
-                    pass
-                
-            elif call.data.startswith("use_password_"):
-                password_name = call.data.replace("use_password_", "")
-                self.use_saved_password(call.message.chat.id, password_name)
-                self.bot.answer_callback_query(call.id, "Пароль установлен")
-
-            # Также добавьте обработку delete_password_
-            elif call.data.startswith("delete_password_"):
-                password_name = call.data.replace("delete_password_", "")
-                self.delete_password(call.message.chat.id, password_name)
-                self.bot.answer_callback_query(call.id, "Пароль удален")
-
-            elif call.data.startswith("toggle_trigger_"):
-                parts = call.data.replace("toggle_trigger_", "").split("_")
-                if len(parts) >= 2:
-                    pet_id = parts[0]
-                    try:
-                        cycles = int(parts[1])
-                        
-                        # Находим и переключаем триггер
-                        pet = self.pet_manager.pets.get(pet_id)
-                        if pet:
-                            triggers = pet.get('infinite_triggers', [])
-                            for trigger in triggers:
-                                if trigger.get('cycles') == cycles:
-                                    trigger['enabled'] = not trigger.get('enabled', True)
-                                    self.pet_manager.save_pets()
-                                    
-                                    status = "включен" if trigger['enabled'] else "выключен"
-                                    self.bot.answer_callback_query(
-                                        call.id, 
-                                        f"Триггер {status}"
-                                    )
-                                    
-                                    # Обновляем сообщение
-                                    self.show_pet_triggers(call.message.chat.id, pet_id)
-                                    break
-                    except ValueError:
-                        self.bot.answer_callback_query(call.id, "❌ Ошибка")
-
-            elif call.data.startswith("delete_trigger_"):
-                parts = call.data.replace("delete_trigger_", "").split("_")
-                if len(parts) >= 2:
-                    pet_id = parts[0]
-                    try:
-                        cycles = int(parts[1])
-                        
-                        # Удаляем триггер
-                        success, message = self.pet_manager.remove_infinite_trigger(pet_id, cycles)
-                        
-                        if success:
-                            self.bot.answer_callback_query(call.id, "✅ Удалено")
-                            self.show_pet_triggers(call.message.chat.id, pet_id)
-                        else:
-                            self.bot.answer_callback_query(call.id, "❌ Не удалось удалить")
-                    except ValueError:
-                        self.bot.answer_callback_query(call.id, "❌ Ошибка")
-
-            elif call.data.startswith("add_trigger_"):
-                pet_id = call.data.replace("add_trigger_", "")
-                
-                # Показываем диалог добавления триггера
-                self.user_state[call.message.chat.id] = {
-                    'action': 'waiting_trigger_cycles',
-                    'pet_id': pet_id
-                }
-                
-                self.bot.send_message(
-                    call.message.chat.id,
-                    "🎯 *Добавление триггера бесконечки*\n\n"
-                    "Введите количество циклов бесконечки для срабатывания триггера:\n\n"
-                    "Пример: 30 (переключится при 30+ циклах)\n"
-                    "Пример: 100 (переключится при 100+ циклах)",
-                    parse_mode='Markdown'
-                )
-                self.bot.answer_callback_query(call.id)
-                    
-            elif call.data == "clean_infinite_cancel":
-                self.bot.answer_callback_query(call.id, "Отменено")
-                
-                # Обновляем сообщение
-                try:
-                    self.bot.edit_message_text(
-                        "❌ Очистка статистики отменена",
-                        chat_id=chat_id,
-                        message_id=call.message.message_id
-                    )
-                except:
-                    self.bot.send_message(chat_id, "❌ Очистка статистики отменена")
-
-            elif call.data.startswith("pet_settings_"):
-                pet_id = call.data.replace("pet_settings_", "")
-                
-                # Сохраняем pet_id в состояние пользователя
-                self.user_state[call.message.chat.id] = {
-                    'pet_id': pet_id,
-                    'action': 'pet_settings'
-                }
-                
-                # Показываем меню настроек
-                self.pet_settings_menu(call.message.chat.id, pet_id)
-                self.bot.answer_callback_query(call.id, "Настройки питомца")
-            elif call.data.startswith("delete_pet_"):
-                pet_id = call.data.replace("delete_pet_", "")
-                
-                # Подтверждение удаления
-                markup = types.InlineKeyboardMarkup()
-                confirm_btn = types.InlineKeyboardButton(
-                    text="✅ Да, удалить",
-                    callback_data=f"confirm_delete_pet_{pet_id}"
-                )
-                cancel_btn = types.InlineKeyboardButton(
-                    text="❌ Нет, отмена",
-                    callback_data=f"cancel_delete_pet_{pet_id}"
-                )
-                markup.add(confirm_btn, cancel_btn)
-                
-                pet_name = self.pet_manager.pets.get(pet_id, {}).get('name', 'Неизвестный')
-                
-                self.bot.edit_message_text(
-                    f"⚠️ <b>Подтверждение удаления</b>\n\n"
-                    f"Вы действительно хотите удалить питомца?\n\n"
-                    f"🐾 <b>Имя:</b> {pet_name}\n"
-                    f"📝 <b>ID:</b> <code>{pet_id}</code>\n\n"
-                    f"Это действие нельзя отменить!",
-                    chat_id=call.message.chat.id,
-                    message_id=call.message.message_id,
-                    reply_markup=markup,
-                    parse_mode='HTML'
-                )
-                self.bot.answer_callback_query(call.id)
-
-            elif call.data.startswith("switch_pet_"):
-                pet_id = call.data.replace("switch_pet_", "")
-                success, message = self.pet_manager.switch_to_pet(pet_id)
-                
-                if success:
-                    self.bot.answer_callback_query(call.id, "✅ Переключено")
-                    pet_name = self.pet_manager.pets.get(pet_id, {}).get('name', 'Неизвестный')
-                    self.bot.send_message(
-                        call.message.chat.id,
-                        f"✅ <b>Переключение успешно!</b>\n\n"
-                        f"Переключились на питомца: <b>{pet_name}</b>\n"
-                        f"{message}",
-                        parse_mode='HTML'
-                    )
-                else:
-                    self.bot.answer_callback_query(call.id, "❌ Ошибка")
-                    self.bot.send_message(
-                        call.message.chat.id,
-                        f"❌ <b>Ошибка переключения:</b>\n\n{message}",
-                        parse_mode='HTML'
-                    )
-
-            elif call.data.startswith("confirm_delete_pet_"):
-                pet_id = call.data.replace("confirm_delete_pet_", "")
-                
-                success, message = self.pet_manager.delete_pet(pet_id)
-                
-                if success:
-                    self.bot.answer_callback_query(call.id, "✅ Удалено")
-                    # Обновляем сообщение
-                    try:
-                        self.bot.edit_message_text(
-                            f"✅ <b>Питомец удален!</b>\n\n{message}",
-                            chat_id=call.message.chat.id,
-                            message_id=call.message.message_id,
-                            parse_mode='HTML'
-                        )
-                    except:
-                        self.bot.send_message(
-                            call.message.chat.id,
-                            f"✅ <b>Питомец удален!</b>\n\n{message}",
-                            parse_mode='HTML'
-                        )
-                else:
-                    self.bot.answer_callback_query(call.id, "❌ Ошибка")
-                    self.bot.send_message(
-                        call.message.chat.id,
-                        f"❌ <b>Ошибка:</b> {message}",
-                        parse_mode='HTML'
-                    )
-
-            elif call.data.startswith("cancel_delete_pet_"):
-                pet_id = call.data.replace("cancel_delete_pet_", "")
-                self.bot.answer_callback_query(call.id, "❌ Отменено")
-                
-                # Возвращаемся к списку питомцев
-                self.show_pet_list(call.message.chat.id)
-
-            elif call.data == "clean_screenshots_confirm":
-                self.clean_screenshots(chat_id)
-                self.bot.answer_callback_query(call.id, "Скриншоты очищены")
-                
-                try:
-                    self.bot.edit_message_reply_markup(
-                        chat_id=chat_id,
-                        message_id=call.message.message_id,
-                        reply_markup=None
-                    )
-                except:
-                    pass
-                
-            elif call.data == "clean_screenshots_cancel":
-                self.bot.answer_callback_query(call.id, "Отменено")
-                
-                try:
-                    self.bot.edit_message_text(
-                        "❌ Очистка скриншотов отменена",
-                        chat_id=chat_id,
-                        message_id=call.message.message_id
-                    )
-                except:
-                    self.bot.send_message(chat_id, "❌ Очистка скриншотов отменена")
-            
-            elif call.data == "clean_all_confirm":
-                self.clean_all_data(chat_id)
-                self.bot.answer_callback_query(call.id, "Все данные очищены")
-                
-                try:
-                    self.bot.edit_message_reply_markup(
-                        chat_id=chat_id,
-                        message_id=call.message.message_id,
-                        reply_markup=None
-                    )
-                except:
-                    pass
-                
-            elif call.data == "clean_all_cancel":
-                self.bot.answer_callback_query(call.id, "Отменено")
-                
-                try:
-                    self.bot.edit_message_text(
-                        "❌ Полная очистка отменена",
-                        chat_id=chat_id,
-                        message_id=call.message.message_id
-                    )
-                except:
-                    self.bot.send_message(chat_id, "❌ Полная очистка отменена")
-
-            elif call.data.startswith("record_pet_"):
-                pet_id = call.data.replace("record_pet_", "")
-                
-                # Запрашиваем описание для клика
-                pet = self.pet_manager.pets.get(pet_id, {})
-                current_clicks = len(pet.get('clicks', []))
-                click_number = current_clicks + 1
-                
-                # Сохраняем состояние
-                self.user_state[call.message.chat.id] = {
-                    'action': 'recording_position',
-                    'pet_id': pet_id,
-                    'click_number': click_number
-                }
-                
-                self.bot.send_message(
-                    call.message.chat.id,
-                    f"🎯 <b>Запись позиции #{click_number}</b>\n\n"
-                    f"Питомец: <b>{pet.get('name', 'Неизвестный')}</b>\n\n"
-                    f"1. Подведите мышь к нужной позиции на экране\n"
-                    f"2. Введите описание для этой позиции\n"
-                    f"   Например: 'Кнопка выбора', 'Меню навыков'",
-                    parse_mode='HTML'
-                )
-                self.bot.answer_callback_query(call.id)
-            # 🔥 ОБРАБОТКА ПИТОМЦЕВ (если нужно)
-            elif call.data.startswith("switch_pet_"):
-                pet_id = call.data.replace("switch_pet_", "")
-                success, message = self.pet_manager.switch_to_pet(pet_id)
-                
-                if success:
-                    self.bot.answer_callback_query(call.id, "✅ Переключено")
-                    self.bot.send_message(chat_id, f"✅ {message}")
-                else:
-                    self.bot.answer_callback_query(call.id, "❌ Ошибка")
-                    self.bot.send_message(chat_id, f"❌ {message}")
+            # 🔥 ОДИН ПОИСК В ТАБЛИЦЕ ВМЕСТО ЦЕПОЧКИ ПРОВЕРОК
+            handler, argument = self.callback_routes.resolve(call.data)
+            if handler is None:
+                print(f"⚠️ Неизвестный callback: {call.data}")
+                return
+            handler(call, argument)
 
         # 🔥 ВАЖНО: Этот обработчик должен быть ПОСЛЕДНИМ
         @self.bot.message_handler(func=lambda message: True)
@@ -825,175 +469,409 @@ class TelegramBotManager:
             
             print(f"🤖 Получено сообщение: '{text}' от {chat_id}")
             
-            # 🔥 ПРОВЕРЯЕМ СОСТОЯНИЕ ПОЛЬЗОВАТЕЛЯ С ЗАЩИТОЙ ОТ None
+            # 🔥 ЕСЛИ ЖДЕМ ВВОДА В ДИАЛОГЕ - ОБРАБАТЫВАЕМ ЕГО
             state = self.user_state.get(chat_id)
-            
-            # 🔥 ЕСЛИ ЕСТЬ СОСТОЯНИЕ - ОБРАБАТЫВАЕМ ЕГО
             if state:
-                action = state.get('action')
-                
-                if action == 'waiting_pet_id':
-                    self.handle_pet_id_input(chat_id, text)
-                    return
-                elif action == 'waiting_pet_name':
-                    self.handle_pet_name_input(chat_id, text, state.get('pet_id'))
-                    return
-                elif action == 'recording_position':
-                    self.handle_position_recording(chat_id, text, state)
-                    return
-                elif action == 'waiting_password':
-                    self.handle_new_password(chat_id, text)
-                    return
-                elif action == 'waiting_password_name':
-                    self.handle_password_name(chat_id, text)
-                    return
-                elif action == 'waiting_trigger_cycles':
-                    pet_id = state.get('pet_id')
-                    self.handle_trigger_cycles_input(chat_id, text, pet_id)
-                    return
-                elif action == 'waiting_click_delay':
-                    pet_id = state.get('pet_id')
-                    self.handle_click_delay_input(chat_id, text, pet_id)
+                dialog_handler = self.dialog_handlers.get(state.get('action'))
+                if dialog_handler is not None:
+                    dialog_handler(chat_id, text, state)
                     return
             
-            # 🔥 ОБРАБОТКА КНОПОК МЕНЮ ПИТОМЦЕВ
-            if text == "🐾 Питомцы":
-                self.pets_menu(chat_id)
-                return
-            elif text == "📋 Список питомцев":
-                self.show_pet_list(chat_id)
-                return
-            elif text == "➕ Новый питомец":
-                self.add_new_pet(chat_id)
-                return
-            elif text == "🎯 Записать позиции":
-                self.record_positions_menu(chat_id)
-                return
-            elif text == "🐾 Переключить питомца":
-                self.show_pet_list(chat_id)
-                return
-            elif text.startswith("⚙️ Настройки "):
-                # Извлекаем ID питомца из текста
-                pet_id = text.replace("⚙️ Настройки ", "").strip()
-                # Сохраняем pet_id в состояние
-                self.user_state[chat_id] = {
-                    'pet_id': pet_id,
-                    'action': 'pet_settings'
-                }
-                self.pet_settings_menu(chat_id, pet_id)
-                return
-            
-            # 🔥 ОБРАБОТКА ОСТАЛЬНЫХ КНОПОК МЕНЮ
-            if text == "📱 Статус":
-                self.send_status_info(chat_id)
-            elif text == "📊 Статистика":
-                self.send_statistics_info(chat_id)
-            elif text == "🎮 Управление":
-                self.show_control_menu(chat_id)
-            elif text == "🔐 Пароли":
-                self.show_password_menu(chat_id)
-            elif text == "🧹 Очистка":
-                self.cleanup_menu(chat_id)
-            elif text == "🔄 Перезапуск":
-                self.restart_program_command(chat_id)
-            elif text == "⚙️ Настройки":
-                self.show_settings_menu(chat_id)
-            elif text == "📸 Скриншот":
-                self.take_screenshot_command_handler(chat_id)
-            elif text == "⌨️ Раскладка":
-                self.keyboard_layout_menu(chat_id)
-            elif text == "⏸️ Пауза":
-                self.pause_program_command(chat_id)
-            elif text == "▶️ Продолжить":
-                self.resume_program_command(chat_id)
-            elif text == "🛑 Остановить":
-                self.stop_program_command(chat_id)
-            elif text == "🚀 Запустить":
-                self.start_program_command(chat_id)
-            elif text == "⬅️ Назад":
+            handler, argument = self.message_routes.resolve(text)
+            if handler is not None:
+                handler(chat_id, argument)
+            elif text and len(text) > 1:
+                # 🔥 ЕСЛИ НЕ РАСПОЗНАЛИ КОМАНДУ - ПОКАЗЫВАЕМ МЕНЮ
+                self.bot.send_message(
+                    chat_id,
+                    f"❓ Неизвестная команда: '{text}'\n\n"
+                    "Используйте меню или команды ниже 👇",
+                    parse_mode='Markdown'
+                )
                 self.send_main_menu(chat_id)
-            elif text == "📋 Список паролей":
-                self.show_saved_passwords(chat_id)
-            elif text == "➕ Новый пароль":
-                self.ask_for_password(chat_id)
-            elif text in ["🧹 Очистить статистику бесконечки", 
-                        "📸 Очистить скриншоты", 
-                        "🗑️ Очистить всё"]:
-                self.handle_cleanup_commands(chat_id, text)
-            elif text in ["⌨️ Проверить раскладку", 
-                        "🇬🇧 Переключить на английскую", 
-                        "🇬🇧 Переключить на русскую"]:
-                self.handle_keyboard_layout_commands(chat_id, text)
-            elif text in ["⏱️ Задержка", 
-              "🎯 Добавить триггер", 
-              "📋 Триггеры", 
-              "🐾 Переключить сейчас",
-              "⬅️ Назад к питомцам"]:
-                # 🔥 ОБРАБОТКА КНОПОК НАСТРОЕК ПИТОМЦА
-                if chat_id in self.user_state and 'pet_id' in self.user_state[chat_id]:
-                    pet_id = self.user_state[chat_id]['pet_id']
-                    
-                    if text == "⏱️ Задержка":
-                        self.set_click_delay_dialog(chat_id, pet_id)
-                    elif text == "🎯 Добавить триггер":
-                        self.add_infinite_trigger_dialog(chat_id, pet_id)
-                    elif text == "📋 Триггеры":
-                        self.show_pet_triggers(chat_id, pet_id)
-                    elif text == "🐾 Переключить сейчас":
-                        success, message = self.pet_manager.switch_to_pet(pet_id)
-                        if success:
-                            self.bot.send_message(chat_id, f"✅ {message}")
-                        else:
-                            self.bot.send_message(chat_id, f"❌ {message}")
-                    elif text == "⬅️ Назад к питомцам":
-                        # 🔥 ОЧИЩАЕМ СОСТОЯНИЕ ПЕРЕД ВОЗВРАТОМ
-                        if chat_id in self.user_state:
-                            # Оставляем только минимальную информацию, если нужно
-                            del self.user_state[chat_id]
-                        self.pets_menu(chat_id)
+
+    def setup_routes(self):
+        """Таблицы обработчиков: кнопки меню, callback-запросы и диалоги"""
+        self.message_routes = TelegramRouter(' ')
+        self.callback_routes = TelegramRouter('_')
+        
+        # 🔥 КНОПКИ МЕНЮ, КОТОРЫМ НУЖЕН ТОЛЬКО CHAT_ID
+        menu_buttons = {
+            "🐾 Питомцы": self.pets_menu,
+            "📋 Список питомцев": self.show_pet_list,
+            "➕ Новый питомец": self.add_new_pet,
+            "🎯 Записать позиции": self.record_positions_menu,
+            "🐾 Переключить питомца": self.show_pet_list,
+            "📱 Статус": self.send_status_info,
+            "📌 Живой статус": self.toggle_status_dashboard,
+            "📊 Статистика": self.send_statistics_info,
+            "🎮 Управление": self.show_control_menu,
+            "🔐 Пароли": self.show_password_menu,
+            "🧹 Очистка": self.cleanup_menu,
+            "🔄 Перезапуск": self.restart_program_command,
+            "⚙️ Настройки": self.show_settings_menu,
+            "📸 Скриншот": self.take_screenshot_command_handler,
+            "⌨️ Раскладка": self.keyboard_layout_menu,
+            "🎛️ Интервалы": self.show_live_config_menu,
+            "⏸️ Пауза": self.pause_program_command,
+            "▶️ Продолжить": self.resume_program_command,
+            "🛑 Остановить": self.stop_program_command,
+            "🚀 Запустить": self.start_program_command,
+            "⬅️ Назад": self.send_main_menu,
+            "📋 Список паролей": self.show_saved_passwords,
+            "➕ Новый пароль": self.ask_for_password
+        }
+        for text, method in menu_buttons.items():
+            self.message_routes.add(text, lambda chat_id, _text, method=method: method(chat_id))
+        
+        # 🔥 ГРУППЫ КНОПОК С ОБЩИМ ОБРАБОТЧИКОМ (получает текст кнопки)
+        for text in ["🧹 Очистить статистику бесконечки", "📸 Очистить скриншоты", "🗑️ Очистить всё"]:
+            self.message_routes.add(text, self.handle_cleanup_commands)
+        for text in ["⌨️ Проверить раскладку", "🇬🇧 Переключить на английскую", "🇬🇧 Переключить на русскую"]:
+            self.message_routes.add(text, self.handle_keyboard_layout_commands)
+        for text in ["⏱️ Задержка", "🎯 Добавить триггер", "📋 Триггеры",
+                     "🐾 Переключить сейчас", "⬅️ Назад к питомцам"]:
+            self.message_routes.add(text, self.handle_pet_settings_button)
+        self.message_routes.add_prefix("⚙️ Настройки ", self.open_pet_settings)
+        
+        # 🔥 ДИАЛОГИ: действие из user_state -> обработчик ввода
+        self.dialog_handlers = {
+            'waiting_pet_id': lambda chat_id, text, state: self.handle_pet_id_input(chat_id, text),
+            'waiting_pet_name': lambda chat_id, text, state: self.handle_pet_name_input(chat_id, text, state.get('pet_id')),
+            'recording_position': self.handle_position_recording,
+            'waiting_password': lambda chat_id, text, state: self.handle_new_password(chat_id, text),
+            'waiting_password_name': lambda chat_id, text, state: self.handle_password_name(chat_id, text),
+            'waiting_trigger_cycles': lambda chat_id, text, state: self.handle_trigger_cycles_input(chat_id, text, state.get('pet_id')),
+            'waiting_click_delay': lambda chat_id, text, state: self.handle_click_delay_input(chat_id, text, state.get('pet_id')),
+            'waiting_config_value': lambda chat_id, text, state: self.handle_config_value_input(chat_id, text, state.get('config_key'))
+        }
+        
+        # 🔥 CALLBACK-ЗАПРОСЫ
+        cleanup_actions = {
+            'clean_infinite': (self.clean_infinite_stats, "Статистика очищена", "❌ Очистка статистики отменена"),
+            'clean_screenshots': (self.clean_screenshots, "Скриншоты очищены", "❌ Очистка скриншотов отменена"),
+            'clean_all': (self.clean_all_data, "Все данные очищены", "❌ Полная очистка отменена")
+        }
+        for name, (action, done_text, cancel_text) in cleanup_actions.items():
+            self.callback_routes.add(
+                f"{name}_confirm",
+                lambda call, _data, action=action, done_text=done_text: self.callback_cleanup_confirm(call, action, done_text)
+            )
+            self.callback_routes.add(
+                f"{name}_cancel",
+                lambda call, _data, cancel_text=cancel_text: self.callback_cleanup_cancel(call, cancel_text)
+            )
+        
+        self.callback_routes.add("delete_password_menu", self.callback_delete_password_menu)
+        self.callback_routes.add("cancel_delete", self.callback_cancel_delete)
+        self.callback_routes.add("confirm_stop", self.callback_confirm_stop)
+        self.callback_routes.add("cancel_stop", self.callback_cancel_stop)
+        self.callback_routes.add_prefix("use_password_", self.callback_use_password)
+        self.callback_routes.add_prefix("delete_password_", self.callback_delete_password)
+        self.callback_routes.add_prefix("toggle_trigger_", self.callback_toggle_trigger)
+        self.callback_routes.add_prefix("delete_trigger_", self.callback_delete_trigger)
+        self.callback_routes.add_prefix("add_trigger_", self.callback_add_trigger)
+        self.callback_routes.add_prefix("pet_settings_", self.callback_pet_settings)
+        self.callback_routes.add_prefix("delete_pet_", self.callback_delete_pet)
+        self.callback_routes.add_prefix("confirm_delete_pet_", self.callback_confirm_delete_pet)
+        self.callback_routes.add_prefix("cancel_delete_pet_", self.callback_cancel_delete_pet)
+        self.callback_routes.add_prefix("switch_pet_", self.callback_switch_pet)
+        self.callback_routes.add_prefix("record_pet_", self.callback_record_pet)
+        self.callback_routes.add_prefix("live_config_", self.callback_live_config)
+
+    def handle_pet_settings_button(self, chat_id, text):
+        """Кнопки меню настроек питомца (питомец берется из состояния пользователя)"""
+        if chat_id in self.user_state and 'pet_id' in self.user_state[chat_id]:
+            pet_id = self.user_state[chat_id]['pet_id']
+            
+            if text == "⏱️ Задержка":
+                self.set_click_delay_dialog(chat_id, pet_id)
+            elif text == "🎯 Добавить триггер":
+                self.add_infinite_trigger_dialog(chat_id, pet_id)
+            elif text == "📋 Триггеры":
+                self.show_pet_triggers(chat_id, pet_id)
+            elif text == "🐾 Переключить сейчас":
+                success, message = self.pet_manager.switch_to_pet(pet_id)
+                if success:
+                    self.bot.send_message(chat_id, f"✅ {message}")
                 else:
-                    # 🔥 ЕСЛИ НЕТ PET_ID, ПРОСТО ПОКАЗЫВАЕМ МЕНЮ ПИТОМЦЕВ
-                    if text == "⬅️ Назад к питомцам":
-                        self.pets_menu(chat_id)
-                    else:
-                        self.bot.send_message(chat_id, "❌ Сначала выберите питомца")
+                    self.bot.send_message(chat_id, f"❌ {message}")
+            elif text == "⬅️ Назад к питомцам":
+                # 🔥 ОЧИЩАЕМ СОСТОЯНИЕ ПЕРЕД ВОЗВРАТОМ
+                del self.user_state[chat_id]
+                self.pets_menu(chat_id)
+        else:
+            # 🔥 ЕСЛИ НЕТ PET_ID, ПРОСТО ПОКАЗЫВАЕМ МЕНЮ ПИТОМЦЕВ
+            if text == "⬅️ Назад к питомцам":
+                self.pets_menu(chat_id)
             else:
-                # 🔥 ЕСЛИ НЕ РАСПОЗНАЛИ КОМАНДУ, ПРОБУЕМ КАК ПАРОЛЬ ИЛИ ДРУГОЕ
-                if text and len(text) > 1:
-                    # Возможно, это пароль
-                    self.bot.send_message(
-                        chat_id,
-                        f"❓ Неизвестная команда: '{text}'\n\n"
-                        "Используйте меню или команды ниже 👇",
-                        parse_mode='Markdown'
-                    )
-                    self.send_main_menu(chat_id)
-    
-    def show_settings_menu(self, chat_id):
-        """Меню настроек"""
-        markup = types.ReplyKeyboardMarkup(row_width=2, resize_keyboard=True)
+                self.bot.send_message(chat_id, "❌ Сначала выберите питомца")
+
+    def open_pet_settings(self, chat_id, pet_id):
+        """Кнопка '⚙️ Настройки <id питомца>'"""
+        pet_id = pet_id.strip()
+        self.user_state[chat_id] = {
+            'pet_id': pet_id,
+            'action': 'pet_settings'
+        }
+        self.pet_settings_menu(chat_id, pet_id)
+
+    def callback_cleanup_confirm(self, call, action, done_text):
+        """Подтверждение очистки: выполняем и убираем inline-кнопки"""
+        chat_id = call.message.chat.id
+        action(chat_id)
+        self.bot.answer_callback_query(call.id, done_text)
         
-        buttons = [
-            "🐾 Питомцы",
-            "🧹 Очистка",
-            "⌨️ Раскладка",
-            "⬅️ Назад"
-        ]
+        try:
+            self.bot.edit_message_reply_markup(
+                chat_id=chat_id,
+                message_id=call.message.message_id,
+                reply_markup=None
+            )
+        except:
+            pass
+
+    def callback_cleanup_cancel(self, call, cancel_text):
+        """Отмена очистки: заменяем текст сообщения"""
+        chat_id = call.message.chat.id
+        self.bot.answer_callback_query(call.id, "Отменено")
+        
+        try:
+            self.bot.edit_message_text(
+                cancel_text,
+                chat_id=chat_id,
+                message_id=call.message.message_id
+            )
+        except:
+            self.bot.send_message(chat_id, cancel_text)
+
+    def callback_use_password(self, call, password_name):
+        self.use_saved_password(call.message.chat.id, password_name)
+        self.bot.answer_callback_query(call.id, "Пароль установлен")
+
+    def callback_delete_password(self, call, password_name):
+        self.delete_password(call.message.chat.id, password_name)
+        self.bot.answer_callback_query(call.id, "Пароль удален")
+
+    def callback_delete_password_menu(self, call, _data):
+        self.show_delete_password_menu(call.message.chat.id)
+        self.bot.answer_callback_query(call.id)
+
+    def callback_cancel_delete(self, call, _data):
+        self.bot.answer_callback_query(call.id, "Отменено")
+        try:
+            self.bot.edit_message_text(
+                "❌ Удаление пароля отменено",
+                chat_id=call.message.chat.id,
+                message_id=call.message.message_id
+            )
+        except:
+            pass
+
+    def callback_confirm_stop(self, call, _data):
+        pause_handler.request_shutdown()
+        self.logger.log_event("TG_CONTROL", "Остановка подтверждена из Telegram")
+        self.bot.answer_callback_query(call.id, "Остановка")
+        
+        self.bot.edit_message_text(
+            "🛑 *ПРОГРАММА ОСТАНАВЛИВАЕТСЯ!*\n\n"
+            "Остановка подтверждена. Программа завершит текущую операцию и остановится.",
+            chat_id=call.message.chat.id,
+            message_id=call.message.message_id,
+            parse_mode='Markdown'
+        )
+        
+        # Уведомляем в консоль
+        print("🛑 Остановка программы подтверждена через Telegram!")
+
+    def callback_cancel_stop(self, call, _data):
+        self.bot.answer_callback_query(call.id, "Отменено")
+        self.bot.edit_message_text(
+            "✅ *ОТМЕНЕНО*\n\n"
+            "Остановка программы отменена. Программа продолжает работу.",
+            chat_id=call.message.chat.id,
+            message_id=call.message.message_id,
+            parse_mode='Markdown'
+        )
+
+    def callback_toggle_trigger(self, call, argument):
+        """toggle_trigger_<pet_id>_<циклы>"""
+        pet_id, _, cycles_text = argument.rpartition('_')
+        try:
+            cycles = int(cycles_text)
+        except ValueError:
+            self.bot.answer_callback_query(call.id, "❌ Ошибка")
+            return
+        
+        # Находим и переключаем триггер
+        pet = self.pet_manager.pets.get(pet_id)
+        if pet:
+            for trigger in pet.get('infinite_triggers', []):
+                if trigger.get('cycles') == cycles:
+                    trigger['enabled'] = not trigger.get('enabled', True)
+                    self.pet_manager.save_pets()
+                    
+                    status = "включен" if trigger['enabled'] else "выключен"
+                    self.bot.answer_callback_query(call.id, f"Триггер {status}")
+                    
+                    # Обновляем сообщение
+                    self.show_pet_triggers(call.message.chat.id, pet_id)
+                    break
+
+    def callback_delete_trigger(self, call, argument):
+        """delete_trigger_<pet_id>_<циклы>"""
+        pet_id, _, cycles_text = argument.rpartition('_')
+        try:
+            cycles = int(cycles_text)
+        except ValueError:
+            self.bot.answer_callback_query(call.id, "❌ Ошибка")
+            return
+        
+        success, message = self.pet_manager.remove_infinite_trigger(pet_id, cycles)
+        if success:
+            self.bot.answer_callback_query(call.id, "✅ Удалено")
+            self.show_pet_triggers(call.message.chat.id, pet_id)
+        else:
+            self.bot.answer_callback_query(call.id, "❌ Не удалось удалить")
+
+    def callback_add_trigger(self, call, pet_id):
+        # Показываем диалог добавления триггера
+        self.user_state[call.message.chat.id] = {
+            'action': 'waiting_trigger_cycles',
+            'pet_id': pet_id
+        }
+        
+        self.bot.send_message(
+            call.message.chat.id,
+            "🎯 *Добавление триггера бесконечки*\n\n"
+            "Введите количество циклов бесконечки для срабатывания триггера:\n\n"
+            "Пример: 30 (переключится при 30+ циклах)\n"
+            "Пример: 100 (переключится при 100+ циклах)",
+            parse_mode='Markdown'
+        )
+        self.bot.answer_callback_query(call.id)
+
+    def callback_pet_settings(self, call, pet_id):
+        # Сохраняем pet_id в состояние пользователя
+        self.user_state[call.message.chat.id] = {
+            'pet_id': pet_id,
+            'action': 'pet_settings'
+        }
+        
+        # Показываем меню настроек
+        self.pet_settings_menu(call.message.chat.id, pet_id)
+        self.bot.answer_callback_query(call.id, "Настройки питомца")
+
+    def callback_delete_pet(self, call, pet_id):
+        # Подтверждение удаления
+        markup = types.InlineKeyboardMarkup()
+        confirm_btn = types.InlineKeyboardButton(
+            text="✅ Да, удалить",
+            callback_data=f"confirm_delete_pet_{pet_id}"
+        )
+        cancel_btn = types.InlineKeyboardButton(
+            text="❌ Нет, отмена",
+            callback_data=f"cancel_delete_pet_{pet_id}"
+        )
+        markup.add(confirm_btn, cancel_btn)
+        
+        pet_name = self.pet_manager.pets.get(pet_id, {}).get('name', 'Неизвестный')
+        
+        self.bot.edit_message_text(
+            f"⚠️ <b>Подтверждение удаления</b>\n\n"
+            f"Вы действительно хотите удалить питомца?\n\n"
+            f"🐾 <b>Имя:</b> {pet_name}\n"
+            f"📝 <b>ID:</b> <code>{pet_id}</code>\n\n"
+            f"Это действие нельзя отменить!",
+            chat_id=call.message.chat.id,
+            message_id=call.message.message_id,
+            reply_markup=markup,
+            parse_mode='HTML'
+        )
+        self.bot.answer_callback_query(call.id)
+
+    def callback_confirm_delete_pet(self, call, pet_id):
+        success, message = self.pet_manager.delete_pet(pet_id)
+        
+        if success:
+            self.bot.answer_callback_query(call.id, "✅ Удалено")
+            # Обновляем сообщение
+            try:
+                self.bot.edit_message_text(
+                    f"✅ <b>Питомец удален!</b>\n\n{message}",
+                    chat_id=call.message.chat.id,
+                    message_id=call.message.message_id,
+                    parse_mode='HTML'
+                )
+            except:
+                self.bot.send_message(
+                    call.message.chat.id,
+                    f"✅ <b>Питомец удален!</b>\n\n{message}",
+                    parse_mode='HTML'
+                )
+        else:
+            self.bot.answer_callback_query(call.id, "❌ Ошибка")
+            self.bot.send_message(
+                call.message.chat.id,
+                f"❌ <b>Ошибка:</b> {message}",
+                parse_mode='HTML'
+            )
+
+    def callback_cancel_delete_pet(self, call, pet_id):
+        self.bot.answer_callback_query(call.id, "❌ Отменено")
+        
+        # Возвращаемся к списку питомцев
+        self.show_pet_list(call.message.chat.id)
+
+    def callback_switch_pet(self, call, pet_id):
+        success, message = self.pet_manager.switch_to_pet(pet_id)
         
-        row1 = buttons[:2]
-        row2 = buttons[2:]
+        if success:
+            self.bot.answer_callback_query(call.id, "✅ Переключено")
+            pet_name = self.pet_manager.pets.get(pet_id, {}).get('name', 'Неизвестный')
+            self.bot.send_message(
+                call.message.chat.id,
+                f"✅ <b>Переключение успешно!</b>\n\n"
+                f"Переключились на питомца: <b>{pet_name}</b>\n"
+                f"{message}",
+                parse_mode='HTML'
+            )
+        else:
+            self.bot.answer_callback_query(call.id, "❌ Ошибка")
+            self.bot.send_message(
+                call.message.chat.id,
+                f"❌ <b>Ошибка переключения:</b>\n\n{message}",
+                parse_mode='HTML'
+            )
+
+    def callback_record_pet(self, call, pet_id):
+        # Запрашиваем описание для клика
+        pet = self.pet_manager.pets.get(pet_id, {})
+        current_clicks = len(pet.get('clicks', []))
+        click_number = current_clicks + 1
         
-        markup.add(*[types.KeyboardButton(btn) for btn in row1])
-        markup.add(*[types.KeyboardButton(btn) for btn in row2])
+        # Сохраняем состояние
+        self.user_state[call.message.chat.id] = {
+            'action': 'recording_position',
+            'pet_id': pet_id,
+            'click_number': click_number
+        }
         
         self.bot.send_message(
-            chat_id,
-            "⚙️ *Меню настроек*\n\n"
-            "Выберите действие:",
-            reply_markup=markup,
-            parse_mode='Markdown'
+            call.message.chat.id,
+            f"🎯 <b>Запись позиции #{click_number}</b>\n\n"
+            f"Питомец: <b>{pet.get('name', 'Неизвестный')}</b>\n\n"
+            f"1. Подведите мышь к нужной позиции на экране\n"
+            f"2. Введите описание для этой позиции\n"
+            f"   Например: 'Кнопка выбора', 'Меню навыков'",
+            parse_mode='HTML'
         )
+        self.bot.answer_callback_query(call.id)
 
+    def callback_live_config(self, call, key):
+        self.ask_for_config_value(call.message.chat.id, key)
+        self.bot.answer_callback_query(call.id)
+    
     def pet_settings_menu(self, chat_id, pet_id):
         """Меню настроек конкретного питомца"""
         if pet_id not in self.pet_manager.pets:
@@ -1053,54 +931,6 @@ class TelegramBotManager:
             parse_mode='Markdown'
         )
 
-    def handle_position_recording(self, chat_id, description, state):
-        """Обработка записи позиции"""
-        pet_id = state.get('pet_id')
-        click_number = state.get('click_number', 1)
-        
-        print(f"🎯 Запись позиции #{click_number} для питомца {pet_id}")
-        print(f"📝 Описание: {description}")
-        
-        success, message, position = self.pet_manager.record_current_position(
-            pet_id, click_number, description
-        )
-        
-        if success:
-            x, y = position
-            pet = self.pet_manager.pets.get(pet_id, {})
-            current_clicks = len(pet.get('clicks', []))
-            
-            response = f"✅ <b>Позиция записана!</b>\n\n"
-            response += f"🐾 Питомец: <b>{pet.get('name', 'Неизвестный')}</b>\n"
-            response += f"🎯 Позиция #{click_number}: ({x}, {y})\n"
-            response += f"📝 Описание: {description}\n\n"
-            response += f"📊 Записано кликов: {current_clicks}/5\n\n"
-            
-            if current_clicks < 5:
-                response += "Хотите записать еще одну позицию?\n"
-                response += "Подведите мышь и введите описание."
-                
-                # Обновляем состояние для следующей позиции
-                self.user_state[chat_id] = {
-                    'action': 'recording_position',
-                    'pet_id': pet_id,
-                    'click_number': click_number + 1
-                }
-            else:
-                response += "🎉 <b>Все 5 позиций записаны!</b>\n"
-                response += "Питомец полностью настроен."
-                
-                if chat_id in self.user_state:
-                    del self.user_state[chat_id]
-            
-            self.bot.send_message(chat_id, response, parse_mode='HTML')
-        else:
-            self.bot.send_message(
-                chat_id, 
-                f"❌ <b>Ошибка:</b> {message}", 
-                parse_mode='HTML'
-            )
-
     def handle_pet_id_input(self, chat_id, pet_id):
         """Обработка ввода ID питомца"""
         if not pet_id:
@@ -1274,14 +1104,17 @@ class TelegramBotManager:
             "🐾 Питомцы",
             "🧹 Очистка",
             "⌨️ Раскладка",
+            "🎛️ Интервалы",
             "⬅️ Назад"
         ]
         
         row1 = buttons[:2]
-        row2 = buttons[2:]
+        row2 = buttons[2:4]
+        row3 = buttons[4:]
         
         markup.add(*[types.KeyboardButton(btn) for btn in row1])
         markup.add(*[types.KeyboardButton(btn) for btn in row2])
+        markup.add(*[types.KeyboardButton(btn) for btn in row3])
         
         self.bot.send_message(
             chat_id,
@@ -1290,6 +1123,66 @@ class TelegramBotManager:
             reply_markup=markup,
             parse_mode='HTML'
         )
+
+    def show_live_config_menu(self, chat_id):
+        """Настройки, применяемые на лету: текущие значения и кнопки изменения"""
+        snapshot = config_service.get_snapshot()
+        markup = types.InlineKeyboardMarkup(row_width=1)
+
+        lines = ["🎛️ <b>Интервалы и пороги</b>\n",
+                 "Изменения применяются сразу, без перезапуска и без потери текущего лобби.\n"]
+        for key in LIVE_CONFIG_KEYS:
+            if key not in snapshot:
+                continue
+            lines.append(f"• <code>{key}</code> = {snapshot[key]}")
+            markup.add(types.InlineKeyboardButton(f"✏️ {key}", callback_data=f"live_config_{key}"))
+
+        self.bot.send_message(chat_id, "\n".join(lines), reply_markup=markup, parse_mode='HTML')
+
+    def ask_for_config_value(self, chat_id, key):
+        """Запрос нового значения настройки"""
+        if key not in LIVE_CONFIG_KEYS:
+            self.bot.send_message(chat_id, "❌ Эту настройку нельзя менять из Telegram")
+            return
+
+        self.user_state[chat_id] = {'action': 'waiting_config_value', 'config_key': key}
+        self.bot.send_message(
+            chat_id,
+            f"✏️ <b>{key}</b>\n\n"
+            f"Текущее значение: {config_service.get(key)}\n\n"
+            f"Введите новое значение:",
+            parse_mode='HTML'
+        )
+
+    def handle_config_value_input(self, chat_id, value_text, key):
+        """Обработка нового значения настройки: запись в config.py и применение на лету"""
+        self.user_state.pop(chat_id, None)
+
+        try:
+            value = ast.literal_eval(value_text.replace(',', '.'))
+        except (ValueError, SyntaxError):
+            self.bot.send_message(chat_id, "❌ Введите число (например: 1.5)")
+            return
+
+        value_type, allow_zero = LIVE_CONFIG_KEYS[key]
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            self.bot.send_message(chat_id, "❌ Введите число (например: 1.5)")
+            return
+        if value_type is int and not isinstance(value, int):
+            self.bot.send_message(chat_id, "❌ Значение должно быть целым числом")
+            return
+        if value < 0 or (value == 0 and not allow_zero):
+            limit = "неотрицательным" if allow_zero else "больше 0"
+            self.bot.send_message(chat_id, f"❌ Значение должно быть {limit}")
+            return
+
+        success, message = config_service.update_value(key, value, allow_float=value_type is float)
+        if success:
+            self.logger.log_event("TG_CONTROL", f"Настройка изменена: {message}")
+            self.bot.send_message(chat_id, f"✅ {message}\n\nПрименено без перезапуска")
+            self.show_live_config_menu(chat_id)
+        else:
+            self.bot.send_message(chat_id, f"❌ {message}")
     
     def handle_pet_commands(self, chat_id, text):
         """Обработка команд питомцев"""
@@ -1442,7 +1335,7 @@ class TelegramBotManager:
         screenshots_dir = "screenshots"
         try:
             if os.path.exists(screenshots_dir):
-                files = [f for f in os.listdir(screenshots_dir) if f.endswith('.png')]
+                files = [f for f in os.listdir(screenshots_dir) if f.endswith(SCREENSHOT_EXTENSIONS)]
                 total_size = sum(os.path.getsize(os.path.join(screenshots_dir, f)) for f in files)
                 
                 if total_size < 1024 * 1024:
@@ -1513,60 +1406,13 @@ class TelegramBotManager:
                 parse_mode='Markdown'
             )
     
-    def clean_infinite_stats(self, chat_id):
-        """Очистка статистики бесконечки"""
-        try:
-            # Создаем резервную копию
-            backup_file = f"{INFINITE_STATS_FILE}.backup_{int(time.time())}"
-            if os.path.exists(INFINITE_STATS_FILE):
-                import shutil
-                shutil.copy2(INFINITE_STATS_FILE, backup_file)
-            
-            # Создаем новую пустую статистику
-            empty_stats = {
-                'total_entries': 0,
-                'total_exits': 0,
-                'total_cycles': 0,
-                'hero_death_count': 0,
-                'last_entry_time': None,
-                'last_exit_time': None
-            }
-            
-            with open(INFINITE_STATS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(empty_stats, f, indent=2, ensure_ascii=False)
-            
-            # 🔥 ОБНОВЛЯЕМ СТАТИСТИКУ В ТЕКУЩЕМ ЭКЗЕМПЛЯРЕ
-            try:
-                from AFK_lobby import AFKLobbyMonitor
-                # Нужно получить доступ к текущему экземпляру
-                # Это зависит от вашей архитектуры
-                pass
-            except:
-                pass
-            
-            self.bot.send_message(
-                chat_id,
-                f"✅ *Статистика бесконечки очищена!*\n\n"
-                f"Резервная копия сохранена: `{backup_file}`",
-                parse_mode='Markdown'
-            )
-            
-            self.logger.log_event("TG_CONTROL", "Статистика бесконечки очищена")
-            
-        except Exception as e:
-            self.bot.send_message(
-                chat_id,
-                f"❌ *Ошибка очистки:* {str(e)}",
-                parse_mode='Markdown'
-            )
-    
     def clean_screenshots(self, chat_id):
         """Очистка скриншотов"""
         try:
             screenshots_dir = "screenshots"
             if os.path.exists(screenshots_dir):
                 # Считаем сколько файлов будет удалено
-                files = [f for f in os.listdir(screenshots_dir) if f.endswith('.png')]
+                files = [f for f in os.listdir(screenshots_dir) if f.endswith(SCREENSHOT_EXTENSIONS)]
                 file_count = len(files)
                 
                 if file_count > 0:
@@ -1743,7 +1589,7 @@ class TelegramBotManager:
             # 2. Очистка скриншотов
             screenshots_dir = "screenshots"
             if os.path.exists(screenshots_dir):
-                files = [f for f in os.listdir(screenshots_dir) if f.endswith('.png')]
+                files = [f for f in os.listdir(screenshots_dir) if f.endswith(SCREENSHOT_EXTENSIONS)]
                 file_count = len(files)
                 
                 if file_count > 0:
@@ -1802,12 +1648,16 @@ class TelegramBotManager:
                 types.KeyboardButton("🔄 Перезапуск"),
                 types.KeyboardButton("⚙️ Настройки")  # 🔥 ИЗМЕНЕНО: было "⚙️ Настройки", оставляем как есть
             ]
+            btn_row6 = [
+                types.KeyboardButton("📌 Живой статус")
+            ]
             
             markup.add(*btn_row1)
             markup.add(*btn_row2)
             markup.add(*btn_row3)
             markup.add(*btn_row4)
             markup.add(*btn_row5)
+            markup.add(*btn_row6)
             
             pause_status = "⏸️ На паузе" if pause_handler.paused else "▶️ В работе"
             
@@ -1838,118 +1688,115 @@ class TelegramBotManager:
                 parse_mode='Markdown'
             )
     
+    def render_screen(self, name, renderer, version_key=None):
+        """
+        Текст экрана по снимку табло статуса; строится заново только
+        при смене версии снимка (или значения version_key), иначе берется из кэша
+        """
+        snapshot = status_board.get_snapshot()
+        version = snapshot.version if version_key is None else snapshot[version_key]
+        cached = self.rendered_screens.get(name)
+        if cached is not None and cached[0] == version:
+            return snapshot, cached[1]
+        
+        text = renderer(snapshot)
+        self.rendered_screens[name] = (version, text)
+        return snapshot, text
+    
+    def render_status_body(self, snapshot):
+        """Статус программы без строк, зависящих от текущего времени"""
+        session = snapshot['session']
+        details = snapshot['operation_details']
+        
+        # 🔥 СТАТИСТИКА СМЕРТЕЙ
+        red_frame_deaths = session.get('red_frame_deaths_count', 0)
+        total_deaths = session.get('gold_deaths_count', 0) + red_frame_deaths
+        
+        message = f"""
+    🔄 *Перезапусков:* {session.get('restart_count', 0)}
+    🌀 *Циклов бесконечки:* {session.get('infinite_cycles', 0)}
+
+    💀 *Смерти хоста в этой сессии:*
+    🔴 *Красная рамка:* {red_frame_deaths} раз
+    💰 *9999999 в чате:* {session.get('gold_found_count', 0)} раз
+    ⚰️ *Всего смертей:* {total_deaths}
+    """
+        
+        # 🔥 ИНФОРМАЦИЯ О БЕСКОНЕЧКЕ И СМЕРТЯХ ГЕРОЯ
+        if details.get('infinite_enabled', False):
+            message += f"\n🌀 *Бесконечка:*"
+            message += f"\n• Статус: {'АКТИВНА' if details.get('infinite_is_active', False) else 'ВЫКЛЮЧЕНА'}"
+            
+            entries = details.get('infinite_entries', 0)
+            exits = details.get('infinite_exits', 0)
+            cycles = details.get('infinite_cycles', 0)
+            
+            if entries > 0:
+                message += f"\n• Входов: {entries}"
+            if exits > 0:
+                message += f"\n• Выходов: {exits}"
+            if cycles > 0:
+                message += f"\n• Циклов: {cycles}"
+            
+            hero_death_count = details.get('hero_death_count', 0)
+            if hero_death_count > 0:
+                message += f"\n💀 *Смертей героя в бесконечке:* {hero_death_count}"
+            
+            if details.get('hero_dead', False):
+                message += f"\n⚠️ *ГЕРОЙ МЕРТВ!* Ожидает новый раунд..."
+                death_streak = details.get('hero_death_streak', 0)
+                if death_streak > 0:
+                    message += f"\n   Текущая серия смертей: {death_streak}"
+        
+        pause_status = "⏸️ НА ПАУЗЕ" if snapshot['paused'] else "▶️ В РАБОТЕ"
+        message += f"\n\n*Состояние:* {pause_status}"
+        
+        # 🔥 ДЕТАЛИ ОПЕРАЦИИ ЕСЛИ ЕСТЬ
+        if details:
+            message += "\n📋 *Детали операции:*\n"
+            
+            # Общие детали
+            if 'stage' in details:
+                message += f"• Этап: {details['stage']}\n"
+            if 'elapsed_seconds' in details:
+                elapsed_min = details['elapsed_seconds'] // 60
+                elapsed_sec = details['elapsed_seconds'] % 60
+                message += f"• Прошло: {elapsed_min}м {elapsed_sec}сек\n"
+            
+            # Детали AFK мониторинга
+            if 'gold_found' in details:
+                message += f"• Найдено 9999999: {details['gold_found']}\n"
+            if 'arrow_found' in details:
+                message += f"• Стрелка: {'✅ найдена' if details['arrow_found'] else '❌ не найдена'}\n"
+            if 'frame_found' in details:
+                message += f"• Рамка: {'✅ найдена' if details['frame_found'] else '❌ не найдена'}\n"
+            
+            # Детали бесконечки
+            if details.get('infinite_enabled'):
+                if 'infinite_cycles' in details:
+                    message += f"• Бесконечка циклов: {details['infinite_cycles']}\n"
+                if details.get('hero_dead'):
+                    message += f"• Герой: 💀 МЕРТВ (ждет новый раунд)\n"
+            
+            if details.get('triggered_triggers'):
+                message += f"• Триггеров сработало: {len(details['triggered_triggers'])}\n"
+                message += "  (история сохранена в сессии)\n"
+        
+        return message
+    
     def send_status_info(self, chat_id):
         """Отправка информации о статусе программы"""
         try:
-            # Получаем статус из pause_handler
-            status = pause_handler.get_current_status()
-            
-            # Получаем статистику смертей
-            from statistics import stats
-            session_stats = stats.get_session_summary()
-            
-            # Формируем сообщение
-            pause_status = "⏸️ НА ПАУЗЕ" if status['paused'] else "▶️ В РАБОТЕ"
-            operation = status['current_operation']
-            duration = status['operation_duration']
-            
-            # 🔥 ДОБАВЛЯЕМ СТАТИСТИКУ СМЕРТЕЙ
-            red_frame_deaths = session_stats.get('red_frame_deaths_count', 0)
-            total_deaths = session_stats.get('total_deaths_count', 0)
+            snapshot, body = self.render_screen('status', self.render_status_body)
             
+            # 🔥 ВРЕМЯ СЧИТАЕМ ПРИ ОТПРАВКЕ, ОСТАЛЬНОЕ - ИЗ КЭША
             message = f"""
     📱 *СТАТУС ПРОГРАММЫ*
 
-    🎯 *Текущая операция:* {operation}
-    ⏱️ *В работе:* {duration}
-
-    🔄 *Перезапусков:* {session_stats['restart_count']}
-    🌀 *Циклов бесконечки:* {session_stats.get('infinite_cycles', 0)}
-
-    💀 *Смерти хоста в этой сессии:*
-    🔴 *Красная рамка:* {red_frame_deaths} раз
-    💰 *9999999 в чате:* {session_stats['gold_found_count']} раз
-    ⚰️ *Всего смертей:* {total_deaths}
-    """
-            
-            # 🔥 ВАШ ДОБАВЛЕННЫЙ КОД ЗДЕСЬ:
-            # 🔥 ДОБАВЛЯЕМ ИНФОРМАЦИЮ О БЕСКОНЕЧКЕ И СМЕРТЯХ ГЕРОЯ
-            try:
-                # Получаем информацию о бесконечке
-                from AFK_lobby import AFKLobbyMonitor
-                # Создаем временный экземпляр или получаем существующий
-                # Это упрощенный вариант - в реальности нужно получить экземпляр бесконечки
-                if hasattr(pause_handler, 'operation_details'):
-                    details = pause_handler.operation_details if hasattr(pause_handler, 'operation_details') else {}
-
-                    if details.get('infinite_enabled', False):
-                        message += f"\n🌀 *Бесконечка:*"
-                        message += f"\n• Статус: {'АКТИВНА' if details.get('infinite_is_active', False) else 'ВЫКЛЮЧЕНА'}"
-                        
-                        entries = details.get('infinite_entries', 0)
-                        exits = details.get('infinite_exits', 0)
-                        cycles = details.get('infinite_cycles', 0)  # 🔥 ЭТО КЛЮЧЕВОЙ ПАРАМЕТР!
-                        
-                        if entries > 0:
-                            message += f"\n• Входов: {entries}"
-                        if exits > 0:
-                            message += f"\n• Выходов: {exits}"
-                        if cycles > 0:
-                            message += f"\n• Циклов: {cycles}"  # 🔥 ТЕПЕРЬ ЭТО БУДЕТ РАБОТАТЬ
-                        
-                        # 🔥 ИНФОРМАЦИЯ О СМЕРТЯХ ГЕРОЯ
-                        hero_death_count = details.get('hero_death_count', 0)
-                        if hero_death_count > 0:
-                            message += f"\n💀 *Смертей героя в бесконечке:* {hero_death_count}"
-                        
-                        if details.get('hero_dead', False):
-                            message += f"\n⚠️ *ГЕРОЙ МЕРТВ!* Ожидает новый раунд..."
-                            death_streak = details.get('hero_death_streak', 0)
-                            if death_streak > 0:
-                                message += f"\n   Текущая серия смертей: {death_streak}"
-            
-            except Exception as infinite_error:
-                print(f"⚠️ Ошибка получения информации о бесконечке: {infinite_error}")
-            
-            message += f"\n\n*Состояние:* {pause_status}"
-            
-            # 🔥 ДОБАВЛЯЕМ ДЕТАЛИ ОПЕРАЦИИ ЕСЛИ ЕСТЬ
-            details = status.get('operation_details', {})
-            if details:
-                message += "\n📋 *Детали операции:*\n"
-                
-                # Общие детали
-                if 'stage' in details:
-                    message += f"• Этап: {details['stage']}\n"
-                if 'elapsed_seconds' in details:
-                    elapsed_min = details['elapsed_seconds'] // 60
-                    elapsed_sec = details['elapsed_seconds'] % 60
-                    message += f"• Прошло: {elapsed_min}м {elapsed_sec}сек\n"
-                
-                # Детали AFK мониторинга
-                if 'gold_found' in details:
-                    message += f"• Найдено 9999999: {details['gold_found']}\n"
-                if 'arrow_found' in details:
-                    message += f"• Стрелка: {'✅ найдена' if details['arrow_found'] else '❌ не найдена'}\n"
-                if 'frame_found' in details:
-                    message += f"• Рамка: {'✅ найдена' if details['frame_found'] else '❌ не найдена'}\n"
-                
-                # Детали бесконечки (если еще не отображены)
-                if 'infinite_enabled' in details and details['infinite_enabled']:
-                    if 'infinite_cycles' in details:
-                        message += f"• Бесконечка циклов: {details['infinite_cycles']}\n"
-                    if 'hero_dead' in details and details['hero_dead']:
-                        message += f"• Герой: 💀 МЕРТВ (ждет новый раунд)\n"
-            
-                if 'triggered_triggers' in details and details['triggered_triggers']:
-                    triggered_count = len(details['triggered_triggers'])
-                    message += f"• Триггеров сработало: {triggered_count}\n"
-                    
-                    # Можно добавить детали если нужно
-                    if triggered_count > 0:
-                        message += "  (история сохранена в сессии)\n"
-                        
-            message += f"\n*Последнее обновление:* {status['timestamp']}"
+    🎯 *Текущая операция:* {snapshot['current_operation']}
+    ⏱️ *В работе:* {format_duration(time.time() - snapshot['operation_started'])}
+    {body}
+*Последнее обновление:* {time.strftime("%H:%M:%S")}"""
             
             self.bot.send_message(chat_id, message, parse_mode='Markdown')
             
@@ -1960,33 +1807,26 @@ class TelegramBotManager:
             )
 
     
+    def toggle_status_dashboard(self, chat_id):
+        """Включение/выключение закрепленного живого статуса"""
+        if status_dashboard.is_active(chat_id):
+            success, message = status_dashboard.stop(chat_id)
+        else:
+            success, message = status_dashboard.start(chat_id)
+        
+        self.bot.send_message(chat_id, f"{'✅' if success else '❌'} {message}")
+    
     def get_program_status(self):
-        """Получение статуса программы для заглушки"""
-        try:
-            # Пробуем получить реальный статус
-            status = pause_handler.get_current_status()
-            
-            # Получаем статистику
-            session_stats = stats.get_session_summary()
-            
-            # Форматируем длительность операции
-            duration = status['operation_duration']
-            
-            return f"""
-    🎯 *Текущая операция:* {status['current_operation']}
-    ⏱️ *В работе:* {duration}
-    🔄 *Перезапусков:* {session_stats['restart_count']}
-    🎰 *Найдено 9999999:* {session_stats['gold_found_count']} раз
-    🌀 *Циклов бесконечки:* {session_stats.get('infinite_cycles', 0)}
-    """
-        except:
-            # Заглушка если не удалось получить статус
-            return """
-    🎯 *Текущая операция:* Мониторинг AFK лобби
-    ⏱️ *В работе:* 22222 часа 15 минут
-    🔄 *Перезапусков:* 3
-    🎰 *Найдено 9999999:* 5 раз
-    🌀 *Циклов бесконечки:* 12
+        """Краткий статус программы по снимку табло"""
+        snapshot = status_board.get_snapshot()
+        session = snapshot['session']
+        
+        return f"""
+    🎯 *Текущая операция:* {snapshot['current_operation']}
+    ⏱️ *В работе:* {format_duration(time.time() - snapshot['operation_started'])}
+    🔄 *Перезапусков:* {session.get('restart_count', 0)}
+    🎰 *Найдено 9999999:* {session.get('gold_found_count', 0)} раз
+    🌀 *Циклов бесконечки:* {session.get('infinite_cycles', 0)}
     """
     
     def take_screenshot_command_handler(self, chat_id):
@@ -2113,44 +1953,98 @@ class TelegramBotManager:
                 )
 
     def get_infinite_status(self):
-        """Получение статуса бесконечки"""
-        try:
-            # Попытка получить статус из бесконечки
-            # Если класс InfiniteMode недоступен, возвращаем заглушку
-            from infinite_mode import InfiniteMode
-            # Нужно получить экземпляр бесконечки
-            # Это зависит от архитектуры вашего приложения
-            return "ВКЛЮЧЕНА | Циклов: 12"
-        except:
+        """Получение статуса бесконечки (из деталей операции на табло)"""
+        details = status_board.get_snapshot()['operation_details']
+        if 'infinite_enabled' not in details:
             return "Информация недоступна"
+        if not details['infinite_enabled']:
+            return "ВЫКЛЮЧЕНА"
+        return f"ВКЛЮЧЕНА | Циклов: {details.get('infinite_cycles', 0)}"
     
     def send_statistics_info(self, chat_id):
         """Отправка статистики с деталями смертей хоста"""
         try:
-            # Получаем статистику сессии
-            session_stats = stats.get_session_summary()
-            total_stats = stats.get_total_summary()
-            
-            # 🔥 ПОЛУЧАЕМ СТАТИСТИКУ СМЕРТЕЙ
-            gold_deaths_session = session_stats.get('gold_deaths_count', 0)
-            red_frame_deaths_session = session_stats.get('red_frame_deaths_count', 0)
-            total_deaths_session = session_stats.get('total_deaths_count', 0)
-            
-            gold_deaths_total = total_stats.get('gold_deaths_count', 0)
-            red_frame_deaths_total = total_stats.get('red_frame_deaths_count', 0)
-            total_deaths_total = total_stats.get('total_deaths', 0)
-            
-            # Получаем статистику бесконечки
-            infinite_cycles = session_stats.get('infinite_cycles', 0)
+            _, body = self.render_screen('statistics', self.render_statistics_body, 'stats_revision')
+            period_stats = self.render_period_stats()
             
-            # 🔥 ДИНАМИЧЕСКОЕ ПОЛУЧЕНИЕ ТЕКУЩЕГО ПАРОЛЯ
-            from config_loader import get_config
+            # 🔥 ДЛИТЕЛЬНОСТЬ И ПАРОЛЬ - ПРИ ОТПРАВКЕ, ОСТАЛЬНОЕ - ИЗ КЭША
+            session_duration = stats.get_session_summary()['session_duration']
             current_password = self.read_password_directly()
             
             message = f"""
     📊 *СТАТИСТИКА СЕССИИ*
 
-    ⏱ *Длительность:* {session_stats['session_duration']}
+    ⏱ *Длительность:* {session_duration}{body}{period_stats}
+    *Текущий пароль:* `{current_password}`
+    """
+            
+            self.bot.send_message(chat_id, message, parse_mode='Markdown')
+            
+        except Exception as e:
+            self.bot.send_message(
+                chat_id, 
+                f"⚠️ Ошибка получения статистики: {str(e)}\nДетали: {traceback.format_exc()}"
+            )
+    
+    def render_period_stats(self):
+        """
+        Выборки за период из базы статистики. Окно "за 24 часа" сдвигается
+        со временем, поэтому кэш - на минуту и до следующей записи в базу
+        """
+        if not stats_db.enabled:
+            return ""
+        
+        cache_key = (int(time.time() // 60), stats_db.write_count)
+        cached = self.rendered_screens.get('statistics_period')
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        
+        deaths_24h = stats_db.host_deaths_by_type(24)
+        period_stats = f"""
+    🗄️ *ЗА 24 ЧАСА*
+
+    🎯 *Найдено 9999999:* {stats_db.count_gold_finds(24)}
+    🌀 *Циклов бесконечки:* {stats_db.count_infinite_cycles(24)}
+    🔴 *Красная рамка:* {deaths_24h.get('red_frame', 0)} раз
+    💰 *9999999 в чате:* {deaths_24h.get('gold_text', 0)} раз
+    """
+        for day, count, average in stats_db.average_find_time_by_day(7):
+            period_stats += f"📆 {day}: {count} находок, среднее {average:.0f} сек\n"
+        
+        self.rendered_screens['statistics_period'] = (cache_key, period_stats)
+        return period_stats
+    
+    def render_statistics_body(self, snapshot):
+        """
+        Статистика сессии и общая (счетчики и квантили) - строится
+        только после новых событий статистики
+        """
+        session_stats = stats.get_session_summary()
+        total_stats = stats.get_total_summary()
+        
+        # 🔥 ПОЛУЧАЕМ СТАТИСТИКУ СМЕРТЕЙ
+        gold_deaths_session = session_stats.get('gold_deaths_count', 0)
+        red_frame_deaths_session = session_stats.get('red_frame_deaths_count', 0)
+        total_deaths_session = session_stats.get('total_deaths_count', 0)
+        
+        gold_deaths_total = total_stats.get('gold_deaths_count', 0)
+        red_frame_deaths_total = total_stats.get('red_frame_deaths_count', 0)
+        total_deaths_total = total_stats.get('total_deaths', 0)
+        
+        # Получаем статистику бесконечки
+        infinite_cycles = session_stats.get('infinite_cycles', 0)
+        
+        # 🔥 КВАНТИЛИ ДЛЯ ПОДБОРА ТАЙМАУТОВ
+        rollup_summary = stats.get_rollup_summary()
+        quantile_stats = f"""
+    ⏱ *РАСПРЕДЕЛЕНИЯ (p50 / p90 / p99)*
+
+    🎯 *Время поиска 9999999:* {stats.format_quantiles(rollup_summary['find_time'])}
+    🔄 *Перезапусков на находку:* {stats.format_quantiles(rollup_summary['restarts_per_gold'])}
+    💀 *Между смертями хоста:* {stats.format_quantiles(rollup_summary['host_death_interval'])}
+    """
+        
+        return f"""
     🎯 *Найдено 9999999:* {session_stats['gold_found_count']} раз
     📊 *Умноженное:* {session_stats['multiplied_gold_count']} (×3)
     🌀 *Циклов бесконечки:* {infinite_cycles}
@@ -2173,17 +2067,7 @@ class TelegramBotManager:
     🔴 *Красная рамка:* {red_frame_deaths_total} раз
     💰 *9999999 в чате:* {gold_deaths_total} раз
     ⚰️ *Всего смертей:* {total_deaths_total}
-
-    *Текущий пароль:* `{current_password}`
-    """
-            
-            self.bot.send_message(chat_id, message, parse_mode='Markdown')
-            
-        except Exception as e:
-            self.bot.send_message(
-                chat_id, 
-                f"⚠️ Ошибка получения статистики: {str(e)}\nДетали: {traceback.format_exc()}"
-            )
+    {quantile_stats}"""
     
     def get_keyboard_layout(self):
         """Определить текущую раскладку клавиатуры"""
@@ -2361,45 +2245,39 @@ class TelegramBotManager:
         try:
             print("📸 Запрос на создание скриншота...")
             
-            import pyautogui
-            from PIL import Image
             import io
             import datetime
             
-            # Создаем папку для скриншотов если нет
-            screenshots_dir = "screenshots"
-            os.makedirs(screenshots_dir, exist_ok=True)
-            
             # Делаем скриншот
-            screenshot = pyautogui.screenshot()
+            screenshot = frame_capture.screenshot()
             
-            # Сохраняем файл с временной меткой
+            # 🔥 УМЕНЬШАЕМ И СЖИМАЕМ В ПАМЯТИ - БЕЗ ЗАПИСИ PNG НА ДИСК
+            data, (width, height), extension = encode_screenshot(screenshot)
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{screenshots_dir}/screenshot_{timestamp}.png"
-            screenshot.save(filename)
+            filename = archive_screenshot(data, "screenshots", f"screenshot_{timestamp}", extension)
             
             # Получаем информацию о скриншоте
-            screen_width, screen_height = pyautogui.size()
+            screen_width, screen_height = frame_capture.screen_size()
             current_time = datetime.datetime.now().strftime("%H:%M:%S")
             
             # Отправляем в Telegram
-            with open(filename, 'rb') as photo:
-                caption = (
-                    f"📸 *Скриншот экрана*\n\n"
-                    f"🕐 *Время:* {current_time}\n"
-                    f"📏 *Разрешение:* {screen_width}x{screen_height}\n"
-                    f"💾 *Размер файла:* {os.path.getsize(filename) // 1024} KB\n"
-                    f"📁 *Путь:* `{filename}`"
-                )
-                
-                self.bot.send_photo(
-                    chat_id,
-                    photo,
-                    caption=caption,
-                    parse_mode='Markdown'
-                )
+            caption = (
+                f"📸 *Скриншот экрана*\n\n"
+                f"🕐 *Время:* {current_time}\n"
+                f"📏 *Разрешение:* {screen_width}x{screen_height} (отправлено {width}x{height})\n"
+                f"💾 *Размер файла:* {len(data) // 1024} KB"
+            )
+            if filename:
+                caption += f"\n📁 *Путь:* `{filename}`"
+            
+            self.bot.send_photo(
+                chat_id,
+                io.BytesIO(data),
+                caption=caption,
+                parse_mode='Markdown'
+            )
             
-            print(f"✅ Скриншот отправлен: {filename}")
+            print(f"✅ Скриншот отправлен: {len(data) // 1024} KB")
             return True
             
         except Exception as e:
@@ -2413,48 +2291,42 @@ class TelegramBotManager:
         try:
             print("📸 Запрос на создание скриншота области...")
             
-            import pyautogui
-            from PIL import Image
             import io
             import datetime
             
-            screenshots_dir = "screenshots"
-            os.makedirs(screenshots_dir, exist_ok=True)
-            
             if region:
                 # Скриншот определенной области
                 x, y, width, height = region
-                screenshot = pyautogui.screenshot(region=region)
+                screenshot = frame_capture.screenshot(region=region)
                 region_info = f"Область: {region}"
             else:
                 # Скриншот всего экрана
-                screenshot = pyautogui.screenshot()
-                screen_width, screen_height = pyautogui.size()
+                screenshot = frame_capture.screenshot()
+                screen_width, screen_height = frame_capture.screen_size()
                 region_info = f"Весь экран: {screen_width}x{screen_height}"
             
-            # Сохраняем файл
+            # 🔥 СЖАТИЕ В ПАМЯТИ, НА ДИСК - ТОЛЬКО ПРИ SCREENSHOT_ARCHIVE
+            data, _, extension = encode_screenshot(screenshot)
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             region_type = "region" if region else "full"
-            filename = f"{screenshots_dir}/{region_type}_screenshot_{timestamp}.png"
-            screenshot.save(filename)
+            archive_screenshot(data, "screenshots", f"{region_type}_screenshot_{timestamp}", extension)
             
             # Отправляем в Telegram
-            with open(filename, 'rb') as photo:
-                caption = (
-                    f"📸 *Скриншот экрана*\n\n"
-                    f"🕐 *Время:* {datetime.datetime.now().strftime('%H:%M:%S')}\n"
-                    f"{region_info}\n"
-                    f"💾 *Размер файла:* {os.path.getsize(filename) // 1024} KB"
-                )
-                
-                self.bot.send_photo(
-                    chat_id,
-                    photo,
-                    caption=caption,
-                    parse_mode='Markdown'
-                )
+            caption = (
+                f"📸 *Скриншот экрана*\n\n"
+                f"🕐 *Время:* {datetime.datetime.now().strftime('%H:%M:%S')}\n"
+                f"{region_info}\n"
+                f"💾 *Размер файла:* {len(data) // 1024} KB"
+            )
+            
+            self.bot.send_photo(
+                chat_id,
+                io.BytesIO(data),
+                caption=caption,
+                parse_mode='Markdown'
+            )
             
-            print(f"✅ Скриншот области отправлен: {filename}")
+            print(f"✅ Скриншот области отправлен: {len(data) // 1024} KB")
             return True
             
         except Exception as e:
@@ -2465,16 +2337,7 @@ class TelegramBotManager:
 
     def get_infinite_statistics(self):
         """Получение статистики бесконечки"""
-        try:
-            # Попытка получить реальную статистику
-            from infinite_mode import InfiniteMode
-            # Нужно получить экземпляр бесконечки
-            # Через AFKLobbyMonitor или глобальную переменную
-            
-            # Временное решение - возвращаем информацию что статистика собирается
-            return "🌀 *БЕСКОНЕЧКА:* Статистика собирается в реальном времени"
-        except:
-            return "🌀 *БЕСКОНЕЧКА:* Информация недоступна"
+        return f"🌀 *БЕСКОНЕЧКА:* {self.get_infinite_status()}"
 
     def clear_all_flags(self):
         """Очищает все флаги (пауза, перезапуск, завершение)"""
@@ -2620,98 +2483,7 @@ class TelegramBotManager:
             reply_markup=markup,
             parse_mode='Markdown'
         )
-        
-        # Обработчик callback-запросов
-        @self.bot.callback_query_handler(func=lambda call: True)
-        def handle_callback(call):
-            if call.data.startswith("use_password_"):
-                password_name = call.data.replace("use_password_", "")
-                self.use_saved_password(call.message.chat.id, password_name)
-            elif call.data == "delete_password_menu":
-                self.show_delete_password_menu(call.message.chat.id)
-            # elif call.data.startswith("delete_password_"):
-            #     password_name = call.data.replace("delete_password_", "")
-            #     self.delete_password(call.message.chat.id, password_name)
-            # # 🔥 ОБРАБОТКА ОЧИСТКИ
-            # elif call.data == "clean_infinite_confirm":
-            #     self.clean_infinite_stats(call.message.chat.id)
-            #     self.bot.answer_callback_query(call.id, "Статистика очищена")
-            # elif call.data == "clean_infinite_cancel":
-            #     self.bot.answer_callback_query(call.id, "Отменено")
-            #     self.bot.send_message(call.message.chat.id, "❌ Очистка статистики отменена")
-            
-            # elif call.data == "clean_screenshots_confirm":
-            #     self.clean_screenshots(call.message.chat.id)
-            #     self.bot.answer_callback_query(call.id, "Скриншоты очищены")
-            # elif call.data == "clean_screenshots_cancel":
-            #     self.bot.answer_callback_query(call.id, "Отменено")
-            #     self.bot.send_message(call.message.chat.id, "❌ Очистка скриншотов отменена")
-            
-            # elif call.data == "clean_all_confirm":
-            #     self.clean_all_data(call.message.chat.id)
-            #     self.bot.answer_callback_query(call.id, "Все данные очищены")
-            # elif call.data == "clean_all_cancel":
-            #     self.bot.answer_callback_query(call.id, "Отменено")
-            #     self.bot.send_message(call.message.chat.id, "❌ Полная очистка отменена")
-            # elif call.data.startswith("switch_pet_"):
-            #     pet_id = call.data.replace("switch_pet_", "")
-            #     success, message = self.pet_manager.switch_to_pet(pet_id)
-                
-            #     if success:
-            #         self.bot.answer_callback_query(call.id, "✅ Переключено")
-            #         self.bot.send_message(
-            #             call.message.chat.id,
-            #             f"✅ *Переключение успешно!*\n\n{message}",
-            #             parse_mode='Markdown'
-            #         )
-            #     else:
-            #         self.bot.answer_callback_query(call.id, "❌ Ошибка")
-            #         self.bot.send_message(
-            #             call.message.chat.id,
-            #             f"❌ *Ошибка переключения:*\n\n{message}",
-            #             parse_mode='Markdown'
-            #         )
-            
-            # elif call.data.startswith("delete_pet_"):
-            #     pet_id = call.data.replace("delete_pet_", "")
-            #     success, message = self.pet_manager.delete_pet(pet_id)
-                
-            #     if success:
-            #         self.bot.answer_callback_query(call.id, "✅ Удалено")
-            #         # Обновляем сообщение
-            #         self.bot.edit_message_text(
-            #             f"✅ *Питомец удален!*\n\n{message}",
-            #             chat_id=call.message.chat.id,
-            #             message_id=call.message.message_id,
-            #             parse_mode='Markdown'
-            #         )
-            #     else:
-            #         self.bot.answer_callback_query(call.id, "❌ Ошибка")
-            
-            # elif call.data.startswith("record_pet_"):
-            #     pet_id = call.data.replace("record_pet_", "")
-                
-            #     # Запрашиваем описание для клика
-            #     pet = self.pet_manager.pets.get(pet_id, {})
-            #     current_clicks = len(pet.get('clicks', []))
-            #     click_number = current_clicks + 1
-                
-            #     # Сохраняем состояние
-            #     self.user_state[call.message.chat.id] = {
-            #         'action': 'recording_position',
-            #         'pet_id': pet_id,
-            #         'click_number': click_number
-            #     }
-                
-            #     self.bot.send_message(
-            #         call.message.chat.id,
-            #         f"🎯 *Запись позиции #{click_number}*\n\n"
-            #         f"Питомец: {pet.get('name', 'Неизвестный')}\n\n"
-            #         f"1. Подведите мышь к нужной позиции на экране\n"
-            #         f"2. Введите описание для этой позиции\n"
-            #         f"   Например: 'Кнопка выбора', 'Меню навыков'",
-            #         parse_mode='Markdown'
-            #     )
+
     
     def show_delete_password_menu(self, chat_id):
         """Меню удаления паролей"""
@@ -2773,34 +2545,8 @@ class TelegramBotManager:
             self.bot.send_message(chat_id, "❌ Пароль не найден.")
     
     def read_password_directly(self):
-        """Читает пароль напрямую из config.py"""
-        try:
-            with open("config.py", "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith("PASS_LOBBY ="):
-                    # Извлекаем значение
-                    parts = line.split('=', 1)
-                    if len(parts) > 1:
-                        value = parts[1].strip()
-                        
-                        # Убираем кавычки
-                        if value.startswith('"') and value.endswith('"'):
-                            return value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            return value[1:-1]
-                        else:
-                            # Убираем комментарии
-                            if '#' in value:
-                                value = value.split('#')[0].strip()
-                            return value
-        except Exception as e:
-            print(f"⚠️ Ошибка чтения пароля: {e}")
-        
-        return "1"  # значение по умолчанию
+        """Актуальный пароль из config.py"""
+        return str(config_service.get('PASS_LOBBY', "1"))
 
     def update_password_in_config(self, new_password):
         """Обновление пароля в конфиге с гарантированной записью"""
@@ -2848,6 +2594,9 @@ class TelegramBotManager:
                 else:
                     print("❌ Изменение не подтверждено!")
             
+            # Новый снимок настроек сразу, не дожидаясь проверки по интервалу
+            config_service.reload()
+            
             self.logger.log_event("TG_CONTROL", f"Пароль изменен на: {new_password}")
             
             return True
@@ -3023,33 +2772,6 @@ class TelegramBotManager:
                 reply_markup=markup,
                 parse_mode='Markdown'
             )
-            
-            # Добавляем обработчик callback
-            @self.bot.callback_query_handler(func=lambda call: call.data in ["confirm_stop", "cancel_stop"])
-            def handle_stop_confirmation(call):
-                if call.data == "confirm_stop":
-                    pause_handler.request_shutdown()
-                    self.logger.log_event("TG_CONTROL", "Остановка подтверждена из Telegram")
-                    
-                    self.bot.edit_message_text(
-                        "🛑 *ПРОГРАММА ОСТАНАВЛИВАЕТСЯ!*\n\n"
-                        "Остановка подтверждена. Программа завершит текущую операцию и остановится.",
-                        chat_id=call.message.chat.id,
-                        message_id=call.message.message_id,
-                        parse_mode='Markdown'
-                    )
-                    
-                    # Уведомляем в консоль
-                    print("🛑 Остановка программы подтверждена через Telegram!")
-                    
-                else:  # cancel_stop
-                    self.bot.edit_message_text(
-                        "✅ *ОТМЕНЕНО*\n\n"
-                        "Остановка программы отменена. Программа продолжает работу.",
-                        chat_id=call.message.chat.id,
-                        message_id=call.message.message_id,
-                        parse_mode='Markdown'
-                    )
                 
         except Exception as e:
             self.bot.send_message(
@@ -3114,18 +2836,16 @@ class TelegramBotManager:
             print("⚠️ Список админов пуст, уведомления не отправлены")
             return
         
+        # Через очередь: запуск polling не ждет отправки всем админам
         for admin_id in TELEGRAM_ADMIN_IDS:
-            try:
-                self.bot.send_message(
-                    admin_id,
-                    "🚀 *Dota 2 Automator запущен!*\n\n"
-                    "🤖 Бот управления активирован и готов к работе.\n"
-                    "Используйте /start для открытия меню.",
-                    parse_mode='Markdown'
-                )
-                print(f"✅ Уведомление отправлено админу {admin_id}")
-            except Exception as e:
-                print(f"⚠️ Не удалось отправить уведомление админу {admin_id}: {e}")
+            telegram_outbox.send_message(
+                admin_id,
+                "🚀 *Dota 2 Automator запущен!*\n\n"
+                "🤖 Бот управления активирован и готов к работе.\n"
+                "Используйте /start для открытия меню.",
+                parse_mode='Markdown'
+            )
+        print(f"✅ Уведомления о запуске поставлены в очередь: {len(TELEGRAM_ADMIN_IDS)}")
 
     def stop_bot(self):
         """Остановка бота"""
@@ -0,0 +1,193 @@
+# telegram_dashboard.py
+import json
+import os
+import threading
+import time
+from config import DASHBOARD_FILE
+from config_service import config_service
+from persistence import persistence, atomic_write_json
+from status_snapshot import status_board, format_duration
+from telegram_outbox import telegram_outbox
+
+
+class StatusDashboard:
+    """
+    Живой статус: одно закрепленное сообщение на админа, которое бот
+    редактирует (edit_message_text) вместо новых ответов на /status.
+    Текст строится в отдельном потоке по снимку табло статуса - поток
+    автоматизации сообщений не собирает. Сообщение меняется не чаще
+    TELEGRAM_DASHBOARD_INTERVAL секунд и только при новой версии снимка;
+    без изменений время работы обновляется раз в TELEGRAM_DASHBOARD_REFRESH.
+    Изменения идут через очередь telegram_outbox (общие лимиты Telegram).
+    """
+    # Настройки, меняющиеся на лету без перезапуска: ключ config.py -> атрибут
+    LIVE_CONFIG = {
+        'TELEGRAM_DASHBOARD_INTERVAL': 'interval',
+        'TELEGRAM_DASHBOARD_REFRESH': 'refresh_interval'
+    }
+
+    def __init__(self, dashboards_file=DASHBOARD_FILE):
+        self.dashboards_file = dashboards_file
+        self.lock = threading.Lock()
+        self.bot = None
+        self.thread = None
+        self.dashboards = self.load_dashboards()  # chat_id -> message_id
+        self.last_update = {}  # chat_id -> (версия снимка, время последнего изменения)
+        config_service.bind(self, self.LIVE_CONFIG, "Живой статус")
+
+    def load_dashboards(self):
+        """Сообщения из прошлого запуска - продолжаем редактировать их же"""
+        if not os.path.exists(self.dashboards_file):
+            return {}
+        try:
+            with open(self.dashboards_file, 'r', encoding='utf-8') as f:
+                return {int(chat_id): message_id for chat_id, message_id in json.load(f).items()}
+        except Exception as e:
+            print(f"⚠️ Ошибка загрузки {self.dashboards_file}: {e}")
+            return {}
+
+    def save_dashboards(self):
+        with self.lock:
+            data = {str(chat_id): message_id for chat_id, message_id in self.dashboards.items()}
+        persistence.mark_dirty(self.dashboards_file, lambda: atomic_write_json(self.dashboards_file, data))
+
+    def attach(self, bot):
+        """Подключение бота и запуск потока обновления"""
+        self.bot = bot
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="status_dashboard", daemon=True)
+            self.thread.start()
+
+    def is_active(self, chat_id):
+        return chat_id in self.dashboards
+
+    def start(self, chat_id):
+        """
+        Отправляет и закрепляет сообщение живого статуса (прежнее открепляется)
+        Возвращает (успех, сообщение)
+        """
+        if self.bot is None:
+            return False, "Бот не запущен"
+
+        old_message_id = self.dashboards.get(chat_id)
+        snapshot = status_board.get_snapshot()
+        text = self.render(snapshot)
+        try:
+            message = self.bot.send_message(chat_id, text, parse_mode='Markdown')
+        except Exception as e:
+            return False, f"Не удалось отправить сообщение: {e}"
+
+        try:
+            self.bot.pin_chat_message(chat_id, message.message_id, disable_notification=True)
+        except Exception as e:
+            print(f"⚠️ Не удалось закрепить живой статус: {e}")
+
+        if old_message_id is not None:
+            self._unpin(chat_id, old_message_id)
+
+        with self.lock:
+            self.dashboards[chat_id] = message.message_id
+            self.last_update[chat_id] = (snapshot.version, time.monotonic())
+        self.save_dashboards()
+        return True, "Живой статус закреплен и будет обновляться"
+
+    def stop(self, chat_id):
+        """Открепляет сообщение и прекращает обновления"""
+        with self.lock:
+            message_id = self.dashboards.pop(chat_id, None)
+            self.last_update.pop(chat_id, None)
+        if message_id is None:
+            return False, "Живой статус не включен"
+
+        self.save_dashboards()
+        self._unpin(chat_id, message_id)
+        telegram_outbox.edit_message(chat_id, message_id, "⏹ *Живой статус остановлен*",
+                                     coalesce_key='dashboard', parse_mode='Markdown')
+        return True, "Живой статус остановлен"
+
+    def _unpin(self, chat_id, message_id):
+        try:
+            self.bot.unpin_chat_message(chat_id, message_id)
+        except Exception as e:
+            print(f"⚠️ Не удалось открепить живой статус: {e}")
+
+    def render(self, snapshot):
+        """Короткий статус для закрепленного сообщения"""
+        session = snapshot['session']
+        details = snapshot['operation_details']
+
+        state = "⏸️ НА ПАУЗЕ" if snapshot['paused'] else "▶️ В РАБОТЕ"
+        if snapshot['restart_requested']:
+            state = "🔄 ПЕРЕЗАПУСК"
+        elif snapshot['shutdown_requested']:
+            state = "🛑 ЗАВЕРШЕНИЕ"
+
+        text = (
+            f"📌 *ЖИВОЙ СТАТУС* | {state}\n\n"
+            f"🎯 *Операция:* {snapshot['current_operation']}\n"
+            f"⏱️ *В работе:* {format_duration(time.time() - snapshot['operation_started'])}\n"
+            f"💰 *Найдено 9999999:* {session.get('gold_found_count', 0)}\n"
+            f"🌀 *Циклов бесконечки:* {details.get('infinite_cycles', session.get('infinite_cycles', 0))}\n"
+        )
+
+        death_streak = details.get('hero_death_streak', 0)
+        if details.get('hero_dead', False):
+            text += f"💀 *Герой мертв*, серия смертей: {death_streak}\n"
+        elif death_streak > 0:
+            text += f"💀 *Серия смертей героя:* {death_streak}\n"
+
+        text += f"\n🕒 Обновлено: {time.strftime('%H:%M:%S')}"
+        return text
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.update_all()
+            except Exception as e:
+                print(f"⚠️ Ошибка обновления живого статуса: {e}")
+
+    def update_all(self):
+        """Редактирует сообщения, для которых есть изменения"""
+        snapshot = status_board.get_snapshot()
+        now = time.monotonic()
+        text = None
+
+        with self.lock:
+            dashboards = list(self.dashboards.items())
+
+        for chat_id, message_id in dashboards:
+            version, updated_at = self.last_update.get(chat_id, (None, 0))
+            if version == snapshot.version and now - updated_at < self.refresh_interval:
+                continue
+
+            if text is None:
+                text = self.render(snapshot)
+            with self.lock:
+                if self.dashboards.get(chat_id) != message_id:
+                    continue  # Пока строили текст, статус выключили или пересоздали
+                self.last_update[chat_id] = (snapshot.version, now)
+
+            telegram_outbox.edit_message(
+                chat_id, message_id, text,
+                coalesce_key='dashboard',
+                on_error=lambda error, chat_id=chat_id, message_id=message_id: self._on_edit_error(chat_id, message_id, error),
+                parse_mode='Markdown'
+            )
+
+    def _on_edit_error(self, chat_id, message_id, error):
+        """Сообщение удалено пользователем - перестаем его редактировать"""
+        description = str(error).lower()
+        if 'not modified' in description:
+            return
+        if "not found" in description or "can't be edited" in description:
+            with self.lock:
+                if self.dashboards.get(chat_id) != message_id:
+                    return
+                del self.dashboards[chat_id]
+                self.last_update.pop(chat_id, None)
+            self.save_dashboards()
+            print(f"📌 Живой статус для {chat_id} отключен: сообщение недоступно")
+
+# Глобальный экземпляр
+status_dashboard = StatusDashboard()
\ No newline at end of file
@@ -0,0 +1,200 @@
+# telegram_outbox.py
+import io
+import threading
+import time
+from collections import deque
+from config import TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_INTERVAL, TELEGRAM_MAX_RETRIES, TELEGRAM_RETRY_DELAY
+
+MESSAGE_LIMIT = 4096  # Максимальная длина сообщения Telegram
+
+
+class OutgoingMessage:
+    """Сообщение или фото в очереди отправки"""
+    def __init__(self, method, chat_id, text=None, photo=None, options=None, coalesce_key=None,
+                 message_id=None, on_error=None):
+        self.method = method        # 'message', 'photo' или 'edit'
+        self.chat_id = chat_id
+        self.text = text            # Текст сообщения или подпись к фото
+        self.photo = photo          # Байты изображения
+        self.options = options or {}
+        self.coalesce_key = coalesce_key
+        self.message_id = message_id  # Редактируемое сообщение
+        self.on_error = on_error      # on_error(ошибка) - сообщение отброшено
+        self.attempts = 0
+        self.not_before = 0.0       # Не отправлять раньше (повтор после ошибки)
+
+    def can_merge(self, other):
+        """Обычные текстовые сообщения одному чату с одинаковым форматированием склеиваются"""
+        return (self.method == other.method == 'message' and
+                self.chat_id == other.chat_id and
+                self.coalesce_key is None and other.coalesce_key is None and
+                self.options == other.options and
+                'reply_markup' not in self.options and
+                other.attempts == 0)
+
+
+class TelegramOutbox:
+    """
+    Очередь исходящих сообщений Telegram с отдельным потоком отправки.
+    Рабочий поток только кладет сообщение в очередь и сразу продолжает работу.
+    Поток отправки соблюдает лимиты Telegram: не чаще TELEGRAM_CHAT_INTERVAL
+    в один чат и не больше TELEGRAM_GLOBAL_RATE сообщений в секунду всего.
+    Пока чат ждет своей очереди, новые сообщения ему склеиваются в одно;
+    сообщения с одинаковым coalesce_key (статус) заменяют еще не отправленное.
+    Ошибки сети повторяются с удвоением задержки (TELEGRAM_MAX_RETRIES раз),
+    при 429 ждем столько, сколько просит Telegram (retry_after).
+    """
+    def __init__(self):
+        self.bot = None
+        self.condition = threading.Condition()
+        self.pending = deque()
+        self.chat_ready = {}       # chat_id -> когда можно отправлять в чат (monotonic)
+        self.sent_times = deque()  # Время отправок за последнюю секунду
+        self.thread = None
+
+    def attach(self, bot):
+        """Подключение бота; до этого сообщения не принимаются (бот выключен)"""
+        with self.condition:
+            self.bot = bot
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="telegram_outbox", daemon=True)
+                self.thread.start()
+
+    def send_message(self, chat_id, text, coalesce_key=None, **options):
+        """Ставит сообщение в очередь. False - бот не запущен"""
+        return self._enqueue(OutgoingMessage('message', chat_id, text=text, options=options,
+                                             coalesce_key=coalesce_key))
+
+    def send_photo(self, chat_id, photo, caption=None, **options):
+        """photo - путь к файлу или байты; файл читается сразу, чтобы его можно было удалить"""
+        if isinstance(photo, str):
+            with open(photo, 'rb') as f:
+                photo = f.read()
+        return self._enqueue(OutgoingMessage('photo', chat_id, text=caption, photo=photo, options=options))
+
+    def edit_message(self, chat_id, message_id, text, coalesce_key=None, on_error=None, **options):
+        """
+        Ставит в очередь замену текста отправленного сообщения (edit_message_text);
+        on_error(ошибка) вызывается, если изменение отброшено (сообщение удалено и т.п.)
+        """
+        return self._enqueue(OutgoingMessage('edit', chat_id, text=text, options=options,
+                                             coalesce_key=coalesce_key, message_id=message_id,
+                                             on_error=on_error))
+
+    def _enqueue(self, message):
+        with self.condition:
+            if self.bot is None:
+                return False
+
+            if message.coalesce_key is not None:
+                for queued in self.pending:
+                    if queued.chat_id == message.chat_id and queued.coalesce_key == message.coalesce_key:
+                        # Еще не отправлен - отправим только последнюю версию
+                        queued.text = message.text
+                        queued.options = message.options
+                        queued.message_id = message.message_id
+                        queued.on_error = message.on_error
+                        return True
+
+            self.pending.append(message)
+            self.condition.notify()
+        return True
+
+    def _take_next(self):
+        """
+        Следующее сообщение, которое можно отправить сейчас (вызывается под блокировкой)
+        Возвращает (сообщение, None) или (None, сколько ждать)
+        """
+        now = time.monotonic()
+        while self.sent_times and now - self.sent_times[0] >= 1.0:
+            self.sent_times.popleft()
+        if len(self.sent_times) >= TELEGRAM_GLOBAL_RATE:
+            return None, 1.0 - (now - self.sent_times[0])
+
+        wait = None
+        blocked_chats = set()  # Порядок сообщений в одном чате сохраняется
+        for message in self.pending:
+            if message.chat_id in blocked_chats:
+                continue
+            ready_at = max(message.not_before, self.chat_ready.get(message.chat_id, 0.0))
+            if ready_at <= now:
+                self.pending.remove(message)
+                self._merge_following(message)
+                return message, None
+            blocked_chats.add(message.chat_id)
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return None, wait
+
+    def _merge_following(self, message):
+        """Склеивает накопившиеся сообщения тому же чату в одно"""
+        for queued in list(self.pending):
+            if queued.chat_id != message.chat_id:
+                continue
+            if not message.can_merge(queued) or len(message.text) + len(queued.text) + 2 > MESSAGE_LIMIT:
+                break
+            message.text = f"{message.text}\n\n{queued.text}"
+            self.pending.remove(queued)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                message, wait = self._take_next()
+                while message is None:
+                    self.condition.wait(wait)
+                    message, wait = self._take_next()
+
+                now = time.monotonic()
+                self.sent_times.append(now)
+                self.chat_ready[message.chat_id] = now + TELEGRAM_CHAT_INTERVAL
+                bot = self.bot
+
+            try:
+                self._deliver(bot, message)
+            except Exception as e:
+                self._handle_error(message, e)
+
+    @staticmethod
+    def _deliver(bot, message):
+        if message.method == 'photo':
+            bot.send_photo(message.chat_id, io.BytesIO(message.photo), caption=message.text, **message.options)
+        elif message.method == 'edit':
+            bot.edit_message_text(message.text, chat_id=message.chat_id, message_id=message.message_id,
+                                  **message.options)
+        else:
+            bot.send_message(message.chat_id, message.text, **message.options)
+
+    def _handle_error(self, message, error):
+        """Повтор с задержкой или отказ от сообщения"""
+        error_code = getattr(error, 'error_code', None)
+        now = time.monotonic()
+
+        if error_code == 429:
+            result = getattr(error, 'result_json', None) or {}
+            retry_after = result.get('parameters', {}).get('retry_after', TELEGRAM_RETRY_DELAY)
+            print(f"⏳ Telegram: слишком много запросов, ждем {retry_after} сек")
+            with self.condition:
+                self.chat_ready[message.chat_id] = now + retry_after
+                message.not_before = now + retry_after
+                self.pending.appendleft(message)
+            return
+
+        message.attempts += 1
+        if (error_code is not None and 400 <= error_code < 500) or message.attempts > TELEGRAM_MAX_RETRIES:
+            # Ошибка в самом запросе (неверный чат, разметка) - повтор не поможет
+            print(f"⚠️ Не удалось отправить сообщение в Telegram ({message.chat_id}): {error}")
+            if message.on_error is not None:
+                try:
+                    message.on_error(error)
+                except Exception as e:
+                    print(f"⚠️ Ошибка обработчика неудачной отправки: {e}")
+            return
+
+        delay = TELEGRAM_RETRY_DELAY * 2 ** (message.attempts - 1)
+        print(f"⚠️ Ошибка отправки в Telegram: {error}. Повтор через {delay} сек "
+              f"({message.attempts}/{TELEGRAM_MAX_RETRIES})")
+        with self.condition:
+            message.not_before = now + delay
+            self.pending.appendleft(message)
+
+# Глобальный экземпляр
+telegram_outbox = TelegramOutbox()
\ No newline at end of file
@@ -0,0 +1,38 @@
+# telegram_router.py
+
+
+class TelegramRouter:
+    """
+    Таблица обработчиков кнопок или callback-запросов Telegram.
+    Точные совпадения и префиксы хранятся в словарях: обработчик находится
+    одним обращением к словарю (для префикса - по одному на каждый разделитель
+    в строке), время не растет с количеством зарегистрированных меню.
+    Префикс должен заканчиваться разделителем; из нескольких подходящих
+    побеждает самый длинный.
+    """
+    def __init__(self, separator):
+        self.separator = separator
+        self.exact = {}     # строка -> handler(chat_id или call, строка)
+        self.prefixes = {}  # префикс -> handler(chat_id или call, остаток после префикса)
+
+    def add(self, key, handler):
+        self.exact[key] = handler
+
+    def add_prefix(self, prefix, handler):
+        if not prefix.endswith(self.separator):
+            raise ValueError(f"Префикс '{prefix}' должен заканчиваться на '{self.separator}'")
+        self.prefixes[prefix] = handler
+
+    def resolve(self, key):
+        """(обработчик, аргумент) или (None, None), если обработчика нет"""
+        handler = self.exact.get(key)
+        if handler is not None:
+            return handler, key
+
+        index = key.rfind(self.separator)
+        while index >= 0:
+            handler = self.prefixes.get(key[:index + 1])
+            if handler is not None:
+                return handler, key[index + 1:]
+            index = key.rfind(self.separator, 0, index)
+        return None, None
\ No newline at end of file
@@ -0,0 +1,157 @@
+# template_matcher.py
+import os
+import threading
+import numpy as np
+from PIL import Image
+from config import (
+    TEMPLATE_MATCHING_ENABLED,
+    TEMPLATE_DIR,
+    TEMPLATE_MATCH_THRESHOLD,
+    TEMPLATE_REJECT_THRESHOLD,
+    TEMPLATE_OCR_RECHECK,
+    TEMPLATE_LEARN_CONFIDENCE
+)
+from frame_capture import frame_capture
+from logger import debug
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Результаты сравнения с шаблоном
+FOUND = 'found'              # Кнопка найдена по шаблону - OCR не нужен
+ABSENT = 'absent'            # Кнопки точно нет на экране - OCR не нужен
+AMBIGUOUS = 'ambiguous'      # Сомнительное совпадение - нужен OCR
+NO_TEMPLATE = 'no_template'  # Шаблона для этого разрешения еще нет - нужен OCR
+
+
+class TemplateMatcher:
+    """
+    Быстрый поиск неизменных кнопок интерфейса (ACCEPT, OK, FIND, REFRESH,
+    DOTALAND, DISCONNECT, стрелка '>') по шаблону через нормированную корреляцию.
+    Шаблоны хранятся отдельно для каждого разрешения: templates/2560x1440/ACCEPT.png
+    и запоминаются автоматически после уверенного распознавания через OCR.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.templates = {}  # (разрешение, имя) -> массив шаблона или None
+        self.absent_streak = {}  # имя -> сколько раз подряд кнопки "точно нет"
+        self.enabled = TEMPLATE_MATCHING_ENABLED and CV2_AVAILABLE
+
+        if TEMPLATE_MATCHING_ENABLED and not CV2_AVAILABLE:
+            print("⚠️ opencv-python не установлен, поиск по шаблонам отключен")
+
+    def get_resolution_key(self):
+        width, height = frame_capture.screen_size()
+        return f"{width}x{height}"
+
+    def get_template_path(self, name, resolution_key=None):
+        resolution_key = resolution_key or self.get_resolution_key()
+        return os.path.join(TEMPLATE_DIR, resolution_key, f"{name}.png")
+
+    def get_template(self, name):
+        """Шаблон кнопки для текущего разрешения (загружается с диска один раз)"""
+        key = (self.get_resolution_key(), name)
+        with self.lock:
+            if key not in self.templates:
+                path = self.get_template_path(name, key[0])
+                template = None
+                if os.path.exists(path):
+                    try:
+                        template = np.asarray(Image.open(path).convert('L'))
+                        print(f"🧩 Загружен шаблон {name} ({key[0]})")
+                    except Exception as e:
+                        print(f"⚠️ Не удалось загрузить шаблон {path}: {e}")
+                self.templates[key] = template
+            return self.templates[key]
+
+    def match(self, name, image, offset=(0, 0)):
+        """
+        Ищет кнопку name на изображении image
+        offset - положение image на экране (для абсолютных координат)
+        Возвращает (статус, результат) - результат в формате детекторов или None
+        """
+        if not self.enabled:
+            return NO_TEMPLATE, None
+
+        template = self.get_template(name)
+        if template is None:
+            return NO_TEMPLATE, None
+
+        try:
+            gray = np.asarray(image.convert('L'))
+            template_h, template_w = template.shape
+            if gray.shape[0] < template_h or gray.shape[1] < template_w:
+                return NO_TEMPLATE, None
+
+            scores = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (x, y) = cv2.minMaxLoc(scores)
+        except Exception as e:
+            print(f"⚠️ Ошибка сравнения с шаблоном {name}: {e}")
+            return AMBIGUOUS, None
+
+        if not np.isfinite(score):
+            return AMBIGUOUS, None
+
+        if score >= TEMPLATE_MATCH_THRESHOLD:
+            self.absent_streak[name] = 0
+            abs_x = offset[0] + x
+            abs_y = offset[1] + y
+            print(f"🧩 {name} найден по шаблону! Совпадение: {score:.2f}")
+            return FOUND, {
+                'text': name,
+                'position': (abs_x + template_w // 2, abs_y + template_h // 2),
+                'confidence': int(score * 100),
+                'method': 'template',
+                'bbox': (abs_x, abs_y, template_w, template_h)
+            }
+
+        if score < TEMPLATE_REJECT_THRESHOLD:
+            # Периодически все равно проверяем OCR - вдруг шаблон устарел
+            streak = self.absent_streak.get(name, 0) + 1
+            if streak < TEMPLATE_OCR_RECHECK:
+                self.absent_streak[name] = streak
+                return ABSENT, None
+            self.absent_streak[name] = 0
+
+        debug("🧩 %s: совпадение с шаблоном %.2f - проверяем через OCR", name, score)
+        return AMBIGUOUS, None
+
+    def learn(self, name, image, bbox, offset=(0, 0), confidence=100):
+        """
+        Запоминает шаблон кнопки по результату OCR
+        bbox - (x, y, w, h) в тех же координатах, что и offset
+        """
+        if not self.enabled or confidence < TEMPLATE_LEARN_CONFIDENCE:
+            return False
+
+        x, y, w, h = bbox
+        left = x - offset[0]
+        top = y - offset[1]
+        if left < 0 or top < 0 or left + w > image.width or top + h > image.height or w < 4 or h < 4:
+            return False
+
+        crop = image.crop((left, top, left + w, top + h)).convert('L')
+        template = np.asarray(crop)
+        if template.std() < 5:  # Однотонная область - корреляция не работает
+            return False
+
+        resolution_key = self.get_resolution_key()
+        path = self.get_template_path(name, resolution_key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            crop.save(path)
+        except Exception as e:
+            print(f"⚠️ Не удалось сохранить шаблон {name}: {e}")
+            return False
+
+        with self.lock:
+            self.templates[(resolution_key, name)] = template
+        self.absent_streak[name] = 0
+        print(f"🧩 Шаблон {name} сохранен для {resolution_key}: {path}")
+        return True
+
+# Глобальный экземпляр
+template_matcher = TemplateMatcher()
\ No newline at end of file
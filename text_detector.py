@@ -4,14 +4,28 @@ import pyautogui
 import os
 import pytesseract
 from PIL import Image, ImageEnhance, ImageOps, ImageFilter
-from config import CLICK_INTERVAL, ENABLE_DEBUG_SCREENSHOTS
+from config import ENABLE_DEBUG_SCREENSHOTS, POSITION_ROI_MARGIN
+from config_service import config_service
 from pause_handler import pause_handler  # Добавляем импорт
+from frame_capture import frame_capture
+from ocr_engine import ocr_engine
+from template_matcher import template_matcher, FOUND, ABSENT
+from position_cache import position_cache
+from logger import debug
 
 class TextDetector:
+    # Настройки, меняющиеся на лету без перезапуска: ключ config.py -> атрибут
+    LIVE_CONFIG = {
+        'SEARCH_INTERVAL': 'search_interval',
+        'CLICK_INTERVAL': 'click_interval'
+    }
+
     def __init__(self, tesseract_path=None):
         """
         Инициализация детектора текста
         """
+        config_service.bind(self, self.LIVE_CONFIG, "Детектор текста")
+        
         possible_tesseract_paths = [
             r'C:\Program Files\Tesseract-OCR\tesseract.exe',
             r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
@@ -32,6 +46,106 @@ class TextDetector:
         else:
             print("❌ Tesseract не найден. Установите Tesseract-OCR")
     
+    def get_search_regions(self, name, screenshot, margin=POSITION_ROI_MARGIN):
+        """
+        Области поиска цели: сначала вокруг запомненной позиции (если есть),
+        затем весь экран. Возвращает [(описание, region или None), ...]
+        """
+        search_regions = []
+        last_bbox = position_cache.get_bbox(name)
+        if last_bbox:
+            x, y, w, h = last_bbox
+            left = max(0, x - margin)
+            top = max(0, y - margin)
+            right = min(screenshot.width, x + w + margin)
+            bottom = min(screenshot.height, y + h + margin)
+            if right > left and bottom > top:
+                search_regions.append(("рядом с прошлой позицией", (left, top, right - left, bottom - top)))
+        search_regions.append(("весь экран", None))
+        return search_regions
+    
+    def crop_search_region(self, screenshot, region):
+        """Вырезает область из скриншота, возвращает (изображение, смещение)"""
+        if region is None:
+            return screenshot, (0, 0)
+        x, y, w, h = region
+        return screenshot.crop((x, y, x + w, y + h)), (x, y)
+    
+    def detect_accept_button(self):
+        """
+        Одна попытка поиска ACCEPT: шаблон, затем OCR небольшой области вокруг
+        запомненной позиции ACCEPT (для текущего разрешения),
+        и только при промахе - OCR всего экрана
+        """
+        screenshot = frame_capture.screenshot()
+        
+        # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+        status, match = template_matcher.match('ACCEPT', screenshot)
+        if status == FOUND:
+            position_cache.remember('ACCEPT', match['position'], match['confidence'], match['bbox'])
+            return match
+        if status == ABSENT:
+            return None
+        
+        for region_name, region in self.get_search_regions('ACCEPT', screenshot):
+            image, offset = self.crop_search_region(screenshot, region)
+            
+            result = self._ocr_accept_button(image, offset)
+            if result:
+                print(f"    📍 ACCEPT найден: {region_name}")
+                position_cache.remember('ACCEPT', result['position'], result['confidence'], result['bbox'])
+                template_matcher.learn('ACCEPT', screenshot, result['bbox'], confidence=result['confidence'])
+                return result
+            
+            if region:
+                print("    🔍 ACCEPT не найден рядом с прошлой позицией, ищем по всему экрану")
+        
+        return None
+    
+    def _ocr_accept_button(self, image, offset=(0, 0)):
+        """
+        Распознавание ACCEPT (белый текст на зеленом фоне) на изображении
+        offset - положение изображения на экране
+        """
+        # Обработка для ACCEPT (белый текст на зеленом фоне)
+        if image.mode != 'L':
+            processed = image.convert('L')
+        else:
+            processed = image.copy()
+        
+        # Усиление контраста для белого текста
+        binary_high = processed.point(lambda x: 255 if x > 200 else 0)
+        
+        custom_config = r'--oem 3 --psm 6'
+        data = ocr_engine.image_to_data(
+            binary_high, 
+            config=custom_config,
+            lang='eng'
+        )
+        
+        valid_accepts = []
+        
+        for i in range(len(data['text'])):
+            text = data['text'][i].strip().upper()
+            confidence = int(data['conf'][i])
+            
+            if text == "ACCEPT" and confidence > 50:
+                x = data['left'][i] + offset[0]
+                y = data['top'][i] + offset[1]
+                w = data['width'][i]
+                h = data['height'][i]
+                
+                valid_accepts.append({
+                    'text': text,
+                    'position': (x + w // 2, y + h // 2),
+                    'confidence': confidence,
+                    'bbox': (x, y, w, h)
+                })
+        
+        if valid_accepts:
+            return max(valid_accepts, key=lambda x: x['confidence'])
+        return None
+    
     def smart_preprocess_for_ok_button(self, image):
         """
         Специальная обработка для кнопки OK с белым текстом на зеленом фоне
@@ -62,13 +176,13 @@ class TextDetector:
                 return None
                 
             attempt += 1
-            print(f"\n🔍 ПОПЫТКА {attempt} ПОИСКА OK")
+            debug("\n🔍 ПОПЫТКА %s ПОИСКА OK", attempt)
             
             try:
                 if region:
-                    screenshot = pyautogui.screenshot(region=region)
+                    screenshot = frame_capture.screenshot(region=region)
                 else:
-                    screenshot = pyautogui.screenshot()
+                    screenshot = frame_capture.screenshot()
                 
                 processed_images = self.smart_preprocess_for_ok_button(screenshot)
                 
@@ -80,9 +194,8 @@ class TextDetector:
                 
                 custom_config = r'--oem 3 --psm 6'
                 try:
-                    data = pytesseract.image_to_data(
+                    data = ocr_engine.image_to_data(
                         processed_image, 
-                        output_type=pytesseract.Output.DICT,
                         config=custom_config,
                         lang='eng'
                     )
@@ -119,13 +232,13 @@ class TextDetector:
                     print(f"✅ УСПЕХ! Уверенность: {best_confidence}%")
                     return best_result
                 else:
-                    print("❌ OK не найден в этой попытке")
+                    debug("❌ OK не найден в этой попытке")
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске OK: {e}")
             
-            print(f"⏳ Ждем 3 секунды...")
-            time.sleep(3)
+            debug("⏳ Ждем 3 секунды...")
+            pause_handler.interruptible_sleep(3)
         
         print(f"❌ Кнопка OK не найдена за {timeout} секунд")
         return None
@@ -147,13 +260,13 @@ class TextDetector:
                 return None
                 
             attempt += 1
-            print(f"🕒 Попытка {attempt}...")
+            debug("🕒 Попытка %s...", attempt)
             
             try:
                 if region:
-                    screenshot = pyautogui.screenshot(region=region)
+                    screenshot = frame_capture.screenshot(region=region)
                 else:
-                    screenshot = pyautogui.screenshot()
+                    screenshot = frame_capture.screenshot()
                 
                 if screenshot.mode != 'L':
                     processed = screenshot.convert('L')
@@ -164,7 +277,7 @@ class TextDetector:
                 processed = enhancer.enhance(2.0)
                 
                 custom_config = r'--oem 3 --psm 6'
-                data = pytesseract.image_to_data(processed, output_type=pytesseract.Output.DICT, config=custom_config, lang='eng')
+                data = ocr_engine.image_to_data(processed, config=custom_config, lang='eng')
                 
                 found_texts = []
                 
@@ -205,12 +318,12 @@ class TextDetector:
                     print(f"🎯 Лучшее совпадение: '{best_match['text']}'")
                     return best_match
                 else:
-                    print(f"❌ Искомые тексты не найдены. Ждем {interval} сек...")
+                    debug("❌ Искомые тексты не найдены. Ждем %s сек...", interval)
                     
             except Exception as e:
                 print(f"⚠️ Ошибка при распознавании: {e}")
             
-            time.sleep(interval)
+            pause_handler.interruptible_sleep(interval)
         
         print(f"❌ Ни один текст не найден за {timeout} секунд")
         return None
@@ -230,7 +343,7 @@ class TextDetector:
         os.makedirs("debug/find_reliable", exist_ok=True)
         
         # 🔥 РАССЧИТЫВАЕМ ОЖИДАЕМЫЕ КООРДИНАТЫ FIND
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = frame_capture.screen_size()
         
         # FIND обычно находится в центре-правой части экрана, не слишком близко к краям
         expected_x_min = screen_width * 0.30  # Не слишком слева
@@ -264,11 +377,11 @@ class TextDetector:
                 return None
                 
             attempt += 1
-            print(f"\n🔍 ПОПЫТКА {attempt} ПОИСКА FIND")
-            print("=" * 40)
+            debug("\n🔍 ПОПЫТКА %s ПОИСКА FIND", attempt)
+            debug("=" * 40)
             
             try:
-                screenshot = pyautogui.screenshot(region=region)
+                screenshot = frame_capture.screenshot(region=region)
                 
                 # 🔥 СОХРАНЯЕМ СКРИНШОТ
                 timestamp = time.strftime("%H%M%S")
@@ -277,6 +390,16 @@ class TextDetector:
                     screenshot.save(screenshot_filename)
                 print(f"📸 Скриншот: {screenshot_filename}")
                 
+                # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+                status, match = template_matcher.match('FIND', screenshot, offset=region[:2])
+                if status == FOUND:
+                    match['screenshot'] = screenshot_filename
+                    return match
+                if status == ABSENT:
+                    debug("❌ FIND не найден в этой попытке")
+                    pause_handler.interruptible_sleep(self.search_interval)
+                    continue
+                
                 # 🔥 ТОЛЬКО ЭФФЕКТИВНЫЕ МЕТОДЫ
                 if screenshot.mode != 'RGB':
                     rgb_screenshot = screenshot.convert('RGB')
@@ -294,98 +417,62 @@ class TextDetector:
                     ('white_text', white_mask, r'--oem 3 --psm 10'),  # Белый текст
                 ]
                 
-                best_result = None
-                best_confidence = 0
-                
-                for method_name, processed_img, custom_config in methods:
-                    print(f"  🧪 Метод: {method_name}")
+                def find_candidate(method_name, data):
+                    """Лучший кандидат FIND в результате OCR одного метода или None"""
+                    # 🔥 ВЫВОДИМ ТОЛЬКО ТЕКСТЫ С ВЫСОКОЙ УВЕРЕННОСТЬЮ И ПОХОЖИЕ НА FIND
+                    found_candidates = []
                     
-                    try:
-                        data = pytesseract.image_to_data(
-                            processed_img, 
-                            output_type=pytesseract.Output.DICT,
-                            config=custom_config,
-                            lang='eng'
-                        )
+                    for i in range(len(data['text'])):
+                        text = data['text'][i].strip().upper()
+                        confidence = int(data['conf'][i])
                         
-                        # 🔥 ВЫВОДИМ ТОЛЬКО ТЕКСТЫ С ВЫСОКОЙ УВЕРЕННОСТЬЮ И ПОХОЖИЕ НА FIND
-                        found_candidates = []
+                        if not text or confidence < 60:  # 🔥 ПОВЫШАЕМ ПОРОГ УВЕРЕННОСТИ
+                            continue
                         
-                        for i in range(len(data['text'])):
-                            text = data['text'][i].strip().upper()
-                            confidence = int(data['conf'][i])
-                            
-                            if not text or confidence < 60:  # 🔥 ПОВЫШАЕМ ПОРОГ УВЕРЕННОСТИ
-                                continue
-                            
-                            x = data['left'][i] + region[0]
-                            y = data['top'][i] + region[1]
-                            w = data['width'][i]
-                            h = data['height'][i]
-                            
-                            # 🔥 ПРОВЕРЯЕМ КООРДИНАТЫ
-                            if not (expected_x_min <= x <= expected_x_max and 
-                                    expected_y_min <= y <= expected_y_max):
-                                # Текст не в ожидаемой области FIND
-                                continue
-                            
-                            # 🔥 ПРОВЕРЯЕМ РАЗМЕР (FIND обычно 50-150px шириной, 20-50px высотой)
-                            if not (40 <= w <= 150 and 15 <= h <= 60):
-                                continue
-                            
-                            # 🔥 ПОИСК ТОЧНОГО СОВПАДЕНИЯ С FIND
-                            search_texts = ["FIND"]
-                            # F|ND и F1ND - это ошибки распознавания, но только если уверенность очень высокая
-                            if confidence > 85:
-                                search_texts.extend(["F|ND", "F1ND"])
-                            
-                            found_match = False
-                            actual_text = text
-                            
-                            for search_text in search_texts:
-                                if search_text == text:  # 🔥 ТОЛЬКО ТОЧНОЕ СОВПАДЕНИЕ
-                                    found_match = True
-                                    actual_text = search_text
-                                    break
-                            
-                            if found_match:
-                                center_x = x + w // 2
-                                center_y = y + h // 2
-                                
-                                print(f"    ✅ КАНДИДАТ: '{actual_text}' {confidence}% "
-                                    f"({w}x{h}) в ({x}, {y})")
-                                
-                                found_candidates.append({
-                                    'text': actual_text,
-                                    'position': (center_x, center_y),
-                                    'confidence': confidence,
-                                    'method': method_name,
-                                    'bbox': (x, y, w, h),
-                                    'original_text': text
-                                })
+                        x = data['left'][i] + region[0]
+                        y = data['top'][i] + region[1]
+                        w = data['width'][i]
+                        h = data['height'][i]
                         
-                        # 🔥 ВЫБИРАЕМ ЛУЧШЕГО КАНДИДАТА
-                        for candidate in found_candidates:
-                            # Дополнительная проверка: FIND обычно находится рядом с другими кнопками лобби
-                            # Проверяем, есть ли рядом текст "PRIVATE", "LOBBY" и т.д.
-                            x, y, w, h = candidate['bbox']
-                            
-                            if candidate['confidence'] > best_confidence:
-                                best_confidence = candidate['confidence']
-                                best_result = {
-                                    'text': candidate['text'],
-                                    'position': candidate['position'],
-                                    'confidence': candidate['confidence'],
-                                    'method': candidate['method'],
-                                    'bbox': candidate['bbox'],
-                                    'screenshot': screenshot_filename
-                                }
+                        # 🔥 ПРОВЕРЯЕМ КООРДИНАТЫ
+                        if not (expected_x_min <= x <= expected_x_max and 
+                                expected_y_min <= y <= expected_y_max):
+                            # Текст не в ожидаемой области FIND
+                            continue
                         
-                        if found_candidates:
-                            print(f"    📋 Найдено кандидатов: {len(found_candidates)}")
-                                
-                    except Exception as e:
-                        print(f"    ⚠️ Ошибка: {e}")
+                        # 🔥 ПРОВЕРЯЕМ РАЗМЕР (FIND обычно 50-150px шириной, 20-50px высотой)
+                        if not (40 <= w <= 150 and 15 <= h <= 60):
+                            continue
+                        
+                        # 🔥 ПОИСК ТОЧНОГО СОВПАДЕНИЯ С FIND
+                        search_texts = ["FIND"]
+                        # F|ND и F1ND - это ошибки распознавания, но только если уверенность очень высокая
+                        if confidence > 85:
+                            search_texts.extend(["F|ND", "F1ND"])
+                        
+                        if text in search_texts:  # 🔥 ТОЛЬКО ТОЧНОЕ СОВПАДЕНИЕ
+                            debug("    ✅ КАНДИДАТ (%s): '%s' %s%% (%sx%s) в (%s, %s)",
+                                  method_name, text, confidence, w, h, x, y)
+                            
+                            found_candidates.append({
+                                'text': text,
+                                'position': (x + w // 2, y + h // 2),
+                                'confidence': confidence,
+                                'method': method_name,
+                                'bbox': (x, y, w, h),
+                                'screenshot': screenshot_filename
+                            })
+                    
+                    if not found_candidates:
+                        return None
+                    
+                    debug("    📋 Найдено кандидатов (%s): %s", method_name, len(found_candidates))
+                    
+                    # 🔥 ВЫБИРАЕМ ЛУЧШЕГО КАНДИДАТА
+                    return max(found_candidates, key=lambda candidate: candidate['confidence'])
+                
+                # 🔥 МЕТОДЫ ПАРАЛЛЕЛЬНО - ПОБЕЖДАЕТ ПЕРВЫЙ УВЕРЕННЫЙ
+                _, best_result = ocr_engine.run_methods('find', methods, find_candidate)
                 
                 # 🔥 ЕСЛИ НЕ НАШЛИ, ПРОБУЕМ ПОИСК ПО ОКРЕСТНОСТЯМ КНОПОК ЛОББИ
                 if best_result is None and attempt <= 3:
@@ -405,7 +492,7 @@ class TextDetector:
                     print(f"  📍 Зона кнопок лобби: {lobby_region}")
                     
                     try:
-                        lobby_screenshot = pyautogui.screenshot(region=lobby_region)
+                        lobby_screenshot = frame_capture.screenshot(region=lobby_region)
                         lobby_filename = f"debug/find_reliable/lobby_area_{attempt}_{timestamp}.png"
                         lobby_screenshot.save(lobby_filename)
                         print(f"  📸 Зона лобби: {lobby_filename}")
@@ -418,9 +505,8 @@ class TextDetector:
                         
                         lobby_white = lobby_gray.point(lambda x: 255 if x > 190 else 0)
                         
-                        data = pytesseract.image_to_data(
+                        data = ocr_engine.image_to_data(
                             lobby_white, 
-                            output_type=pytesseract.Output.DICT,
                             config=r'--oem 3 --psm 6',
                             lang='eng'
                         )
@@ -455,6 +541,8 @@ class TextDetector:
                 
                 if best_result:
                     print(f"\n🎯 FIND НАЙДЕН НАДЕЖНО!")
+                    template_matcher.learn('FIND', screenshot, best_result['bbox'],
+                                           offset=region[:2], confidence=best_result['confidence'])
                     print(f"📊 Уверенность: {best_result['confidence']}%")
                     print(f"📍 Координаты: {best_result['position']}")
                     print(f"🧪 Метод: {best_result['method']}")
@@ -468,7 +556,7 @@ class TextDetector:
                             w + 60,
                             h + 60
                         )
-                        find_screenshot = pyautogui.screenshot(region=find_area)
+                        find_screenshot = frame_capture.screenshot(region=find_area)
                         found_filename = f"debug/find_reliable/FIND_VERIFIED_{attempt}_{timestamp}.png"
                         
                         # Добавляем рамку и текст
@@ -490,25 +578,25 @@ class TextDetector:
                     
                     return best_result
                 
-                print(f"❌ FIND не найден в этой попытке")
+                debug("❌ FIND не найден в этой попытке")
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске FIND: {e}")
             
-            print(f"⏳ Ждем 2 секунды...")
-            time.sleep(2)
+            debug("⏳ Ждем 2 секунды...")
+            pause_handler.interruptible_sleep(2)
         
         print(f"\n❌ Кнопка FIND не найдена за {timeout} секунд")
         
         # 🔥 СОХРАНЯЕМ ПОСЛЕДНИЙ СКРИНШОТ ДЛЯ АНАЛИЗА
         try:
-            final_screenshot = pyautogui.screenshot()
+            final_screenshot = frame_capture.screenshot()
             final_filename = f"debug/find_reliable/LAST_SCREEN_{int(time.time())}.png"
             final_screenshot.save(final_filename)
             print(f"📸 Последний скриншот экрана: {final_filename}")
             
             # Также сохраняем область поиска
-            region_screenshot = pyautogui.screenshot(region=region)
+            region_screenshot = frame_capture.screenshot(region=region)
             region_filename = f"debug/find_reliable/SEARCH_AREA_{int(time.time())}.png"
             region_screenshot.save(region_filename)
             print(f"📸 Область поиска: {region_filename}")
@@ -537,18 +625,26 @@ class TextDetector:
                 return None
                 
             attempt += 1
-            print(f"🔍 Попытка {attempt} поиска REFRESH...")
+            debug("🔍 Попытка %s поиска REFRESH...", attempt)
             
             try:
                 if region:
-                    screenshot = pyautogui.screenshot(region=region)
+                    screenshot = frame_capture.screenshot(region=region)
                 else:
-                    screenshot = pyautogui.screenshot()
+                    screenshot = frame_capture.screenshot()
+                
+                # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+                status, match = template_matcher.match('REFRESH', screenshot, offset=region[:2] if region else (0, 0))
+                if status == FOUND:
+                    return match
+                if status == ABSENT:
+                    debug("❌ REFRESH не найден в попытке %s", attempt)
+                    pause_handler.interruptible_sleep(self.search_interval)
+                    continue
                 
                 custom_config = r'--oem 3 --psm 6'
-                data = pytesseract.image_to_data(
+                data = ocr_engine.image_to_data(
                     screenshot, 
-                    output_type=pytesseract.Output.DICT,
                     config=custom_config,
                     lang='eng'
                 )
@@ -567,6 +663,7 @@ class TextDetector:
                         center_y = y + h // 2
                         
                         print(f"✅ REFRESH найден! Уверенность: {confidence}%")
+                        template_matcher.learn('REFRESH', screenshot, (x, y, w, h), confidence=confidence)
                         
                         return {
                             'text': text,
@@ -576,13 +673,13 @@ class TextDetector:
                             'bbox': (x, y, w, h)
                         }
                 
-                print(f"❌ REFRESH не найден в попытке {attempt}")
+                debug("❌ REFRESH не найден в попытке %s", attempt)
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске REFRESH: {e}")
             
-            print(f"⏳ Ждем 2 секунды...")
-            time.sleep(2)
+            debug("⏳ Ждем 2 секунды...")
+            pause_handler.interruptible_sleep(2)
         
         print(f"❌ Кнопка REFRESH не найдена за {timeout} секунд")
         return None
@@ -602,18 +699,26 @@ class TextDetector:
                 return None
                 
             attempt += 1
-            print(f"🔍 Попытка {attempt} поиска DOTALAND...")
+            debug("🔍 Попытка %s поиска DOTALAND...", attempt)
             
             try:
                 if region:
-                    screenshot = pyautogui.screenshot(region=region)
+                    screenshot = frame_capture.screenshot(region=region)
                 else:
-                    screenshot = pyautogui.screenshot()
+                    screenshot = frame_capture.screenshot()
+                
+                # 🔥 БЫСТРЫЙ ПУТЬ: поиск по шаблону, OCR только при сомнениях
+                status, match = template_matcher.match('DOTALAND', screenshot, offset=region[:2] if region else (0, 0))
+                if status == FOUND:
+                    return match
+                if status == ABSENT:
+                    debug("❌ DOTALAND не найден в попытке %s", attempt)
+                    pause_handler.interruptible_sleep(self.search_interval)
+                    continue
                 
                 custom_config = r'--oem 3 --psm 6'
-                data = pytesseract.image_to_data(
+                data = ocr_engine.image_to_data(
                     screenshot, 
-                    output_type=pytesseract.Output.DICT,
                     config=custom_config,
                     lang='eng'
                 )
@@ -632,6 +737,7 @@ class TextDetector:
                         center_y = y + h // 2
                         
                         print(f"✅ DOTALAND найден! Уверенность: {confidence}%")
+                        template_matcher.learn('DOTALAND', screenshot, (x, y, w, h), confidence=confidence)
                         
                         return {
                             'text': text,
@@ -641,13 +747,13 @@ class TextDetector:
                             'bbox': (x, y, w, h)
                         }
                 
-                print(f"❌ DOTALAND не найден в попытке {attempt}")
+                debug("❌ DOTALAND не найден в попытке %s", attempt)
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске DOTALAND: {e}")
             
-            print(f"⏳ Ждем 2 секунды...")
-            time.sleep(2)
+            debug("⏳ Ждем 2 секунды...")
+            pause_handler.interruptible_sleep(2)
         
         print(f"❌ Кнопка DOTALAND не найдена за {timeout} секунд")
         return None
@@ -690,10 +796,10 @@ class TextDetector:
                 return False
                 
             attempt += 1
-            print(f"🔍 Попытка {attempt} поиска OK...")
+            debug("🔍 Попытка %s поиска OK...", attempt)
             
             try:
-                screenshot = pyautogui.screenshot()
+                screenshot = frame_capture.screenshot()
                 
                 # Простая обработка для OK (белый текст на зеленом)
                 if screenshot.mode != 'L':
@@ -705,9 +811,8 @@ class TextDetector:
                 binary_high = processed.point(lambda x: 255 if x > 200 else 0)
                 
                 custom_config = r'--oem 3 --psm 6'
-                data = pytesseract.image_to_data(
+                data = ocr_engine.image_to_data(
                     binary_high, 
-                    output_type=pytesseract.Output.DICT,
                     config=custom_config,
                     lang='eng'
                 )
@@ -736,12 +841,12 @@ class TextDetector:
                             print("❌ Не удалось кликнуть по OK")
                             return False
                 
-                print(f"❌ OK не найден в попытке {attempt}")
+                debug("❌ OK не найден в попытке %s", attempt)
                 
             except Exception as e:
                 print(f"⚠️ Ошибка при поиске OK: {e}")
             
-            time.sleep(2)  # Ждем 2 секунды между попытками
+            pause_handler.interruptible_sleep(2)  # Ждем 2 секунды между попытками
         
         print(f"❌ Кнопка OK не найдена за {timeout} секунд")
         return False
@@ -762,7 +867,7 @@ class TextDetector:
             
             if self.reliable_click(x, y):
                 print("✅ Успешный клик по REFRESH!")
-                time.sleep(3)
+                pause_handler.interruptible_sleep(3)
                 return True
             else:
                 print("❌ Не удалось кликнуть по REFRESH")
@@ -801,9 +906,31 @@ class TextDetector:
         """
         print("🎯 ПОИСК КНОПКИ FIND")
         
-        result = self.find_find_button_fast(timeout=timeout)
+        result = None
+        
+        # 🔥 Сначала короткий поиск вокруг запомненной позиции FIND
+        cached_bbox = position_cache.get_bbox('FIND')
+        if cached_bbox:
+            screen_width, screen_height = frame_capture.screen_size()
+            x, y, w, h = cached_bbox
+            left = max(0, x - POSITION_ROI_MARGIN)
+            top = max(0, y - POSITION_ROI_MARGIN)
+            roi = (
+                left,
+                top,
+                min(screen_width, x + w + POSITION_ROI_MARGIN) - left,
+                min(screen_height, y + h + POSITION_ROI_MARGIN) - top
+            )
+            print(f"📍 Ищем FIND рядом с запомненной позицией: {roi}")
+            result = self.find_find_button_fast(region=roi, timeout=5)
+            if not result:
+                position_cache.miss('FIND')
+        
+        if not result:
+            result = self.find_find_button_fast(timeout=timeout)
         
         if result:
+            position_cache.remember('FIND', result['position'], result['confidence'], result['bbox'])
             x, y = result['position']
             print(f"🎯 Кнопка FIND найдена!")
             print(f"📍 Позиция: ({x}, {y})")
@@ -811,7 +938,7 @@ class TextDetector:
             
             if self.reliable_click(x, y):
                 print("✅ Успешный клик по FIND!")
-                time.sleep(3)
+                pause_handler.interruptible_sleep(3)
                 return True
             else:
                 print("❌ Не удалось кликнуть по FIND")
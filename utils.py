@@ -1,6 +1,5 @@
 # utils.py (простой вариант)
 
-import time
 from pause_handler import pause_handler
 
 def run_with_pause_aware_timeout(timeout_seconds, operation_name, check_interval=1):
@@ -9,7 +8,6 @@ def run_with_pause_aware_timeout(timeout_seconds, operation_name, check_interval
     Возвращает (should_continue, elapsed_seconds)
     
     Использование:
-    start_time = time.time()
     for should_continue, elapsed in run_with_pause_aware_timeout(60, "Поиск кнопки"):
         if not should_continue:
             break
@@ -18,9 +16,9 @@ def run_with_pause_aware_timeout(timeout_seconds, operation_name, check_interval
         if found_button():
             break
             
-        time.sleep(check_interval)
+        pause_handler.interruptible_sleep(check_interval)
     """
-    start_time = time.time()
+    start_time = pause_handler.start_timer()
     
     while True:
         # Проверяем паузу и запросы на остановку
@@ -43,4 +41,4 @@ def run_with_pause_aware_timeout(timeout_seconds, operation_name, check_interval
             print(f"⏱ {operation_name}: прошло {elapsed:.1f}с, осталось {remaining:.1f}с")
         
         yield True, elapsed
-        time.sleep(check_interval)
\ No newline at end of file
+        pause_handler.interruptible_sleep(check_interval)
\ No newline at end of file
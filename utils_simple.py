@@ -1,13 +1,12 @@
 # utils_simple.py (новый простой файл)
 
-import time
 from pause_handler import pause_handler
 
 def run_with_timeout_considering_pause(timeout_seconds, operation_name, func, *args, **kwargs):
     """
     Простая обертка для запуска функций с таймаутом, учитывающим паузу
     """
-    start_time = time.time()
+    start_time = pause_handler.start_timer()
     attempt = 0
     
     while True:
@@ -36,4 +35,4 @@ def run_with_timeout_considering_pause(timeout_seconds, operation_name, func, *a
             return result
         
         # Если функция ничего не вернула, ждем и продолжаем цикл
-        time.sleep(1)
\ No newline at end of file
+        pause_handler.interruptible_sleep(1)
\ No newline at end of file
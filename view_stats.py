@@ -1,6 +1,35 @@
 # view_stats.py
 import json
 from statistics import stats
+from stats_db import stats_db
+
+def print_recent_gold_events(gold_events):
+    if gold_events:
+        print("🎯 Находки 9999999:")
+        for event in gold_events[-5:]:  # Последние 5 событий
+            print(f"  📅 {event['date']} {event['time']} - "
+                  f"{event['find_time_seconds']:.1f} сек - "
+                  f"Найдено: {event['gold_found_count']} (×3: {event['multiplied_gold_count']})")
+    else:
+        print("  Пока не найдено ни одного 9999999")
+
+def print_database_stats():
+    """Выборки за период из базы статистики (по индексам, без чтения всей истории)"""
+    print("\n🗄️ ЗА ПОСЛЕДНИЕ 24 ЧАСА:")
+    print("-" * 40)
+    print(f"🎯 Найдено 9999999: {stats_db.count_gold_finds(24)}")
+    print(f"🌀 Циклов бесконечки: {stats_db.count_infinite_cycles(24)}")
+    
+    deaths = stats_db.host_deaths_by_type(24)
+    print(f"🔴 Смертей по красной рамке: {deaths.get('red_frame', 0)}")
+    print(f"💰 Смертей по 9999999: {deaths.get('gold_text', 0)}")
+    
+    by_day = stats_db.average_find_time_by_day(7)
+    if by_day:
+        print("\n📆 СРЕДНЕЕ ВРЕМЯ ПОИСКА ПО ДНЯМ:")
+        print("-" * 40)
+        for day, count, average in by_day:
+            print(f"  📅 {day}: {count} находок, в среднем {average:.1f} сек")
 
 def main():
     print("=== ПРОСМОТР СТАТИСТИКИ ===")
@@ -8,6 +37,13 @@ def main():
     
     stats.print_current_stats()
     
+    if stats_db.enabled:
+        print_database_stats()
+        print("\n📋 ПОСЛЕДНИЕ СОБЫТИЯ:")
+        print("-" * 40)
+        print_recent_gold_events(stats_db.recent_events('gold_found', 5))
+        return
+    
     # Дополнительная информация из файла
     try:
         with open(stats.stats_file, 'r', encoding='utf-8') as f:
@@ -18,15 +54,7 @@ def main():
         
         events = data.get('current_session', {}).get('events', [])
         gold_events = [e for e in events if e.get('event_type') == 'gold_found']
-        
-        if gold_events:
-            print("🎯 Находки 9999999:")
-            for event in gold_events[-5:]:  # Последние 5 событий
-                print(f"  📅 {event['date']} {event['time']} - "
-                      f"{event['find_time_seconds']:.1f} сек - "
-                      f"Перезапусков: {event['restart_count']} (×3: {event['multiplied_restarts']})")
-        else:
-            print("  Пока не найдено ни одного 9999999")
+        print_recent_gold_events(gold_events)
             
     except Exception as e:
         print(f"Ошибка загрузки детальной статистики: {e}")